@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from .elastic import Elastic2D, Elastic, ElasticOrtho
-from .elate import ELATE, ELATE_MaterialsProject, plot3D, wait3D
+from .elastic import Elastic2D, Elastic, ElasticOrtho, ElasticTetragonal, ElasticHexagonal, ElasticCubic, ElasticMonoclinic, ElasticBatch, specialize
+from .analysis import analyze, analyzeMany
+from .query import directionalProperties
+from .elate import ELATE, ELATE_MaterialsProject, ELATE_stream, plot3D, plot3D_stream, wait3D
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+
+"""
+Analysis of elastic tensors without any HTML output, for one tensor or for many
+tensors at once (e.g. from high-throughput calculations), using a pool of processes.
+"""
+
+import itertools
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from ELATE import cache, elastic, profiling
+
+__author__ = "Romain Gaillac and François-Xavier Coudert"
+__version__ = "2025.08.26"
+__license__ = "MIT"
+
+
+def extrema3D(elas, bruteForce=False):
+    """
+    Return the extrema of the properties of a 3D material, as a tuple
+    (minE, maxE, minLC, maxLC, minG, maxG, minNu, maxNu) of (angles, value) pairs
+    """
+    with profiling.stage('extrema'):
+        return cache.cached('extrema3D', elas, (bruteForce,), lambda: _extrema3D(elas, bruteForce))
+
+
+def _extrema3D(elas, bruteForce):
+    if bruteForce:
+        with profiling.stage('E'):
+            minE = elastic.minimize(elas.Young, 2)
+            maxE = elastic.maximize(elas.Young, 2)
+        with profiling.stage('LC'):
+            minLC = elastic.minimize(elas.LC, 2)
+            maxLC = elastic.maximize(elas.LC, 2)
+        with profiling.stage('G'):
+            minG = elastic.minimize(elas.shear, 3)
+            maxG = elastic.maximize(elas.shear, 3)
+        with profiling.stage('nu'):
+            minNu = elastic.minimize(elas.Poisson, 3)
+            maxNu = elastic.maximize(elas.Poisson, 3)
+    else:
+        with profiling.stage('E'):
+            minE, maxE = elas.YoungExtrema()
+        with profiling.stage('LC'):
+            minLC, maxLC = elas.LCExtrema()
+        with profiling.stage('G'):
+            minG, maxG = elas.shearExtrema()
+        with profiling.stage('nu'):
+            minNu, maxNu = elas.PoissonExtrema()
+
+    return (minE, maxE, minLC, maxLC, minG, maxG, minNu, maxNu)
+
+
+def extrema2D(elas):
+    """
+    Return the extrema of the properties of a 2D material, as a tuple
+    (minE, maxE, minG, maxG, minNu, maxNu) of (angle, value) pairs
+    """
+
+    # Extrema are found exactly, among the stationary points of the Fourier series (see Elastic2D)
+    with profiling.stage('extrema'):
+        with profiling.stage('E'):
+            minE, maxE = elas.YoungExtrema()
+        with profiling.stage('G'):
+            minG, maxG = elas.shearExtrema()
+        with profiling.stage('nu'):
+            minNu, maxNu = elas.PoissonExtrema()
+    return (minE, maxE, minG, maxG, minNu, maxNu)
+
+
+def anisotropy(vmin, vmax, signed=False):
+    """Return the anisotropy ratio max/min, which is infinite if min (or min*max for signed quantities) is not positive"""
+    if (vmin * vmax if signed else vmin) > 0:
+        return vmax / vmin
+    return float('inf')
+
+
+def analyze(matrix, bruteForce=False):
+    """
+    Analyze an elastic tensor (2D or 3D), and return the results as a dictionary.
+    If the matrix is invalid, the dictionary only contains an 'error' message.
+    """
+
+    with profiling.stage('parse'):
+        try:
+            elas = elastic.Elastic(matrix)
+        except TypeError:
+            try:
+                elas = elastic.Elastic2D(matrix)
+            except ValueError as e:
+                return {'error': e.args[0]}
+        except ValueError as e:
+            return {'error': e.args[0]}
+
+    with profiling.stage('eigenvalues'):
+        eigenval = elas.eigenvalues()
+    res = {'dimension': 2 if elas.is2D() else 3,
+           'CVoigt': np.asarray(elas.CVoigt, dtype=float).tolist(),
+           'eigenvalues': [float(x) for x in eigenval],
+           'stable': bool(eigenval[0] > 0)}
+
+    if elas.is2D():
+        if res['stable']:
+            minE, maxE, minG, maxG, minNu, maxNu = extrema2D(elas)
+            res['extrema'] = {}
+            for name, (vmin, vmax), signed in [('E', (minE, maxE), False), ('G', (minG, maxG), False),
+                                               ('nu', (minNu, maxNu), True)]:
+                res['extrema'][name] = {'min': float(vmin[1]), 'max': float(vmax[1]),
+                                        'minAngle': float(vmin[0]), 'maxAngle': float(vmax[0]),
+                                        'anisotropy': float(anisotropy(vmin[1], vmax[1], signed))}
+        return res
+
+    with profiling.stage('specialize'):
+        res['orthorhombic'] = bool(elas.isOrthorhombic())
+        res['LaueClass'] = elas.LaueClass()
+        sym = elastic.specialize(elas)
+
+    with profiling.stage('averages'):
+        avg = elas.averages()
+    res['averages'] = {scheme: dict(zip(('K', 'E', 'G', 'nu'), (float(x) for x in avg[i])))
+                       for i, scheme in enumerate(('Voigt', 'Reuss', 'Hill'))}
+
+    if res['stable']:
+        minE, maxE, minLC, maxLC, minG, maxG, minNu, maxNu = extrema3D(sym, bruteForce)
+        res['extrema'] = {}
+        for name, (vmin, vmax), signed in [('E', (minE, maxE), False), ('LC', (minLC, maxLC), False)]:
+            res['extrema'][name] = {'min': float(vmin[1]), 'max': float(vmax[1]),
+                                    'minAxis': [float(x) for x in elastic.dirVec(*vmin[0])],
+                                    'maxAxis': [float(x) for x in elastic.dirVec(*vmax[0])],
+                                    'anisotropy': float(anisotropy(vmin[1], vmax[1], signed))}
+        for name, (vmin, vmax), signed in [('G', (minG, maxG), False), ('nu', (minNu, maxNu), True)]:
+            res['extrema'][name] = {'min': float(vmin[1]), 'max': float(vmax[1]),
+                                    'minAxis': [float(x) for x in elastic.dirVec1(*vmin[0])],
+                                    'maxAxis': [float(x) for x in elastic.dirVec1(*vmax[0])],
+                                    'minAxis2': [float(x) for x in elastic.dirVec2(*vmin[0])],
+                                    'maxAxis2': [float(x) for x in elastic.dirVec2(*vmax[0])],
+                                    'anisotropy': float(anisotropy(vmin[1], vmax[1], signed))}
+
+    return res
+
+
+def _analyzeChunk(start, chunk, bruteForce):
+    return [(start + i, analyze(m, bruteForce)) for i, m in enumerate(chunk)]
+
+
+def analyzeMany(matrices, workers=1, chunksize=16, ordered=True, bruteForce=False):
+    """
+    Analyze many elastic tensors, distributing the work by chunks to a pool of processes.
+    This is a generator, which yields (index, result) pairs: in the order of the input
+    if ordered is True, otherwise as soon as they are completed. Each result is the
+    dictionary returned by analyze().
+    """
+
+    if workers <= 1:
+        for i, m in enumerate(matrices):
+            yield (i, analyze(m, bruteForce))
+        return
+
+    it = iter(matrices)
+    chunks = ((start, list(itertools.islice(it, chunksize))) for start in itertools.count(0, chunksize))
+    with ProcessPoolExecutor(workers) as pool:
+        # Keep a bounded number of chunks in flight, so that the input can be a long iterator
+        pending = deque()
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < 2 * workers:
+                start, chunk = next(chunks)
+                if not chunk:
+                    exhausted = True
+                    break
+                pending.append(pool.submit(_analyzeChunk, start, chunk, bruteForce))
+            if not pending:
+                return
+
+            if ordered:
+                for r in pending.popleft().result():
+                    yield r
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for f in done:
+                    pending.remove(f)
+                    for r in f.result():
+                        yield r
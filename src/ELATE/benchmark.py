@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmarks of the elastic engine and of the page generators.
+
+Each stage (a full page, the 3D plot of each property, extrema searches, polar plot
+sections, writing of the 3D plot data) is run on every reference tensor and on a set of
+synthetic triclinic tensors. For each, the wall time (best of several runs, with empty
+caches), the number of property evaluations and the size of the output are recorded.
+Results can be saved as JSON, and compared to a stored baseline:
+
+    python -m ELATE.benchmark --baseline benchmarks/baseline.json
+"""
+
+import argparse
+import contextlib
+import functools
+import json
+import platform
+import sys
+import time
+
+import numpy as np
+
+from ELATE import analysis, cache, elastic, elate, profiling, refdata, symmetry
+
+__author__ = "Romain Gaillac and François-Xavier Coudert"
+__version__ = "2025.08.26"
+__license__ = "MIT"
+
+
+def triclinicExamples(n=3, seed=0):
+    """Return n synthetic triclinic stiffness matrices (stable, with all coefficients nonzero), as strings"""
+    rng = np.random.default_rng(seed)
+    res = {}
+    for i in range(n):
+        A = rng.normal(size=(6, 6))
+        C = 10 * A @ A.T + 30 * np.eye(6)
+        res['triclinic-%d' % i] = '\n'.join(' '.join('%.1f' % c for c in row) for row in C)
+    return res
+
+
+@contextlib.contextmanager
+def countEvaluations():
+    """
+    Context in which the calls to the methods of the elastic classes are counted (see profiling).
+    It yields a dictionary of {method name: [calls, directions]}.
+    """
+    with profiling.profile('benchmark') as p:
+        yield p.calls
+
+
+def outputSize(res):
+    """Return the size in bytes of the output of a stage (a page, or an HTMLRenderer), or None"""
+    if isinstance(res, elate.HTMLRenderer):
+        res = res.getvalue()
+    if isinstance(res, str):
+        return len(res.encode('utf-8'))
+    if isinstance(res, bytes):
+        return len(res)
+    return None
+
+
+def stages3D(name, matrix):
+    """Return the list of (stage name, function) to benchmark for a 3D tensor"""
+
+    elas = elastic.specialize(elastic.Elastic(matrix))
+    u = np.linspace(0, np.pi, 61)
+
+    # Data of the 3D plot of Young's modulus, to time their writing only
+    theta, phi = np.linspace(0, np.pi, 200), np.linspace(0, 2 * np.pi, 400)
+    uu, vv = np.meshgrid(theta, phi, indexing='ij')
+    r = elas.Young_array(uu, vv)
+    x, y, z = [c.tolist() for c in (r * np.sin(uu) * np.cos(vv), r * np.sin(uu) * np.sin(vv), r * np.cos(uu))]
+    labels = elate.hoverLabels("'E = ", r, " GPa, \u03B8 = ", theta, phi)
+
+    def write3D():
+        out = elate.HTMLRenderer()
+        elate.write3DPlotData(out, x, y, z, labels, 1)
+        return out
+
+    stages = [('page', lambda: elate.ELATE(matrix, name)),
+              ('extrema', lambda: analysis.extrema3D(elastic.specialize(elastic.Elastic(matrix)))),
+              ('bruteForce', lambda: analysis.extrema3D(elastic.Elastic(matrix), True)),
+              ('sections', lambda: [elate.planeSections(elas, job, u) for job in ('shear', 'poisson')]),
+              ('write3DPlotData', write3D)]
+    stages += [('plot3D-' + job, functools.partial(elate.plot3D, matrix, name, job))
+               for job in ('young', 'lc', 'shear', 'poisson')]
+    return stages
+
+
+def stages2D(name, matrix):
+    """Return the list of (stage name, function) to benchmark for a 2D tensor"""
+    elas = elastic.Elastic2D(matrix)
+    u = np.linspace(0, np.pi, 180)
+    return [('page', lambda: elate.ELATE(matrix, name)),
+            ('extrema', lambda: analysis.extrema2D(elastic.Elastic2D(matrix))),
+            ('sections', lambda: (elas.Young(u), elas.shear(u), elas.Poisson(u)))]
+
+
+def runStage(func, repeat=3):
+    """Run a stage repeat times with empty caches, and return its best time, evaluations and output size"""
+
+    best = float('inf')
+    for _ in range(repeat):
+        cache.default.clear()
+        if cache.pages is not None:
+            cache.pages.clear()
+        symmetry._gridOrbits.cache_clear()
+        with countEvaluations() as counts:
+            start = time.perf_counter()
+            res = func()
+            best = min(best, time.perf_counter() - start)
+    return {'time': best,
+            'calls': sum(c[0] for c in counts.values()),
+            'evaluations': sum(c[1] for c in counts.values()),
+            'bytes': outputSize(res)}
+
+
+def run(tensors=None, repeat=3, only=None, log=None):
+    """
+    Run the benchmarks on a dictionary of {name: matrix} (by default the reference 2D and 3D tensors,
+    and triclinicExamples()), for the stages whose name contains only (if given). Returns the results
+    as a dictionary {tensor name: {stage name: result}}, see runStage().
+    """
+
+    if tensors is None:
+        tensors = {**refdata.examples_3D, **refdata.examples_2D, **triclinicExamples()}
+
+    results = {}
+    for name, matrix in tensors.items():
+        try:
+            elastic.Elastic(matrix)
+            stages = stages3D(name, matrix)
+        except TypeError:
+            stages = stages2D(name, matrix)
+        results[name] = {}
+        for stage, func in stages:
+            if only is not None and only not in stage:
+                continue
+            results[name][stage] = runStage(func, repeat)
+            if log is not None:
+                log(name, stage, results[name][stage])
+    return results
+
+
+def report(results):
+    """Return the JSON document for benchmark results, with a description of the environment"""
+    return {'version': __version__, 'python': platform.python_version(), 'numpy': np.__version__,
+            'machine': platform.machine(), 'results': results}
+
+
+def compare(results, baseline, tolerance=1.5, mintime=0.005):
+    """
+    Compare benchmark results to a baseline (results, or a report), and return the list of regressions
+    as strings: times larger than tolerance times the baseline (and by more than mintime seconds),
+    more evaluations than the baseline, or output sizes differing by more than 1%
+    """
+
+    baseline = baseline.get('results', baseline)
+    regressions = []
+    for name, stages in results.items():
+        for stage, res in stages.items():
+            base = baseline.get(name, {}).get(stage)
+            if base is None:
+                continue
+            what = '%s / %s: ' % (name, stage)
+            if res['time'] > tolerance * base['time'] and res['time'] - base['time'] > mintime:
+                regressions.append(what + 'time %.4g s, baseline %.4g s' % (res['time'], base['time']))
+            if res['evaluations'] > base['evaluations']:
+                regressions.append(what + '%d evaluations, baseline %d' % (res['evaluations'], base['evaluations']))
+            if res['bytes'] is not None and base['bytes'] and abs(res['bytes'] - base['bytes']) > 0.01 * base['bytes']:
+                regressions.append(what + '%d bytes, baseline %d' % (res['bytes'], base['bytes']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs of each stage (the best time is kept)')
+    parser.add_argument('--only', help='only run the stages whose name contains this string')
+    parser.add_argument('--save', help='save the results to this JSON file')
+    parser.add_argument('--baseline', help='compare the results to this JSON file')
+    parser.add_argument('--tolerance', type=float, default=1.5, help='maximum ratio of times to the baseline')
+    args = parser.parse_args(argv)
+
+    def log(name, stage, res):
+        print('%-16s %-16s %9.2f ms %9d evaluations %10s bytes'
+              % (name, stage, 1000 * res['time'], res['evaluations'], res['bytes'] if res['bytes'] is not None else '-'))
+
+    results = run(repeat=args.repeat, only=args.only, log=log)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(report(results), f, indent=1, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for r in regressions:
+            print('REGRESSION ' + r)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+
+"""
+Content-addressed cache of results (extrema, plot grids and HTML pages).
+
+Entries are keyed on a hash of the symmetrized stiffness matrix, so that the same tensor
+entered with different whitespace, or as a triangular or square matrix, gives the same key.
+The code version is part of every key, so results from another version are never used.
+"""
+
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from ELATE import elastic, profiling
+
+__author__ = "Romain Gaillac and François-Xavier Coudert"
+__version__ = "2025.08.26"
+__license__ = "MIT"
+
+
+class ResultCache:
+    """
+    A bounded-memory LRU cache, with an optional on-disk tier (one pickle file per entry,
+    in a subdirectory per code version). Counts hits and misses.
+    """
+
+    def __init__(self, maxbytes=256 * 2**20, directory=None):
+        self.maxbytes = maxbytes
+        self.directory = None if directory is None else os.path.join(directory, __version__)
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + '.pickle')
+
+    def _store(self, key, value, size):
+        # Insert in memory, evicting the least recently used entries
+        if size > self.maxbytes:
+            return
+        self._entries[key] = (value, size)
+        self.nbytes += size
+        while self.nbytes > self.maxbytes:
+            _, (_, s) = self._entries.popitem(last=False)
+            self.nbytes -= s
+
+    def get(self, key, default=None):
+        """Return the value for a key (from memory, or else from disk), or default"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+
+        if self.directory is not None:
+            try:
+                with open(self._path(key), 'rb') as f:
+                    data = f.read()
+                value = pickle.loads(data)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                pass
+            else:
+                with self._lock:
+                    self._store(key, value, len(data))
+                    self.hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return default
+
+    def put(self, key, value):
+        """Store a value, in memory and on disk"""
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            if key in self._entries:
+                self.nbytes -= self._entries.pop(key)[1]
+            self._store(key, value, len(data))
+
+        if self.directory is not None:
+            # Write atomically, so that concurrent readers never see a partial file
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+
+    def clear(self):
+        """Remove all entries from memory (the disk tier is left untouched), and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Return the hit and miss counters, and the number and size of entries in memory"""
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries), 'bytes': self.nbytes}
+
+
+# Marker for missing entries, as None is a valid value
+_missing = object()
+
+# Cache used by the analysis functions and the 3D surfaces. It can be replaced
+# (e.g. by a cache with an on-disk tier), or set to None to disable caching.
+default = ResultCache()
+
+# Cache of whole pages (see cachedPage), disabled by default. As 3D plot pages are 10 to 25 MB,
+# it should be given a larger size, e.g. ResultCache(maxbytes=2**30).
+pages = None
+
+
+def tensorKey(kind, elas, *params):
+    """Return the key for a result of a given kind, for an elastic tensor and extra parameters"""
+    h = hashlib.sha256()
+    h.update(repr((__version__, kind, elas.is2D(), params)).encode('utf-8'))
+    # Adding 0 turns negative zeros into positive zeros
+    h.update(np.ascontiguousarray(np.asarray(elas.CVoigt, dtype=float) + 0.).tobytes())
+    return h.hexdigest()
+
+
+def cached(kind, elas, params, compute, page=False):
+    """
+    Return the result of compute(), cached under a key built from the tensor and parameters,
+    in the default cache (or in the page cache, with page=True)
+    """
+    c = pages if page else default
+    if c is None:
+        return compute()
+    key = tensorKey(kind, elas, *params)
+    value = c.get(key, _missing)
+    if value is _missing:
+        profiling.count('cache.miss.' + kind)
+        value = compute()
+        c.put(key, value)
+    else:
+        profiling.count('cache.hit.' + kind)
+    return value
+
+
+def cachedPage(kind, ignore=('workers',), bypass=('debug',), refresh=None):
+    """
+    Decorator for functions taking a matrix as first argument, and returning a page: the result
+    is cached in the page cache for valid matrices, using the values of the other arguments (except
+    those ignored) as part of the key. Calls where one of the bypass arguments is true are not cached.
+    If given, refresh(page, start) is applied to the pages returned, with the time at which the call
+    started (to update the parts of the page which depend on the request).
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            if pages is None or any(bound.arguments.get(k) for k in bypass):
+                return func(*args, **kwargs)
+            matrix = bound.arguments.pop('matrix')
+            try:
+                elas = elastic.Elastic(matrix)
+            except TypeError:
+                try:
+                    elas = elastic.Elastic2D(matrix)
+                except ValueError:
+                    return func(*args, **kwargs)
+            except ValueError:
+                return func(*args, **kwargs)
+
+            params = tuple((k, v) for k, v in bound.arguments.items() if k not in ignore)
+            page = cached(kind, elas, params, lambda: func(*args, **kwargs), page=True)
+            return page if refresh is None else refresh(page, start)
+
+        return wrapper
+
+    return decorator
+
@@ -1,11 +1,14 @@
 # -*- coding: utf-8 -*-
 
+import itertools
 import json
 import math
 
 import numpy as np
 from scipy import optimize
 
+from ELATE import profiling, symmetry
+
 __author__ = "Romain Gaillac and François-Xavier Coudert"
 __version__ = "2025.08.26"
 __license__ = "MIT"
@@ -28,6 +31,55 @@ def dirVec2(theta, phi, chi):
             - math.sin(theta)*math.cos(chi)]
 
 
+def dirVecArray(theta, phi):
+    """Return unit vectors for arrays of angles theta and phi, as an array of shape (..., 3)"""
+    theta, phi = np.broadcast_arrays(np.asarray(theta, dtype=float), np.asarray(phi, dtype=float))
+    st = np.sin(theta)
+    return np.stack([st*np.cos(phi), st*np.sin(phi), np.cos(theta)], axis=-1)
+
+
+def dirVec2Array(theta, phi, chi):
+    """Return the second unit vectors for arrays of angles (theta, phi, chi), as an array of shape (..., 3)"""
+    theta, phi, chi = np.broadcast_arrays(np.asarray(theta, dtype=float), np.asarray(phi, dtype=float),
+                                          np.asarray(chi, dtype=float))
+    ct, cf, cx = np.cos(theta), np.cos(phi), np.cos(chi)
+    sf, sx = np.sin(phi), np.sin(chi)
+    return np.stack([ct*cf*cx - sf*sx, ct*sf*cx + cf*sx, -np.sin(theta)*cx], axis=-1)
+
+
+def quadraticMonomials(x, y, z):
+    """Monomials of a quadratic form in the direction (x, y, z), which can be floats or arrays"""
+    return (x*x, y*y, z*z, y*z, x*z, x*y)
+
+
+def quarticMonomials(x, y, z):
+    """Monomials of a quartic form in the direction (x, y, z), which can be floats or arrays"""
+    x2, y2, z2 = x*x, y*y, z*z
+    return (x2*x2, y2*y2, z2*z2, x2*x*y, x2*x*z, y2*y*x, y2*y*z, z2*z*x, z2*z*y,
+            x2*y2, x2*z2, y2*z2, x2*y*z, y2*x*z, z2*x*y)
+
+
+def dirAngles(a):
+    """Return the angles (theta, phi) of a unit vector, taking phi in [0, pi] since properties are centrosymmetric"""
+    x, y, z = (float(c) for c in a)
+    if y < 0 or (y == 0 and x < 0):
+        x, y, z = -x, -y, -z
+    return (math.acos(max(-1., min(1., z))), math.atan2(y, x))
+
+
+# Exponents (p, q, r) of the monomials x^p y^q z^r returned by quarticMonomials()
+quarticExponents = [(4, 0, 0), (0, 4, 0), (0, 0, 4), (3, 1, 0), (3, 0, 1), (1, 3, 0), (0, 3, 1), (1, 0, 3), (0, 1, 3),
+                    (2, 2, 0), (2, 0, 2), (0, 2, 2), (2, 1, 1), (1, 2, 1), (1, 1, 2)]
+
+# Matrix of shape (81, 15), mapping the flattened S_ijkl to the coefficients of its quartic form
+quarticMatrix = np.zeros((81, 15))
+for n, ijkl in enumerate(np.ndindex(3, 3, 3, 3)):
+    quarticMatrix[n, quarticExponents.index(tuple(ijkl.count(k) for k in range(3)))] = 1
+
+# Voigt index of each pair of Cartesian indices
+VoigtMat = np.array([[0, 5, 4], [5, 1, 3], [4, 3, 2]])
+
+
 # Functions to minimize/maximize
 def minimize(func, dim):
     """Find the global minimum of a function with 2 (theta, phi) or 3 (theta, phi, chi) parameters"""
@@ -53,74 +105,176 @@ def maximize(func, dim):
     return (res[0], -res[1])
 
 
-class Elastic:
+def quarticMaximum(T, npoints=40, nstart=8, niter=30, ops=None):
+    """
+    Find the unit vector a maximizing the quartic form T_ijkl a_i a_j a_k a_l on the sphere,
+    for a fully symmetric tensor T. The form is evaluated on a grid of the half-sphere, then
+    the best points are refined together by Newton iterations on the sphere, using the exact
+    gradient 4 T a^3 and Hessian 12 T a^2. If the symmetry operations of T are given, the
+    starting points are the local maxima of the grid, mapped to the irreducible wedge, so that
+    none of them is the image of another.
     """
-    An elastic tensor, along with methods to access it.
 
-    It will raise a ValueError when the input is invalid, and a TypeError
+    # Starting points: best points on a (theta, phi) grid of the half-sphere, or of the sphere with symmetry
+    if ops is None:
+        theta, phi = np.meshgrid(np.linspace(0, np.pi, npoints), np.linspace(0, np.pi, npoints), indexing='ij')
+        a = dirVecArray(theta.ravel(), phi.ravel())
+        q = np.einsum('ijkl,ni,nj,nk,nl->n', T, a, a, a, a)
+    else:
+        theta, phi = np.meshgrid(np.linspace(0, np.pi, npoints),
+                                 np.linspace(0, 2 * np.pi, 2 * npoints, endpoint=False), indexing='ij')
+        a = dirVecArray(theta, phi)
+        aa = a[..., :, None] * a[..., None, :]
+        q = np.sum((aa.reshape(-1, 9) @ T.reshape(9, 9)) * aa.reshape(-1, 9), axis=1).reshape(theta.shape)
+        peak = (q >= np.roll(q, 1, axis=1)) & (q >= np.roll(q, -1, axis=1))
+        peak[1:] &= q[1:] >= q[:-1]
+        peak[:-1] &= q[:-1] >= q[1:]
+        a, _ = symmetry.toWedge(ops, a[peak])
+        a = np.unique(np.round(a, 12) + 0., axis=0)
+        q = np.einsum('ijkl,ni,nj,nk,nl->n', T, a, a, a, a)
+    a = a[np.argsort(-q)[:nstart]]
+    qbest = q.max()
+
+    scale = np.abs(T).sum()
+    for it in range(niter):
+        g = 4 * np.einsum('ijkl,nj,nk,nl->ni', T, a, a, a)
+        H = 12 * np.einsum('ijkl,nk,nl->nij', T, a, a)
+        # Orthonormal basis (e1, e2) of the tangent plane at each point
+        ref = np.where(np.abs(a[:, 2:3]) < 0.9, [[0., 0., 1.]], [[1., 0., 0.]])
+        e1 = np.cross(a, ref)
+        e1 /= np.linalg.norm(e1, axis=1)[:, None]
+        e2 = np.cross(a, e1)
+        E = np.stack([e1, e2], axis=2)
+        # Riemannian gradient and Hessian in the tangent basis
+        grad = np.einsum('nik,ni->nk', E, g)
+        hess = np.einsum('nik,nij,njl->nkl', E, H, E) - np.einsum('ni,ni->n', a, g)[:, None, None] * np.eye(2)
+        # Newton step, forcing the Hessian to be negative definite so that we go uphill
+        w, v = np.linalg.eigh(hess)
+        w = -np.maximum(np.abs(w), 1e-9 * scale)
+        step = -np.einsum('nkl,nl,nml,nm->nk', v, 1 / w, v, grad)
+        a = a + np.einsum('nik,nk->ni', E, step)
+        a /= np.linalg.norm(a, axis=1)[:, None]
+        if np.max(np.abs(step)) < 1e-12:
+            break
+
+    q = np.einsum('ijkl,ni,nj,nk,nl->n', T, a, a, a, a)
+    best = np.argmax(q)
+    if q[best] < qbest:
+        # Newton should only improve on the grid, but be safe
+        return quarticMaximum(T, 2 * npoints, nstart, 0, ops)
+    return a[best], float(q[best])
+
+
+def parseMatrix(s):
+    """
+    Interpret the argument as a 6x6 stiffness matrix, and return it as an array (which
+    may still be triangular). Raise a ValueError when the input is invalid, and a TypeError
     if the input is valid but corresponds to a 2D material.
     """
 
-    def __init__(self, s):
-        """Initialize the elastic tensor from a string"""
-
-        # Argument can be a 6-line string, a list of list, or a string representation of the list of list
+    # Argument can be a 6-line string, a list of list, or a string representation of the list of list
 
-        # If the argument is JSON, decode it
-        if isinstance(s, str):
-            try:
-                s = json.loads(s)
-            except:
-                pass
-
-        if isinstance(s, np.ndarray) or isinstance(s, list):
-            # If we already have a list or numpy array, fine
-            mat = s
-        elif isinstance(s, str):
-            # Remove braces and pipes
-            s = s.replace("|", " ").replace("(", " ").replace(")", " ")
+    # If the argument is JSON, decode it
+    if isinstance(s, str):
+        try:
+            s = json.loads(s)
+        except:
+            pass
 
-            # Remove empty lines
-            lines = [line for line in s.split('\n') if line.strip()]
-            if len(lines) == 3:
-                raise TypeError("is a 2D material")
-            if len(lines) != 6:
-                raise ValueError("should have three or six rows")
+    if isinstance(s, np.ndarray) or isinstance(s, list):
+        # If we already have a list or numpy array, fine
+        mat = s
+    elif isinstance(s, str):
+        # Remove braces and pipes
+        s = s.replace("|", " ").replace("(", " ").replace(")", " ")
 
-            # Convert to list of list of floats
-            try:
-                mat = [list(map(float, line.split())) for line in lines]
-            except:
-                raise ValueError("not all entries are numbers")
-        else:
-            raise ValueError("invalid argument as matrix")
+        # Remove empty lines
+        lines = [line for line in s.split('\n') if line.strip()]
+        if len(lines) == 3:
+            raise TypeError("is a 2D material")
+        if len(lines) != 6:
+            raise ValueError("should have three or six rows")
 
-        # Make it into a square matrix
+        # Convert to list of list of floats
         try:
-            mat = np.array(mat)
+            mat = [list(map(float, line.split())) for line in lines]
         except:
-            # Is it upper triangular?
-            if list(map(len, mat)) == [6,5,4,3,2,1]:
-                mat = [[0]*i + mat[i] for i in range(6)]
-                mat = np.array(mat)
-            if list(map(len, mat)) == [3,2,1]:
-                mat = [[0]*i + mat[i] for i in range(3)]
-                mat = np.array(mat)
+            raise ValueError("not all entries are numbers")
+    else:
+        raise ValueError("invalid argument as matrix")
+
+    # Make it into a square matrix
+    try:
+        mat = np.array(mat)
+    except:
+        # Is it upper triangular?
+        if list(map(len, mat)) == [6,5,4,3,2,1]:
+            mat = [[0]*i + mat[i] for i in range(6)]
+            mat = np.array(mat)
+        if list(map(len, mat)) == [3,2,1]:
+            mat = [[0]*i + mat[i] for i in range(3)]
+            mat = np.array(mat)
 
-            # Is it lower triangular?
-            if list(map(len, mat)) == [1,2,3,4,5,6]:
-                mat = [mat[i] + [0]*(5-i) for i in range(6)]
-                mat = np.array(mat)
-            if list(map(len, mat)) == [1,2,3]:
-                mat = [mat[i] + [0]*(2-i) for i in range(3)]
-                mat = np.array(mat)
+        # Is it lower triangular?
+        if list(map(len, mat)) == [1,2,3,4,5,6]:
+            mat = [mat[i] + [0]*(5-i) for i in range(6)]
+            mat = np.array(mat)
+        if list(map(len, mat)) == [1,2,3]:
+            mat = [mat[i] + [0]*(2-i) for i in range(3)]
+            mat = np.array(mat)
+
+    if not isinstance(mat, np.ndarray):
+        raise ValueError("should be a square or triangular matrix")
+    if mat.shape == (3,3):
+        raise TypeError("is a 2D material")
+    if mat.shape != (6,6):
+        raise ValueError("should be a square or triangular matrix")
+
+    return mat
+
+
+def complianceTensor(SVoigt):
+    """Return the compliance tensor S_ijkl, as an array of shape (..., 3, 3, 3, 3), from compliance matrices of shape (..., 6, 6)"""
+    p = VoigtMat[:, :, None, None]
+    q = VoigtMat[None, None, :, :]
+    return np.ascontiguousarray(SVoigt[..., p, q] / ((1 + p//3) * (1 + q//3)))
+
+
+def complianceMatrix(Smat):
+    """Return the compliance matrix in Voigt notation, of shape (6, 6), from the compliance tensor S_ijkl"""
+    i, j = [0, 1, 2, 1, 0, 0], [0, 1, 2, 2, 2, 1]
+    factor = np.array([1, 1, 1, 2, 2, 2])
+    return Smat[i, j][:, i, j] * factor[:, None] * factor[None, :]
+
+
+def chiExtrema(p, r, s):
+    """
+    Return (min, max, argmin, argmax) over chi of the quadratic form
+    p cos(chi)^2 + 2 r cos(chi) sin(chi) + s sin(chi)^2, with chi in [0, pi)
+    """
+    mean = (p + s) / 2
+    dev = np.hypot((p - s) / 2, r)
+    chimax = (np.arctan2(r, (p - s) / 2) / 2) % np.pi
+    chimin = (chimax + np.pi / 2) % np.pi
+    return (mean - dev, mean + dev, chimin, chimax)
 
-        if not isinstance(mat, np.ndarray):
-            raise ValueError("should be a square or triangular matrix")
-        if mat.shape == (3,3):
-            raise TypeError("is a 2D material")
-        if mat.shape != (6,6):
-            raise ValueError("should be a square or triangular matrix")
+
+@profiling.counted
+class Elastic:
+    """
+    An elastic tensor, along with methods to access it.
+
+    It will raise a ValueError when the input is invalid, and a TypeError
+    if the input is valid but corresponds to a 2D material.
+    """
+
+    # Name of the symmetry for which specific (faster) code is used, in subclasses
+    specificCase = None
+
+    def __init__(self, s):
+        """Initialize the elastic tensor from a string"""
+
+        mat = parseMatrix(s)
 
         # Check that is is symmetric, or make it symmetric
         if np.linalg.norm(np.tril(mat, -1)) == 0:
@@ -142,14 +296,47 @@ class Elastic:
         except:
             raise ValueError("matrix is singular")
 
-        VoigtMat = [[0, 5, 4], [5, 1, 3], [4, 3, 2]]
-        def SVoigtCoeff(p,q):
-            return 1. / ((1+p//3)*(1+q//3))
-
-        self.Smat = [[[[ SVoigtCoeff(VoigtMat[i][j], VoigtMat[k][l]) * self.SVoigt[VoigtMat[i][j]][VoigtMat[k][l]]
-                         for i in range(3) ] for j in range(3) ] for k in range(3) ] for l in range(3) ]
+        # Compliance tensor S_ijkl, as a 3x3x3x3 array
+        self.Smat = complianceTensor(self.SVoigt)
+        self.precompute()
         return
 
+    def precompute(self):
+        """Precompute the reductions of Smat used for directional properties"""
+
+        # S_ijkl as a 9x9 matrix acting on the dyads a_i b_j, and S_ikjl acting on the dyads a_i a_k
+        self.S99 = self.Smat.reshape(9, 9)
+        self.S99shear = self.Smat.transpose(0, 2, 1, 3).reshape(9, 9)
+
+        # Coefficients of the quartic form S_ijkl a_i a_j a_k a_l, in the order of quarticMonomials()
+        self.quartic = tuple(float(c) for c in self.Smat.reshape(81) @ quarticMatrix)
+
+        # Matrix sum_k S_ijkk, and coefficients of its quadratic form in the order of quadraticMonomials()
+        self.LCmat = np.trace(self.Smat, axis1=2, axis2=3)
+        M = self.LCmat
+        self.quadratic = tuple(float(c) for c in (M[0, 0], M[1, 1], M[2, 2], 2*M[1, 2], 2*M[0, 2], 2*M[0, 1]))
+
+    def quarticForm(self, a):
+        """Return S_ijkl a_i a_j a_k a_l, for a vector or an array of vectors of shape (..., 3)"""
+        m = quarticMonomials(a[..., 0], a[..., 1], a[..., 2]) if isinstance(a, np.ndarray) else quarticMonomials(*a)
+        return sum(c * x for c, x in zip(self.quartic, m))
+
+    def quadraticForm(self, a):
+        """Return sum_k S_ijkk a_i a_j, for a vector or an array of vectors of shape (..., 3)"""
+        m = quadraticMonomials(a[..., 0], a[..., 1], a[..., 2]) if isinstance(a, np.ndarray) else quadraticMonomials(*a)
+        return sum(c * x for c, x in zip(self.quadratic, m))
+
+    def dyadForm(self, a, b, c, d):
+        """Contract S_ijkl with the dyads (a x b) and (c x d), for vectors or arrays of vectors of shape (..., 3)"""
+        a, b, c, d = np.asarray(a), np.asarray(b), np.asarray(c), np.asarray(d)
+        ab = a[..., :, None] * b[..., None, :]
+        ab = ab.reshape(ab.shape[:-2] + (9,))
+        cd = c[..., :, None] * d[..., None, :]
+        cd = cd.reshape(cd.shape[:-2] + (9,))
+        if ab.ndim == 1 and cd.ndim == 1:
+            return float(ab @ self.S99 @ cd)
+        return np.einsum('...p,pq,...q->...', ab, self.S99, cd)
+
     def is2D(self):
         return False
 
@@ -171,45 +358,105 @@ class Elastic:
                 and iszero(self.CVoigt[3][3] - self.CVoigt[4][4]) and iszero(self.CVoigt[3][3] - self.CVoigt[5][5])
                 and iszero(self.CVoigt[0][1] - self.CVoigt[0][2]) and iszero(self.CVoigt[0][1] - self.CVoigt[1][2]))
 
+    def symmetryOperations(self, tol=1e-6):
+        """
+        Return the rotations leaving the tensor invariant within tol (relative to its norm), as an
+        array of shape (n, 3, 3). The default only accepts exact symmetries, as needed to reduce the
+        directions to evaluate, while LaueClass() allows for the precision of the input.
+        """
+        ops = getattr(self, '_symmetry', {})
+        if tol not in ops:
+            ops[tol] = symmetry.symmetryOperations(self.Smat, tol)
+            self._symmetry = ops
+        return ops[tol]
+
+    def LaueClass(self):
+        """Return the Laue class of the tensor, as a Hermann-Mauguin symbol (e.g. 'm-3m')"""
+        return symmetry.LaueClass(self.symmetryOperations(symmetry.tolerance))
+
+    def symmetrized(self):
+        """
+        Return the tensor averaged over the rotations of its Laue class (see LaueClass), as an
+        Elastic object which is exactly invariant under them, or the tensor itself if it already is
+        """
+        ops = self.symmetryOperations(symmetry.tolerance)
+        if len(ops) == len(self.symmetryOperations()):
+            return self
+        res = Elastic.__new__(Elastic)
+        res.Smat = np.ascontiguousarray(symmetry.symmetrize(self.Smat, ops))
+        res.SVoigt = complianceMatrix(res.Smat)
+        res.CVoigt = np.linalg.inv(res.SVoigt)
+        res._symmetry = {1e-6: ops, symmetry.tolerance: ops}
+        res.precompute()
+        return res
+
     def Young(self, x):
-        a = dirVec(x[0], x[1])
-        r = sum([ a[i]*a[j]*a[k]*a[l] * self.Smat[i][j][k][l]
-                  for i in range(3) for j in range(3) for k in range(3) for l in range(3) ])
-        return 1/r
+        return 1/self.quarticForm(dirVec(x[0], x[1]))
 
+    # Functions of two scalar angles, which use the (possibly specialized) functions above
     def Young_2(self, x, y):
-        a = dirVec(x, y)
-        r = sum([ a[i]*a[j]*a[k]*a[l] * self.Smat[i][j][k][l]
-                  for i in range(3) for j in range(3) for k in range(3) for l in range(3) ])
-        return 1/r
+        return self.Young([x, y])
 
     def LC(self, x):
-        a = dirVec(x[0], x[1])
-        r = sum([ a[i]*a[j] * self.Smat[i][j][k][k]
-                  for i in range(3) for j in range(3) for k in range(3) ])
-        return 1000 * r
+        return 1000 * self.quadraticForm(dirVec(x[0], x[1]))
 
     def LC_2(self, x, y):
-        a = dirVec(x, y)
-        r = sum([ a[i]*a[j] * self.Smat[i][j][k][k]
-                  for i in range(3) for j in range(3) for k in range(3) ])
-        return 1000 * r
+        return self.LC([x, y])
 
     def shear(self, x):
         a = dirVec(x[0], x[1])
         b = dirVec2(x[0], x[1], x[2])
-        r = sum([ a[i]*b[j]*a[k]*b[l] * self.Smat[i][j][k][l]
-                  for i in range(3) for j in range(3) for k in range(3) for l in range(3) ])
-        return 1/(4*r)
+        return 1/(4*self.dyadForm(a, b, a, b))
 
     def Poisson(self, x):
         a = dirVec(x[0], x[1])
         b = dirVec2(x[0], x[1], x[2])
-        r1 = sum([ a[i]*a[j]*b[k]*b[l] * self.Smat[i][j][k][l]
-                   for i in range(3) for j in range(3) for k in range(3) for l in range(3) ])
-        r2 = sum([ a[i]*a[j]*a[k]*a[l] * self.Smat[i][j][k][l]
-                   for i in range(3) for j in range(3) for k in range(3) for l in range(3) ])
-        return -r1/r2
+        return -self.dyadForm(a, a, b, b)/self.quarticForm(a)
+
+    # Vectorized versions: angles can be NumPy arrays of any (broadcastable) shape,
+    # and the result has the same shape
+    def Young_array(self, theta, phi):
+        return 1 / self.quarticForm(dirVecArray(theta, phi))
+
+    def LC_array(self, theta, phi):
+        return 1000 * self.quadraticForm(dirVecArray(theta, phi))
+
+    def shear_array(self, theta, phi, chi):
+        a = dirVecArray(theta, phi)
+        b = dirVec2Array(theta, phi, chi)
+        return 1 / (4 * self.dyadForm(a, b, a, b))
+
+    def Poisson_array(self, theta, phi, chi):
+        a = dirVecArray(theta, phi)
+        b = dirVec2Array(theta, phi, chi)
+        return -self.dyadForm(a, a, b, b) / self.quarticForm(a)
+
+    # Extrema of Young's modulus and linear compressibility, returned as ((theta, phi), value)
+    # pairs like minimize() and maximize()
+    def YoungExtrema(self):
+        """Return the minimum and maximum of Young's modulus"""
+        # 1/E is a quartic form in the direction: fully symmetrize the tensor
+        T = sum(self.Smat.transpose(p) for p in itertools.permutations(range(4))) / 24
+        ops = self.symmetryOperations()
+        amin, qmax = quarticMaximum(T, ops=ops)
+        amax, qmin = quarticMaximum(-T, ops=ops)
+        return ((dirAngles(amin), 1 / qmax), (dirAngles(amax), -1 / qmin))
+
+    def LCExtrema(self):
+        """Return the minimum and maximum of the linear compressibility"""
+        # It is a quadratic form in the direction, so extrema are eigenvalues of sum_k S_ijkk
+        w, v = np.linalg.eigh(self.LCmat)
+        return ((dirAngles(v[:, 0]), 1000 * float(w[0])), (dirAngles(v[:, 2]), 1000 * float(w[2])))
+
+    def shearExtrema(self):
+        """Return the minimum and maximum of the shear modulus, as ((theta, phi, chi), value) pairs"""
+        from ELATE import optimizer
+        return optimizer.minimize(self, 'shear'), optimizer.maximize(self, 'shear')
+
+    def PoissonExtrema(self):
+        """Return the minimum and maximum of Poisson's ratio, as ((theta, phi, chi), value) pairs"""
+        from ELATE import optimizer
+        return optimizer.minimize(self, 'Poisson'), optimizer.maximize(self, 'Poisson')
 
     def averages(self):
         A = (self.CVoigt[0][0] + self.CVoigt[1][1] + self.CVoigt[2][2]) / 3
@@ -235,44 +482,195 @@ class Elastic:
     def eigenvalues(self):
         return np.sort(np.linalg.eig(self.CVoigt)[0])
 
+    # Extrema over chi, i.e. over the direction b(chi) = cos(chi) u + sin(chi) v perpendicular
+    # to a. For fixed a, shear modulus and Poisson's ratio are quadratic forms in b, so they
+    # are found in closed form. Angles can be NumPy arrays of any (broadcastable) shape.
+    def _chiMatrix(self, a, S):
+        # Matrix of the quadratic form in b: S_ijkl a_i a_k (shear, with S = S99shear) or
+        # S_ijkl a_i a_j (Poisson, with S = S99), as a product of the dyads a_i a_k with S
+        aa = a[..., :, None] * a[..., None, :]
+        return (aa.reshape(aa.shape[:-2] + (9,)) @ S).reshape(aa.shape)
+
+    def _chiForm(self, theta, phi, S):
+        a = dirVecArray(theta, phi)
+        u = dirVec2Array(theta, phi, 0)
+        v = dirVec2Array(theta, phi, np.pi/2)
+        M = self._chiMatrix(a, S)
+        p = np.einsum('...i,...ij,...j->...', u, M, u)
+        r = np.einsum('...i,...ij,...j->...', u, M, v)
+        s = np.einsum('...i,...ij,...j->...', v, M, v)
+        return a, chiExtrema(p, r, s)
+
+    def shearChi(self, theta, phi):
+        """Return (min, max, argmin, argmax) of the shear modulus over chi"""
+        a, (wmin, wmax, cmin, cmax) = self._chiForm(theta, phi, self.S99shear)
+        return (1 / (4 * wmax), 1 / (4 * wmin), cmax, cmin)
+
+    def PoissonChi(self, theta, phi):
+        """Return (min, max, argmin, argmax) of Poisson's ratio over chi"""
+        a, (wmin, wmax, cmin, cmax) = self._chiForm(theta, phi, self.S99)
+        q = self.quarticForm(a)
+        return (-wmax / q, -wmin / q, cmax, cmin)
+
     def shear2D(self, x):
-        ftol = 0.001
-        xtol = 0.01
-        def func1(z): return self.shear([x[0], x[1], z[0]])
-        r1 = optimize.minimize(func1, np.pi/2.0, args=(), method = 'Powell', options={"xtol":xtol, "ftol":ftol})
-        def func2(z): return -self.shear([x[0], x[1], z[0]])
-        r2 = optimize.minimize(func2, np.pi/2.0, args=(), method = 'Powell', options={"xtol":xtol, "ftol":ftol})
-        return (float(r1.fun), -float(r2.fun))
+        r = self.shearChi(x[0], x[1])
+        return (r[0], r[1])
 
     def shear3D(self, x, y, guess1 = np.pi/2.0, guess2 = np.pi/2.0):
-        tol = 0.0005
-        def func1(z): return self.shear([x, y, z[0]])
-        r1 = optimize.minimize(func1, guess1, args=(), method = 'L-BFGS-B')
-        def func2(z): return -self.shear([x, y, z[0]])
-        r2 = optimize.minimize(func2, guess2, args=(), method = 'L-BFGS-B')
-        return (float(r1.fun), -float(r2.fun), float(r1.x[0]), float(r2.x[0]))
+        # Initial guesses are not needed anymore, they are kept for compatibility
+        return self.shearChi(x, y)
 
     def Poisson2D(self, x):
-        ftol = 0.001
-        xtol = 0.01
-        def func1(z): return self.Poisson([x[0], x[1], z[0]])
-        r1 = optimize.minimize(func1, np.pi/2.0, args=(), method = 'Powell', options={"xtol":xtol, "ftol":ftol})
-        def func2(z): return -self.Poisson([x[0], x[1], z[0]])
-        r2 = optimize.minimize(func2, np.pi/2.0, args=(), method = 'Powell', options={"xtol":xtol, "ftol":ftol})
-        return (min(0,float(r1.fun)), max(0,float(r1.fun)), -float(r2.fun))
+        r = self.PoissonChi(x[0], x[1])
+        return (np.minimum(0, r[0]), np.maximum(0, r[0]), r[1])
 
     def Poisson3D(self, x, y, guess1 = np.pi/2.0, guess2 = np.pi/2.0):
-        tol = 0.005
-        def func1(z): return self.Poisson([x, y, z[0]])
-        r1 = optimize.minimize(func1, guess1, args=(), method = 'L-BFGS-B')
-        def func2(z): return -self.Poisson([x, y, z[0]])
-        r2 = optimize.minimize(func2, guess2, args=(), method = 'L-BFGS-B')
-        return (min(0,float(r1.fun)), max(0,float(r1.fun)), -float(r2.fun), float(r1.x[0]), float(r2.x[0]))
+        # Initial guesses are not needed anymore, they are kept for compatibility
+        r = self.PoissonChi(x, y)
+        return (np.minimum(0, r[0]), np.maximum(0, r[0]), r[1], r[2], r[3])
+
+
+class ElasticBatch:
+    """
+    A stack of N elastic tensors, processed together as arrays of shape (N, 6, 6).
+
+    Invalid tensors do not raise: the exception that Elastic would have raised is stored
+    in the errors list, the valid mask is False, and their properties are NaN.
+    """
+
+    def __init__(self, mats):
+        """Initialize from an array of shape (N, 6, 6), or from a list of anything accepted by Elastic"""
+
+        if isinstance(mats, np.ndarray) and mats.ndim == 3 and mats.shape[1:] == (6, 6):
+            mat = mats.astype(float)
+            self.errors = [None] * len(mat)
+        else:
+            mat = np.zeros((len(mats), 6, 6))
+            self.errors = []
+            for i, s in enumerate(mats):
+                try:
+                    mat[i] = parseMatrix(s)
+                    self.errors.append(None)
+                except (TypeError, ValueError) as e:
+                    self.errors.append(e)
+
+        # Check that they are symmetric, or make them symmetric
+        upper = np.linalg.norm(np.tril(mat, -1), axis=(1, 2)) == 0
+        mat = np.where(upper[:, None, None], mat + np.triu(mat, 1).transpose(0, 2, 1), mat)
+        lower = np.linalg.norm(np.triu(mat, 1), axis=(1, 2)) == 0
+        mat = np.where(lower[:, None, None], mat + np.tril(mat, -1).transpose(0, 2, 1), mat)
+        asym = np.linalg.norm(mat - mat.transpose(0, 2, 1), axis=(1, 2))
+        for i in np.flatnonzero(asym > 1e-3):
+            if self.errors[i] is None:
+                self.errors[i] = ValueError("should be symmetric, or triangular")
+        mat = 0.5 * (mat + mat.transpose(0, 2, 1))
+
+        # Invert all of them at once, and only look for the singular ones if that fails
+        valid = np.array([e is None for e in self.errors], dtype=bool)
+        inv = np.full_like(mat, np.nan)
+        try:
+            inv[valid] = np.linalg.inv(mat[valid])
+        except np.linalg.LinAlgError:
+            for i in np.flatnonzero(valid):
+                try:
+                    inv[i] = np.linalg.inv(mat[i])
+                except np.linalg.LinAlgError:
+                    self.errors[i] = ValueError("matrix is singular")
+        self.valid = np.array([e is None for e in self.errors], dtype=bool)
+
+        mat[~self.valid] = np.nan
+        inv[~self.valid] = np.nan
+        self.CVoigt = mat
+        self.SVoigt = inv
+        self.Smat = complianceTensor(self.SVoigt)
+
+        # Same reductions as Elastic.precompute(), for the whole stack
+        n = len(mat)
+        self.S99 = self.Smat.reshape(n, 9, 9)
+        self.quartic = self.Smat.reshape(n, 81) @ quarticMatrix
+        M = np.trace(self.Smat, axis1=3, axis2=4)
+        self.LCmat = M
+        self.quadratic = np.stack((M[:, 0, 0], M[:, 1, 1], M[:, 2, 2], 2*M[:, 1, 2], 2*M[:, 0, 2], 2*M[:, 0, 1]), axis=-1)
+
+    def __len__(self):
+        return len(self.CVoigt)
+
+    def __getitem__(self, i):
+        """Return the i-th tensor as an Elastic object, or raise its error"""
+        if self.errors[i] is not None:
+            raise self.errors[i]
+        return Elastic(self.CVoigt[i])
+
+    def _offdiagZero(self):
+        C = self.CVoigt
+        return np.all(np.abs(np.concatenate((C[:, :3, 3:].reshape(-1, 9), C[:, 3, 4:], C[:, 4, 5:]), axis=1)) < 1.e-3, axis=1)
+
+    def isOrthorhombic(self):
+        """Return a boolean mask of the orthorhombic tensors"""
+        return self._offdiagZero()
+
+    def isCubic(self):
+        """Return a boolean mask of the cubic tensors"""
+        C = self.CVoigt
+        same = np.stack((C[:, 0, 0] - C[:, 1, 1], C[:, 0, 0] - C[:, 2, 2], C[:, 3, 3] - C[:, 4, 4],
+                         C[:, 3, 3] - C[:, 5, 5], C[:, 0, 1] - C[:, 0, 2], C[:, 0, 1] - C[:, 1, 2]), axis=1)
+        return self._offdiagZero() & np.all(np.abs(same) < 1.e-3, axis=1)
 
+    def averages(self):
+        """Return the Voigt, Reuss and Hill averages (K, E, G, nu) as an array of shape (N, 3, 4)"""
+        C, S = self.CVoigt, self.SVoigt
+        A = (C[:, 0, 0] + C[:, 1, 1] + C[:, 2, 2]) / 3
+        B = (C[:, 1, 2] + C[:, 0, 2] + C[:, 0, 1]) / 3
+        D = (C[:, 3, 3] + C[:, 4, 4] + C[:, 5, 5]) / 3
+        a = (S[:, 0, 0] + S[:, 1, 1] + S[:, 2, 2]) / 3
+        b = (S[:, 1, 2] + S[:, 0, 2] + S[:, 0, 1]) / 3
+        c = (S[:, 3, 3] + S[:, 4, 4] + S[:, 5, 5]) / 3
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            K = np.stack(((A + 2*B) / 3, 1 / (3*a + 6*b)), axis=1)
+            G = np.stack(((A - B + 3*D) / 5, 5 / (4*a - 4*b + 3*c)), axis=1)
+            K = np.concatenate((K, K.mean(axis=1, keepdims=True)), axis=1)
+            G = np.concatenate((G, G.mean(axis=1, keepdims=True)), axis=1)
+            return np.stack((K, 1/(1/(3*G) + 1/(9*K)), G, (1 - 3*G/(3*K+G))/2), axis=2)
 
+    def eigenvalues(self):
+        """Return the sorted eigenvalues of the stiffness matrices, as an array of shape (N, 6)"""
+        w = np.full((len(self), 6), np.nan)
+        w[self.valid] = np.linalg.eigvalsh(self.CVoigt[self.valid])
+        return w
+
+    # Directional properties: angles can be NumPy arrays of any (broadcastable) shape,
+    # and the result has shape (N,) + that shape
+    def Young_array(self, theta, phi):
+        a = dirVecArray(theta, phi)
+        return 1 / np.einsum('nk,...k->n...', self.quartic, np.stack(quarticMonomials(a[..., 0], a[..., 1], a[..., 2]), axis=-1))
+
+    def LC_array(self, theta, phi):
+        a = dirVecArray(theta, phi)
+        return 1000 * np.einsum('nk,...k->n...', self.quadratic, np.stack(quadraticMonomials(a[..., 0], a[..., 1], a[..., 2]), axis=-1))
+
+    def _dyadForm(self, a, b, c, d):
+        ab = a[..., :, None] * b[..., None, :]
+        cd = c[..., :, None] * d[..., None, :]
+        return np.einsum('npq,...p,...q->n...', self.S99, ab.reshape(ab.shape[:-2] + (9,)), cd.reshape(cd.shape[:-2] + (9,)))
+
+    def shear_array(self, theta, phi, chi):
+        a = dirVecArray(theta, phi)
+        b = dirVec2Array(theta, phi, chi)
+        return 1 / (4 * self._dyadForm(a, b, a, b))
+
+    def Poisson_array(self, theta, phi, chi):
+        a = dirVecArray(theta, phi)
+        b = dirVec2Array(theta, phi, chi)
+        return -self._dyadForm(a, a, b, b) / self._dyadForm(a, a, a, a)
+
+
+@profiling.counted
 class ElasticOrtho(Elastic):
     """An elastic tensor, for the specific case of an orthorhombic system"""
 
+    specificCase = 'orthorhombic'
+
     def __init__(self, arg):
         """Initialize from a matrix, or from an Elastic object"""
         if isinstance(arg, str):
@@ -281,34 +679,66 @@ class ElasticOrtho(Elastic):
             self.CVoigt = arg.CVoigt
             self.SVoigt = arg.SVoigt
             self.Smat = arg.Smat
+            self._symmetry = getattr(arg, '_symmetry', {})
+            self.precompute()
         else:
-            raise TypeError("ElasticOrtho constructor argument should be string or Elastic object")
+            raise TypeError(type(self).__name__ + " constructor argument should be string or Elastic object")
+
+    def precompute(self):
+        Elastic.precompute(self)
+
+        # Store the important components
+        self.s11 = float(self.Smat[0, 0, 0, 0])
+        self.s22 = float(self.Smat[1, 1, 1, 1])
+        self.s33 = float(self.Smat[2, 2, 2, 2])
+        self.s44 = float(4 * self.Smat[1, 2, 1, 2])
+        self.s55 = float(4 * self.Smat[0, 2, 0, 2])
+        self.s66 = float(4 * self.Smat[0, 1, 0, 1])
+        self.s12 = float(self.Smat[0, 0, 1, 1])
+        self.s13 = float(self.Smat[0, 0, 2, 2])
+        self.s23 = float(self.Smat[1, 1, 2, 2])
+
+        # Coefficients of the quartic and quadratic forms, which only have even powers
+        self.orthoQuartic = (self.s11, self.s22, self.s33, 2*self.s23 + self.s44, 2*self.s13 + self.s55, 2*self.s12 + self.s66)
+        self.orthoQuadratic = tuple(float(c) for c in np.diag(self.LCmat))
+
+    def quarticForm(self, a):
+        """Return S_ijkl a_i a_j a_k a_l, for a vector or an array of vectors of shape (..., 3)"""
+        x, y, z = (a[..., 0], a[..., 1], a[..., 2]) if isinstance(a, np.ndarray) else a
+        x2, y2, z2 = x*x, y*y, z*z
+        q0, q1, q2, q3, q4, q5 = self.orthoQuartic
+        return x2*(q0*x2 + q5*y2 + q4*z2) + y2*(q1*y2 + q3*z2) + q2*z2*z2
+
+    def quadraticForm(self, a):
+        """Return sum_k S_ijkk a_i a_j, for a vector or an array of vectors of shape (..., 3)"""
+        x, y, z = (a[..., 0], a[..., 1], a[..., 2]) if isinstance(a, np.ndarray) else a
+        return self.orthoQuadratic[0]*x*x + self.orthoQuadratic[1]*y*y + self.orthoQuadratic[2]*z*z
 
     def Young(self, x):
         ct2 = math.cos(x[0])**2
         st2 = 1 - ct2
         cf2 = math.cos(x[1])**2
         sf2 = 1 - cf2
-        s11 = self.Smat[0][0][0][0]
-        s22 = self.Smat[1][1][1][1]
-        s33 = self.Smat[2][2][2][2]
-        s44 = 4 * self.Smat[1][2][1][2]
-        s55 = 4 * self.Smat[0][2][0][2]
-        s66 = 4 * self.Smat[0][1][0][1]
-        s12 = self.Smat[0][0][1][1]
-        s13 = self.Smat[0][0][2][2]
-        s23 = self.Smat[1][1][2][2]
+        s11 = self.s11
+        s22 = self.s22
+        s33 = self.s33
+        s44 = self.s44
+        s55 = self.s55
+        s66 = self.s66
+        s12 = self.s12
+        s13 = self.s13
+        s23 = self.s23
         return 1/(ct2**2*s33 + 2*cf2*ct2*s13*st2 + cf2*ct2*s55*st2 + 2*ct2*s23*sf2*st2 + ct2*s44*sf2*st2 + cf2**2*s11*st2**2 + 2*cf2*s12*sf2*st2**2 + cf2*s66*sf2*st2**2 + s22*sf2**2*st2**2)
 
     def LC(self, x):
         ct2 = math.cos(x[0])**2
         cf2 = math.cos(x[1])**2
-        s11 = self.Smat[0][0][0][0]
-        s22 = self.Smat[1][1][1][1]
-        s33 = self.Smat[2][2][2][2]
-        s12 = self.Smat[0][0][1][1]
-        s13 = self.Smat[0][0][2][2]
-        s23 = self.Smat[1][1][2][2]
+        s11 = self.s11
+        s22 = self.s22
+        s33 = self.s33
+        s12 = self.s12
+        s13 = self.s13
+        s23 = self.s23
         return 1000 * (ct2 * (s13 + s23 + s33) + (cf2 * (s11 + s12 + s13) + (s12 + s22 + s23) * (1 - cf2)) * (1 - ct2))
 
     def shear(self, x):
@@ -322,15 +752,15 @@ class ElasticOrtho(Elastic):
         cx2 = cx*cx
         sx = math.sin(x[2])
         sx2 = 1 - cx2
-        s11 = self.Smat[0][0][0][0]
-        s22 = self.Smat[1][1][1][1]
-        s33 = self.Smat[2][2][2][2]
-        s44 = 4 * self.Smat[1][2][1][2]
-        s55 = 4 * self.Smat[0][2][0][2]
-        s66 = 4 * self.Smat[0][1][0][1]
-        s12 = self.Smat[0][0][1][1]
-        s13 = self.Smat[0][0][2][2]
-        s23 = self.Smat[1][1][2][2]
+        s11 = self.s11
+        s22 = self.s22
+        s33 = self.s33
+        s44 = self.s44
+        s55 = self.s55
+        s66 = self.s66
+        s12 = self.s12
+        s13 = self.s13
+        s23 = self.s23
         r = (
             ct2*ct2*cx2*s44*sf2 + cx2*s44*sf2*st2*st2 + 4*cf**3*ct*cx*(-2*s11 + 2*s12 + s66)*sf*st2*sx
             + 2*cf*ct*cx*sf*(ct2*(s44 - s55) + (4*s13 - 4*s23 - s44 + s55 - 4*s12*sf2 + 4*s22*sf2 - 2*s66*sf2)*st2)*sx
@@ -349,15 +779,15 @@ class ElasticOrtho(Elastic):
         sf = math.sin(x[1])
         cx = math.cos(x[2])
         sx = math.sin(x[2])
-        s11 = self.Smat[0][0][0][0]
-        s22 = self.Smat[1][1][1][1]
-        s33 = self.Smat[2][2][2][2]
-        s44 = 4 * self.Smat[1][2][1][2]
-        s55 = 4 * self.Smat[0][2][0][2]
-        s66 = 4 * self.Smat[0][1][0][1]
-        s12 = self.Smat[0][0][1][1]
-        s13 = self.Smat[0][0][2][2]
-        s23 = self.Smat[1][1][2][2]
+        s11 = self.s11
+        s22 = self.s22
+        s33 = self.s33
+        s44 = self.s44
+        s55 = self.s55
+        s66 = self.s66
+        s12 = self.s12
+        s13 = self.s13
+        s23 = self.s23
 
         return (
     (-(ct**2*cx**2*s33*st2) - cf**2*cx**2*s13*st2*st2 - cx**2*s23*sf**2*st2*st2 + ct*cx*s44*sf*st2*(ct*cx*sf + cf*sx) -
@@ -369,6 +799,326 @@ class ElasticOrtho(Elastic):
         )
 
 
+@profiling.counted
+class ElasticTetragonal(ElasticOrtho):
+    """
+    An elastic tensor, for the specific case of a tetragonal system (Laue class 4/mmm, with the
+    4-fold axis along z), where s22 = s11, s23 = s13 and s55 = s44
+    """
+
+    specificCase = 'tetragonal'
+
+    def precompute(self):
+        ElasticOrtho.precompute(self)
+
+        # 1/E = st2^2 (y0 + y1 cf2 sf2) + y2 ct2^2 + y3 ct2 st2, and LC = l0 st2 + l1 ct2
+        self.youngCoeffs = (self.s11, 2*self.s12 + self.s66 - 2*self.s11, self.s33, 2*self.s13 + self.s44)
+        self.LCCoeffs = (1000 * (self.s11 + self.s12 + self.s13), 1000 * (2*self.s13 + self.s33))
+
+    def Young(self, x):
+        ct2 = math.cos(x[0])**2
+        st2 = 1 - ct2
+        sf2c = math.sin(2*x[1])**2 / 4
+        y0, y1, y2, y3 = self.youngCoeffs
+        return 1/(st2*st2*(y0 + y1*sf2c) + ct2*(y2*ct2 + y3*st2))
+
+    def LC(self, x):
+        ct2 = math.cos(x[0])**2
+        return self.LCCoeffs[0] * (1 - ct2) + self.LCCoeffs[1] * ct2
+
+    def Young_array(self, theta, phi):
+        ct2 = np.cos(theta)**2
+        st2 = 1 - ct2
+        sf2c = np.sin(2*np.asarray(phi, dtype=float))**2 / 4
+        y0, y1, y2, y3 = self.youngCoeffs
+        return 1/(st2*st2*(y0 + y1*sf2c) + ct2*(y2*ct2 + y3*st2))
+
+    def LC_array(self, theta, phi):
+        ct2 = np.cos(theta)**2 + np.zeros(np.shape(phi))
+        return self.LCCoeffs[0] * (1 - ct2) + self.LCCoeffs[1] * ct2
+
+
+@profiling.counted
+class ElasticHexagonal(ElasticTetragonal):
+    """
+    An elastic tensor, for the specific case of a hexagonal system (Laue class 6/mmm, with the
+    6-fold axis along z), where moreover s66 = 2 (s11 - s12): it is transversely isotropic, so
+    properties only depend on the angle theta
+    """
+
+    specificCase = 'hexagonal'
+
+    def _alongTheta(self, func, theta, phi):
+        # Evaluate func(theta, 0) only once for each distinct value of theta
+        if np.ndim(theta) == 0:
+            return func(theta, 0.)
+        theta = np.broadcast_arrays(np.asarray(theta, dtype=float), np.asarray(phi, dtype=float))[0]
+        t, inverse = np.unique(theta, return_inverse=True)
+        res = func(t, np.zeros_like(t))
+        inverse = inverse.reshape(theta.shape)
+        if isinstance(res, tuple):
+            return tuple(r[inverse] for r in res)
+        return res[inverse]
+
+    def Young(self, x):
+        ct2 = math.cos(x[0])**2
+        st2 = 1 - ct2
+        y0, _, y2, y3 = self.youngCoeffs
+        return 1/(y0*st2*st2 + ct2*(y2*ct2 + y3*st2))
+
+    def Young_array(self, theta, phi):
+        ct2 = np.cos(theta)**2 + np.zeros(np.shape(phi))
+        st2 = 1 - ct2
+        y0, _, y2, y3 = self.youngCoeffs
+        return 1/(y0*st2*st2 + ct2*(y2*ct2 + y3*st2))
+
+    def shearChi(self, theta, phi):
+        return self._alongTheta(super().shearChi, theta, phi)
+
+    def PoissonChi(self, theta, phi):
+        return self._alongTheta(super().PoissonChi, theta, phi)
+
+    def YoungExtrema(self):
+        """Return the minimum and maximum of Young's modulus"""
+        # 1/E is a quadratic function of t = cos(theta)^2 in [0, 1]
+        y0, _, y2, y3 = self.youngCoeffs
+        t = [0., 1.]
+        if y0 + y2 - y3 != 0 and 0 < (2*y0 - y3) / (2*(y0 + y2 - y3)) < 1:
+            t.append((2*y0 - y3) / (2*(y0 + y2 - y3)))
+        f = [y0*(1 - x)**2 + y2*x*x + y3*x*(1 - x) for x in t]
+        tmin, tmax = t[int(np.argmax(f))], t[int(np.argmin(f))]
+        return (((math.acos(math.sqrt(tmin)), 0.), 1 / max(f)), ((math.acos(math.sqrt(tmax)), 0.), 1 / min(f)))
+
+
+@profiling.counted
+class ElasticCubic(ElasticTetragonal):
+    """
+    An elastic tensor, for the specific case of a cubic system, which only has three independent
+    coefficients s11, s12 and s44. With the anisotropy s0 = s11 - s12 - s44/2, for orthonormal
+    vectors a and b: 1/E(a) = s11 - 2 s0 K(a), 1/G(a, b) = s44 + 4 s0 J(a, b) and
+    nu(a, b) = -(s12 + s0 J(a, b)) E(a), where K(a) = sum_i<j a_i^2 a_j^2 and J(a, b) = sum_i a_i^2 b_i^2
+    """
+
+    specificCase = 'cubic'
+
+    def precompute(self):
+        ElasticTetragonal.precompute(self)
+        self.s0 = self.s11 - self.s12 - self.s44/2
+
+    def Young(self, x):
+        ct2 = math.cos(x[0])**2
+        st2 = 1 - ct2
+        return 1/(self.s11 - 2*self.s0*(st2*st2*math.sin(2*x[1])**2/4 + ct2*st2))
+
+    def LC(self, x):
+        return 1000 * (self.s11 + 2*self.s12)
+
+    def shear(self, x):
+        a = dirVec(x[0], x[1])
+        b = dirVec2(x[0], x[1], x[2])
+        return 1/(self.s44 + 4*self.s0*sum((ai*bi)**2 for ai, bi in zip(a, b)))
+
+    def Poisson(self, x):
+        a = dirVec(x[0], x[1])
+        b = dirVec2(x[0], x[1], x[2])
+        K = (1 - sum(ai**4 for ai in a)) / 2
+        return -(self.s12 + self.s0*sum((ai*bi)**2 for ai, bi in zip(a, b))) / (self.s11 - 2*self.s0*K)
+
+    def Young_array(self, theta, phi):
+        ct2 = np.cos(theta)**2
+        st2 = 1 - ct2
+        return 1/(self.s11 - 2*self.s0*(st2*st2*np.sin(2*np.asarray(phi, dtype=float))**2/4 + ct2*st2))
+
+    def LC_array(self, theta, phi):
+        return np.full(np.broadcast(theta, phi).shape, 1000 * (self.s11 + 2*self.s12))
+
+    def _cubicChiForm(self, theta, phi, w0):
+        # Extrema over chi of w0 + s0 J(a, b)
+        a2 = dirVecArray(theta, phi)**2
+        u = dirVec2Array(theta, phi, 0)
+        v = dirVec2Array(theta, phi, np.pi/2)
+        p = np.sum(a2 * u * u, axis=-1)
+        r = np.sum(a2 * u * v, axis=-1)
+        s = np.sum(a2 * v * v, axis=-1)
+        return a2, chiExtrema(w0 + self.s0 * p, self.s0 * r, w0 + self.s0 * s)
+
+    def shearChi(self, theta, phi):
+        """Return (min, max, argmin, argmax) of the shear modulus over chi"""
+        _, (wmin, wmax, cmin, cmax) = self._cubicChiForm(theta, phi, self.s44/4)
+        return (1 / (4 * wmax), 1 / (4 * wmin), cmax, cmin)
+
+    def PoissonChi(self, theta, phi):
+        """Return (min, max, argmin, argmax) of Poisson's ratio over chi"""
+        a2, (wmin, wmax, cmin, cmax) = self._cubicChiForm(theta, phi, self.s12)
+        q = self.s11 - self.s0 * (1 - np.sum(a2 * a2, axis=-1))
+        return (-wmax / q, -wmin / q, cmax, cmin)
+
+    def YoungExtrema(self):
+        """Return the minimum and maximum of Young's modulus"""
+        # Extrema are along <100> (K = 0) and <111> (K = 1/3)
+        e100 = ((0., 0.), 1 / self.s11)
+        e111 = ((math.acos(1 / math.sqrt(3)), math.pi/4), 1 / (self.s11 - 2*self.s0/3))
+        return (e100, e111) if self.s0 > 0 else (e111, e100)
+
+    def LCExtrema(self):
+        """Return the minimum and maximum of the linear compressibility"""
+        lc = ((0., 0.), 1000 * (self.s11 + 2*self.s12))
+        return (lc, lc)
+
+    def shearExtrema(self):
+        """Return the minimum and maximum of the shear modulus"""
+        # J ranges from 0, for a along [001] and b along [100], to 1/2, for a along [110] and b along [1-10]
+        g0 = ((0., 0., 0.), 1 / self.s44)
+        g1 = ((math.pi/2, math.pi/4, math.pi/2), 1 / (self.s44 + 2*self.s0))
+        return (g1, g0) if self.s0 > 0 else (g0, g1)
+
+
+@profiling.counted
+class ElasticMonoclinic(Elastic):
+    """
+    An elastic tensor, for the specific case of a monoclinic system, with the 2-fold axis along
+    x, y or z. The quartic and quadratic forms then only contain even powers of the coordinate
+    along the axis, which leaves 9 and 4 coefficients.
+    """
+
+    specificCase = 'monoclinic'
+
+    def __init__(self, arg):
+        """Initialize from a matrix, or from an Elastic object"""
+        if isinstance(arg, str):
+            Elastic.__init__(self, arg)
+        elif isinstance(arg, Elastic):
+            self.CVoigt = arg.CVoigt
+            self.SVoigt = arg.SVoigt
+            self.Smat = arg.Smat
+            self._symmetry = getattr(arg, '_symmetry', {})
+            self.precompute()
+        else:
+            raise TypeError(type(self).__name__ + " constructor argument should be string or Elastic object")
+
+    def precompute(self):
+        Elastic.precompute(self)
+
+        self.axis = twofoldAxis(self.symmetryOperations())
+        if self.axis is None:
+            raise ValueError("no 2-fold axis along x, y or z")
+        # Coordinates (u, w) perpendicular to the axis, and s along it
+        self.coords = [i for i in range(3) if i != self.axis] + [self.axis]
+
+        def coeff(exponents, table, monomials):
+            e = [0, 0, 0]
+            for i, n in zip(self.coords, exponents):
+                e[i] = n
+            return table[monomials.index(tuple(e))]
+
+        quad = [(2, 0, 0), (0, 2, 0), (0, 0, 2), (0, 1, 1), (1, 0, 1), (1, 1, 0)]
+        # Q = u2 (q0 u2 + q1 uw + q2 w2) + w2 (q3 uw + q4 w2) + s2 (q5 u2 + q6 uw + q7 w2 + q8 s2)
+        self.monoQuartic = tuple(coeff(e, self.quartic, quarticExponents) for e in
+                                 [(4, 0, 0), (3, 1, 0), (2, 2, 0), (1, 3, 0), (0, 4, 0),
+                                  (2, 0, 2), (1, 1, 2), (0, 2, 2), (0, 0, 4)])
+        self.monoQuadratic = tuple(coeff(e, self.quadratic, quad) for e in [(2, 0, 0), (1, 1, 0), (0, 2, 0), (0, 0, 2)])
+
+    def quarticForm(self, a):
+        """Return S_ijkl a_i a_j a_k a_l, for a vector or an array of vectors of shape (..., 3)"""
+        i, j, k = self.coords
+        u, w, s = (a[..., i], a[..., j], a[..., k]) if isinstance(a, np.ndarray) else (a[i], a[j], a[k])
+        q0, q1, q2, q3, q4, q5, q6, q7, q8 = self.monoQuartic
+        u2, w2, uw, s2 = u*u, w*w, u*w, s*s
+        return u2*(q0*u2 + q1*uw + q2*w2) + w2*(q3*uw + q4*w2) + s2*(q5*u2 + q6*uw + q7*w2 + q8*s2)
+
+    def quadraticForm(self, a):
+        """Return sum_k S_ijkk a_i a_j, for a vector or an array of vectors of shape (..., 3)"""
+        i, j, k = self.coords
+        u, w, s = (a[..., i], a[..., j], a[..., k]) if isinstance(a, np.ndarray) else (a[i], a[j], a[k])
+        q0, q1, q2, q3 = self.monoQuadratic
+        return u*(q0*u + q1*w) + q2*w*w + q3*s*s
+
+
+def twofoldAxis(ops):
+    """Return the index of a coordinate axis which is a 2-fold axis for the symmetry operations, or None"""
+    for i in range(3):
+        R = -np.eye(3)
+        R[i, i] = 1
+        if any(np.allclose(op, R) for op in ops):
+            return i
+    return None
+
+
+def consistent(elas, ref, npoints=7):
+    """Return whether the properties of an elastic tensor agree with those of a reference, on a few directions"""
+    theta, phi = np.linspace(0.2, 2.9, npoints), np.linspace(0.5, 5.8, npoints)
+    return all(np.allclose(a, b, rtol=1e-8, atol=0) for a, b in
+               [(elas.Young_array(theta, phi), ref.Young_array(theta, phi)),
+                (elas.LC_array(theta, phi), ref.LC_array(theta, phi)),
+                (elas.shearChi(theta, phi)[:2], ref.shearChi(theta, phi)[:2]),
+                (elas.PoissonChi(theta, phi)[:2], ref.PoissonChi(theta, phi)[:2])])
+
+
+def specialize(elas):
+    """
+    Return the elastic tensor as an instance of the most specific class for its Laue class and
+    orientation (ElasticCubic, ElasticHexagonal, ElasticTetragonal, ElasticOrtho or ElasticMonoclinic),
+    symmetrized so that their formulas are exact (see Elastic.symmetrized). Other tensors (e.g. trigonal
+    ones), and those whose properties do not agree with the specific formulas, are returned unchanged.
+    """
+
+    sym = elas.symmetrized()
+    laue = sym.LaueClass()
+    ops = sym.symmetryOperations()
+    cls = None
+    if laue == 'm-3m':
+        cls = ElasticCubic
+    elif laue == '6/mmm':
+        cls = ElasticHexagonal
+    elif laue == '4/mmm' and any(np.allclose(op, [[0, -1, 0], [1, 0, 0], [0, 0, 1]]) for op in ops):
+        cls = ElasticTetragonal
+    elif laue == 'mmm' and sym.isOrthorhombic():
+        cls = ElasticOrtho
+    elif laue == '2/m' and twofoldAxis(ops) is not None:
+        cls = ElasticMonoclinic
+    if cls is None:
+        return elas
+
+    res = cls(sym)
+    return res if consistent(res, sym) else elas
+
+
+# Fourier coefficients (1, cos 2t, sin 2t, cos 4t, sin 4t) of the quartic monomials
+# cos^4 t, sin^4 t, cos^3 t sin t, cos t sin^3 t and cos^2 t sin^2 t
+fourierQuartic = np.array([[3, 3, 0, 0, 1],
+                           [4, -4, 0, 0, 0],
+                           [0, 0, 2, 2, 0],
+                           [1, 1, 0, 0, -1],
+                           [0, 0, 1, -1, 0]]) / 8
+
+
+def fourierSeries(c, theta):
+    """Return c0 + c1 cos 2t + c2 sin 2t + c3 cos 4t + c4 sin 4t, for an angle or an array of angles t"""
+    c2, s2 = np.cos(2 * theta), np.sin(2 * theta)
+    return c[0] + c[1] * c2 + c[2] * s2 + c[3] * (c2 * c2 - s2 * s2) + c[4] * 2 * s2 * c2
+
+
+def laurentCoefficients(c):
+    """Return the coefficients of the series of fourierSeries in the powers z^-2 ... z^2 of z = exp(2it)"""
+    c1, c2 = (c[1] - 1j * c[2]) / 2, (c[3] - 1j * c[4]) / 2
+    return np.array([np.conj(c2), np.conj(c1), c[0], c1, c2])
+
+
+def stationaryAngles(num, denom):
+    """
+    Return 0 and the angles t in [0, pi) where the derivative of fourierSeries(num, t) / fourierSeries(denom, t)
+    vanishes. These are the roots on the unit circle of a polynomial in z = exp(2it): all its roots are kept,
+    projected on the unit circle, which only adds points to check.
+    """
+    n, d = laurentCoefficients(num), laurentCoefficients(denom)
+    k = 1j * np.arange(-2, 3)
+    # Coefficients of N'D - ND' in the powers z^-4 ... z^4, from the highest
+    p = (np.convolve(k * n, d) - np.convolve(n, k * d))[::-1]
+    roots = np.roots(p) if np.max(np.abs(p)) > 1e-12 * np.max(np.abs(np.convolve(n, d))) else []
+    return np.append(0, (np.angle(roots) / 2) % np.pi)
+
+
+@profiling.counted
 class Elastic2D:
     """Elastic tensor for 2D material, along with methods to access it"""
 
@@ -447,40 +1197,51 @@ class Elastic2D:
         self.s22 = self.SVoigt[1][1]
         self.s26 = self.SVoigt[1][2]
         self.s66 = self.SVoigt[2][2]
+        self.precompute()
         return
 
+    def precompute(self):
+        """Precompute the Fourier coefficients of the directional properties (see fourierSeries)"""
+        s11, s12, s16, s22, s26, s66 = self.s11, self.s12, self.s16, self.s22, self.s26, self.s66
+
+        # From the coefficients of cos^4, sin^4, cos^3 sin, cos sin^3 and cos^2 sin^2
+        self.YoungDenom = tuple(float(c) for c in fourierQuartic @ (s11, s22, 2*s16, 2*s26, 2*s12 + s66))
+        self.shearDenom = tuple(float(c) for c in fourierQuartic @ (s66, s66, 4*(s26 - s16), 4*(s16 - s26),
+                                                                     4*(s11 + s22 - 2*s12) - 2*s66))
+        self.PoissonNum = tuple(float(c) for c in fourierQuartic @ (-s12, -s12, s16 - s26, s26 - s16,
+                                                                     s66 - s11 - s22))
+
     def is2D(self):
         return True
 
+    # Directional properties, for an angle or an array of angles
     def Young(self, theta):
-        ct = math.cos(theta)
-        st = math.sin(theta)
-
-        return 1/(self.s11*ct**4 + self.s22*st**4 + 2*self.s16*ct**3*st + 2*self.s26*ct*st**3 + (2*self.s12+self.s66)*ct**2*st**2)
+        return 1 / fourierSeries(self.YoungDenom, theta)
 
     def shear(self, theta):
-        ct = math.cos(theta)
-        st = math.sin(theta)
-
-        calc = ((self.s11 + self.s22 - 2*self.s12)*ct**2*st**2
-                + self.s66/4*(ct**4 + st**4 - 2*st**2*ct**2)
-                + self.s16*(st**3*ct - ct**3*st)
-                + self.s26*(ct**3*st - st**3*ct))
-        return 1 / (4 * calc)
+        return 1 / fourierSeries(self.shearDenom, theta)
 
     def Poisson(self, theta):
-        ct = math.cos(theta)
-        st = math.sin(theta)
-
-        num = ((self.s11 + self.s22 - self.s66)*ct**2*st**2
-               + self.s12*(ct**4 + st**4)
-               + self.s16*(st**3*ct - ct**3*st)
-               + self.s26*(ct**3*st - st**3*ct))
-        denom = ((2*self.s12 + self.s66)*ct**2*st**2
-                 + self.s11*ct**4 + self.s22*st**4
-                 + 2*self.s16*st**3*ct
-                 + 2*self.s26*ct**3*st)
-        return -num/denom
+        return fourierSeries(self.PoissonNum, theta) / fourierSeries(self.YoungDenom, theta)
+
+    # Extrema, returned as (theta, value) pairs with theta in [0, pi)
+    def _extrema(self, func, num, denom):
+        theta = stationaryAngles(num, denom)
+        values = func(theta)
+        i, j = np.argmin(values), np.argmax(values)
+        return (float(theta[i]), float(values[i])), (float(theta[j]), float(values[j]))
+
+    def YoungExtrema(self):
+        """Return the minimum and maximum of Young's modulus"""
+        return self._extrema(self.Young, (1, 0, 0, 0, 0), self.YoungDenom)
+
+    def shearExtrema(self):
+        """Return the minimum and maximum of the shear modulus"""
+        return self._extrema(self.shear, (1, 0, 0, 0, 0), self.shearDenom)
+
+    def PoissonExtrema(self):
+        """Return the minimum and maximum of Poisson's ratio"""
+        return self._extrema(self.Poisson, self.PoissonNum, self.YoungDenom)
 
     def eigenvalues(self):
         return np.sort(np.linalg.eig(self.CVoigt)[0])
@@ -1,22 +1,23 @@
 # -*- coding: utf-8 -*-
 
+import base64
+import functools
 import json
-import math
-import os
 import platform
+import queue
 import random
 import re
 import sys
+import threading
 import time
 
 from collections import OrderedDict
-from io import StringIO
-import requests
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
 
 import numpy as np
-from scipy import optimize
 
-from ELATE import elastic
+from ELATE import analysis, cache, elastic, materialsproject, profiling, sampling, symmetry
 
 __author__ = "Romain Gaillac and François-Xavier Coudert"
 __version__ = "2025.08.26"
@@ -28,24 +29,117 @@ def removeHTMLTags(s):
     return re.sub('<[^<]+?>', '', s)
 
 
+class HTMLRenderer:
+    """
+    Output buffer for an HTML page, which the page builders write to explicitly (rather than
+    to sys.stdout), so that pages can be built concurrently in several threads. Chunks are
+    collected in a list, and only joined at the end.
+    """
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, s):
+        self.chunks.append(s)
+
+    def print(self, *args, sep=' ', end='\n'):
+        """Same as the print() builtin, writing to the page"""
+        self.chunks.append(sep.join(map(str, args)) + end)
+
+    def flush(self):
+        """Mark the end of a section of the page (nothing to do when the page is returned in one piece)"""
+        pass
+
+    def getvalue(self):
+        return ''.join(self.chunks)
+
+
+class StreamClosed(Exception):
+    """Raised in a page builder when the stream it writes to was closed by the reader"""
+    pass
+
+
+class StreamRenderer(HTMLRenderer):
+    """Renderer which sends each section of the page to a queue, when it is complete"""
+
+    def __init__(self):
+        super().__init__()
+        self.queue = queue.Queue()
+        self.closed = False
+
+    def flush(self):
+        if self.closed:
+            raise StreamClosed()
+        if self.chunks:
+            self.queue.put(''.join(self.chunks))
+            self.chunks = []
+
+
+def streamPage(builder):
+    """
+    Generator of the fragments of a page, yielded as soon as each section is complete.
+    builder(outbuffer) writes the page, and is run in a separate thread; it stops at
+    the next section if the generator is closed.
+    """
+
+    outbuffer = StreamRenderer()
+
+    def run():
+        try:
+            builder(outbuffer)
+            outbuffer.flush()
+        except StreamClosed:
+            pass
+        except Exception as e:
+            outbuffer.queue.put(e)
+        finally:
+            outbuffer.queue.put(None)
+
+    threading.Thread(target=run, daemon=True).start()
+    try:
+        while True:
+            item = outbuffer.queue.get()
+            if item is None:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        outbuffer.closed = True
+
+
 def finishWebPage(outbuffer):
     """ Write the footer and finish the page """
 
-    print('<div id="footer" class="content">')
-    print('Code version: ' + __version__ + ' (running on Python ' + platform.python_version() + ')<br/>')
-    print('<script type="text/javascript">var endTime = %.12g;' % time.perf_counter())
-    print('document.write("Execution time: " + (endTime-startTime).toFixed(3) + " seconds<br/>");')
-    print('if(typeof isOrtho !== \'undefined\') document.write("Specific (faster) code for orthorhombic case was used.");')
-    print('</script></div>')
-    print('</div>')
-    print('</body></html>')
+    outbuffer.print('<div id="footer" class="content">')
+    outbuffer.print('Code version: ' + __version__ + ' (running on Python ' + platform.python_version() + ')<br/>')
+    outbuffer.print('<script type="text/javascript">var endTime = %.12g;' % time.perf_counter())
+    outbuffer.print('document.write("Execution time: " + (endTime-startTime).toFixed(3) + " seconds<br/>");')
+    outbuffer.print('if(typeof specificCase !== \'undefined\') document.write("Specific (faster) code for " + specificCase + " case was used.");')
+    outbuffer.print('</script></div>')
+    p = profiling.current()
+    if p is not None and p.debug:
+        outbuffer.print(p.html())
+    outbuffer.print('</div>')
+    outbuffer.print('</body></html>')
     return outbuffer.getvalue()
 
 
+def updateTiming(page, start):
+    """Return a page (e.g. from the cache) with the execution time of the current request, from start"""
+    if not isinstance(page, str):
+        return page
+    i, j = page.find('var startTime = '), page.rfind('var endTime = ')
+    if i < 0 or j < i:
+        return page
+    return (page[:i] + 'var startTime = %.12g' % start + page[page.index('<', i):j]
+            + 'var endTime = %.12g' % time.perf_counter() + page[page.index(';', j):])
+
+
 def writeHeader(outbuffer, title="Elastic Tensor Analysis"):
     """ Write the header of the HTML page """
 
-    print("""
+    outbuffer.print("""
     <!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Strict//EN" "http://www.w3.org/TR/xhtml1/DTD/xhtml1-strict.dtd">
     <html>
     <head>
@@ -63,7 +157,7 @@ def writeHeader(outbuffer, title="Elastic Tensor Analysis"):
 # printTitle writes the introduction of Elate
 def printTitle(outbuffer, title="Elastic Tensor Analysis"):
     writeHeader(outbuffer, title)
-    print("""
+    outbuffer.print("""
         <body>
 
         <div class="content">
@@ -90,223 +184,251 @@ def printTitle(outbuffer, title="Elastic Tensor Analysis"):
 # 3D plot functions
 ################################################################################################
 
-def write3DPlotData(dataX, dataY, dataZ, dataR, n, opacity=1.0):
+# Color scales of the 3D plots, for the first, second and third surfaces
+colorscales = {1: "[[\'0\',\'rgb(22,136,51)\'],[\'0.125\',\'rgb(61,153,85)\'],[\'0.25\',\'rgb(121,178,136)\'],[\'0.375\',\'rgb(181,204,187)\'],[\'0.5\',\'rgb(195,230,200)\'],[\'0.625\',\'rgb(181,204,187)\'],[\'0.75\',\'rgb(121,178,136)\'],[\'0.875\',\'rgb(61,153,85)\'],[\'1\',\'rgb(22,136,51)\']]",
+               2: "[[\'0\',\'rgb(180,4,38)\'],[\'0.125\',\'rgb(222,96,77)\'],[\'0.25\',\'rgb(244,154,123)\'],[\'0.375\',\'rgb(245,196,173)\'],[\'0.5\',\'rgb(246,216,201)\'],[\'0.625\',\'rgb(245,196,173)\'],[\'0.75\',\'rgb(244,154,123)\'],[\'0.875\',\'rgb(222,96,77)\'],[\'1\',\'rgb(180,4,38)\']]",
+               3: "[[\'0\',\'rgb(59,76,192)\'],[\'0.125\',\'rgb(98,130,234)\'],[\'0.25\',\'rgb(141,176,254)\'],[\'0.375\',\'rgb(184,208,249)\'],[\'0.5\',\'rgb(207,223,250)\'],[\'0.625\',\'rgb(184,208,249)\'],[\'0.75\',\'rgb(141,176,254)\'],[\'0.875\',\'rgb(98,130,234)\'],[\'1\',\'rgb(59,76,192)\']]"}
+
+
+def write3DPlotData(outbuffer, dataX, dataY, dataZ, dataR, n, opacity=1.0):
 
     showcont = "true"
     if (opacity != 1.0):
         showcont = "false"
-    if (n == 1):
-        js = OrderedDict([
-            ("x", dataX),
-            ("y", dataY),
-            ("z", dataZ),
-            ("text", dataR),
-            ("showscale", "false"),
-            ("colorscale", "[[\'0\',\'rgb(22,136,51)\'],[\'0.125\',\'rgb(61,153,85)\'],[\'0.25\',\'rgb(121,178,136)\'],[\'0.375\',\'rgb(181,204,187)\'],[\'0.5\',\'rgb(195,230,200)\'],[\'0.625\',\'rgb(181,204,187)\'],[\'0.75\',\'rgb(121,178,136)\'],[\'0.875\',\'rgb(61,153,85)\'],[\'1\',\'rgb(22,136,51)\']]"),
-            ("zsmooth", "'fast'"),
-            ("type", "'surface'"),
-            ("hoverinfo", "'text'"),
-            ("opacity", opacity),
-            ("contours", "{x :{ show:"+showcont+", color: 'rgb(192,192,192)'},y :{ show:"+showcont+", color: 'rgb(192,192,192)'},z :{ show:"+showcont+", color: 'rgb(192,192,192)'}}")
-        ])
-
-    if (n == 2):
-        js = OrderedDict([
-            ("x", dataX),
-            ("y", dataY),
-            ("z", dataZ),
-            ("text", dataR),
-            ("showscale", "false"),
-            ("colorscale", "[[\'0\',\'rgb(180,4,38)\'],[\'0.125\',\'rgb(222,96,77)\'],[\'0.25\',\'rgb(244,154,123)\'],[\'0.375\',\'rgb(245,196,173)\'],[\'0.5\',\'rgb(246,216,201)\'],[\'0.625\',\'rgb(245,196,173)\'],[\'0.75\',\'rgb(244,154,123)\'],[\'0.875\',\'rgb(222,96,77)\'],[\'1\',\'rgb(180,4,38)\']]"),
-            ("zsmooth", "'fast'"),
-            ("type", "'surface'"),
-            ("hoverinfo", "'text'"),
-            ("opacity", opacity),
-            ("contours", "{x :{ show:"+showcont+", color: 'rgb(192,192,192)'},y :{ show:"+showcont+", color: 'rgb(192,192,192)'},z :{ show:"+showcont+", color: 'rgb(192,192,192)'}}")
-        ])
-
-    if (n == 3):
-        js = OrderedDict([
-            ("x", dataX),
-            ("y", dataY),
-            ("z", dataZ),
-            ("text", dataR),
-            ("showscale", "false"),
-            ("colorscale", "[[\'0\',\'rgb(59,76,192)\'],[\'0.125\',\'rgb(98,130,234)\'],[\'0.25\',\'rgb(141,176,254)\'],[\'0.375\',\'rgb(184,208,249)\'],[\'0.5\',\'rgb(207,223,250)\'],[\'0.625\',\'rgb(184,208,249)\'],[\'0.75\',\'rgb(141,176,254)\'],[\'0.875\',\'rgb(98,130,234)\'],[\'1\',\'rgb(59,76,192)\']]"),
-            ("zsmooth", "'fast'"),
-            ("type", "'surface'"),
-            ("hoverinfo", "'text'"),
-            ("opacity", opacity),
-            ("contours", "{x :{ show:"+showcont+", color: 'rgb(192,192,192)'},y :{ show:"+showcont+", color: 'rgb(192,192,192)'},z :{ show:"+showcont+", color: 'rgb(192,192,192)'}}")
-        ])
-
-    print(json.dumps(js, indent=3).replace('\"', '') + ";")
-
-
-def make3DPlot(func, legend='', width=600, height=600, npoints=200):
+    js = OrderedDict([
+        ("x", dataX),
+        ("y", dataY),
+        ("z", dataZ),
+        ("text", dataR),
+        ("showscale", "false"),
+        ("colorscale", colorscales[n]),
+        ("zsmooth", "'fast'"),
+        ("type", "'surface'"),
+        ("hoverinfo", "'text'"),
+        ("opacity", opacity),
+        ("contours", "{x :{ show:"+showcont+", color: 'rgb(192,192,192)'},y :{ show:"+showcont+", color: 'rgb(192,192,192)'},z :{ show:"+showcont+", color: 'rgb(192,192,192)'}}")
+    ])
+
+    with profiling.stage('serialization'):
+        outbuffer.print(json.dumps(js, indent=3).replace('\"', '') + ";")
+
+
+def write3DMeshData(outbuffer, dataX, dataY, dataZ, dataR, n, opacity=1.0):
+    """
+    Write a mesh3d trace, colored like the surfaces of write3DPlotData. The triangles are
+    shared by all surfaces, and should be in the variables meshI, meshJ and meshK.
+    """
+
+    js = OrderedDict([
+        ("x", dataX),
+        ("y", dataY),
+        ("z", dataZ),
+        ("i", "meshI"),
+        ("j", "meshJ"),
+        ("k", "meshK"),
+        ("intensity", dataZ),
+        ("text", dataR),
+        ("showscale", "false"),
+        ("colorscale", colorscales[n]),
+        ("type", "'mesh3d'"),
+        ("hoverinfo", "'text'"),
+        ("opacity", opacity)
+    ])
+
+    with profiling.stage('serialization'):
+        outbuffer.print(json.dumps(js, indent=3).replace('\"', '') + ";")
+
+
+def evaluateGrid(func, theta, phi, workers=1, rows=10, ops=None):
+    """
+    Evaluate a vectorized function of (theta, phi) on a grid, by chunks of rows. With workers > 1,
+    the chunks are computed in parallel by a pool of processes (func should then be picklable,
+    e.g. a bound method). The chunks do not depend on the number of workers, so the results are
+    identical whatever the number of workers.
+
+    If the symmetry operations of the tensor are given (see Elastic.symmetryOperations), only one
+    point of each orbit of the grid is evaluated, and the values are copied to the other points:
+    the values of func which are used must then be invariant under these operations (which is
+    the case of the properties, but not of the angles chi at which they are reached).
+    """
+
+    if ops is not None:
+        reps, inverse = symmetry.gridOrbits(ops, theta[:, 0], phi[0])
+        if len(reps) < theta.size:
+            r = evaluateGrid(func, theta.ravel()[reps], phi.ravel()[reps], workers, rows * theta.shape[1])
+            if isinstance(r, tuple):
+                return tuple(x[inverse].reshape(theta.shape) for x in r)
+            return r[inverse].reshape(theta.shape)
+
+    chunks = [(theta[i:i+rows], phi[i:i+rows]) for i in range(0, len(theta), rows)]
+    if workers > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            res = list(pool.map(func, *zip(*chunks)))
+        # Calls in the workers are not seen by the profile: record them here
+        profiling.called(getattr(func, '__name__', 'grid'), sum(np.broadcast(*c).size for c in chunks), len(chunks))
+    else:
+        res = [func(*c) for c in chunks]
+
+    if isinstance(res[0], tuple):
+        return tuple(np.concatenate(r) for r in zip(*res))
+    return np.concatenate(res)
+
+
+def truncatedStr(y, scale=10):
+    """
+    Vectorized str(float(int(y)) / scale), for an array y and scale a power of ten.
+    The repr of k/scale for an integer k is its exact decimal expansion, so it is
+    built from the digits of k.
+    """
+    k = np.trunc(np.asarray(y, dtype=float)).astype(np.int64)
+    # Values repeat a lot, so only format the distinct ones
+    k, inverse = np.unique(k, return_inverse=True)
+    ndigits = len(str(scale)) - 1
+    a = np.abs(k)
+    frac = np.char.rstrip(np.char.zfill((a % scale).astype(str), ndigits), '0')
+    frac = np.where(frac == '', '0', frac)
+    return concatStr(np.where(k < 0, '-', ''), (a // scale).astype(str), '.', frac)[inverse].reshape(np.shape(y))
+
+
+def concatStr(*parts):
+    """Concatenate strings and arrays of strings, with broadcasting"""
+    res = parts[0]
+    for p in parts[1:]:
+        res = np.char.add(res, p)
+    return res
+
+
+def hoverLabels(prefix, r, middle, u, v, scale=10):
+    """
+    Return the hover labels of a 3D plot, as a nested list of strings: for each value of r on
+    the grid of angles (u, v), prefix + value + middle + theta + "\u00B0, \u03c6 = " + phi + "\u00B0'",
+    with values and angles truncated to 1/scale.
+    """
+    return pointLabels(prefix, r, middle, u[:, None], v[None, :], scale).tolist()
+
+
+def pointLabels(prefix, r, middle, theta, phi, scale=10):
+    """Return the hover labels as in hoverLabels, as an array, for angles theta and phi broadcast together"""
+    with profiling.stage('serialization'):
+        theta = truncatedStr(scale*theta*180/np.pi, scale)
+        phi = truncatedStr(scale*phi*180/np.pi, scale)
+        return concatStr(prefix, truncatedStr(scale*r, scale), middle, theta, "\u00B0, \u03c6 = ", phi, "\u00B0'")
+
+
+def make3DPlot(outbuffer, func, legend='', width=600, height=600, npoints=200, workers=1, ops=None):
 
     str1 = legend.split("\'")[0]
     str2 = legend.split("\'")[1]
 
     u = np.linspace(0, np.pi, npoints)
     v = np.linspace(0, 2*np.pi, 2*npoints)
-    r = np.zeros(len(u)*len(v))
-
-    dataX = [[0.0 for i in range(len(v))] for j in range(len(u))]
-    dataY = [[0.0 for i in range(len(v))] for j in range(len(u))]
-    dataZ = [[0.0 for i in range(len(v))] for j in range(len(u))]
-    dataR = [["0.0" for i in range(len(v))] for j in range(len(u))]
-
-    count = 0
-    for cu in range(len(u)):
-        for cv in range(len(v)):
-            r_tmp = func(u[cu], v[cv])
-            z = r_tmp * np.cos(u[cu])
-            x = r_tmp * np.sin(u[cu]) * np.cos(v[cv])
-            y = r_tmp * np.sin(u[cu]) * np.sin(v[cv])
-            dataX[cu][cv] = x
-            dataY[cu][cv] = y
-            dataZ[cu][cv] = z
-            dataR[cu][cv] = "'E = "+str(float(int(10*r_tmp))/10.0)+" GPa, "+"\u03B8 = "+str(float(int(10*u[cu]*180/np.pi))/10.0)+"\u00B0, "+"\u03c6 = "+str(float(int(10*v[cv]*180/np.pi))/10.0)+"\u00B0'"
-            count = count+1
+
+    # Evaluate the whole (theta, phi) grid in one call
+    uu, vv = np.meshgrid(u, v, indexing='ij')
+    with profiling.stage('surface'):
+        r = evaluateGrid(func, uu, vv, workers, ops=ops)
+    dataX = (r * np.sin(uu) * np.cos(vv)).tolist()
+    dataY = (r * np.sin(uu) * np.sin(vv)).tolist()
+    dataZ = (r * np.cos(uu)).tolist()
+    dataR = hoverLabels("'E = ", r, " GPa, \u03B8 = ", u, v)
 
     i = random.randint(0, 100000)
-    print('<div class="plot3D">')
-    print('<div id="box%d" style="width: %dpx; height: %dpx; display:block;"></div>' % (i, width, height))
-    print('</div>')
-    print('<script type="text/javascript">')
-    print("var trace =")
-    write3DPlotData(dataX, dataY, dataZ, dataR, 1)
-    print("var data = [trace]")
-    print("var layout =")
+    outbuffer.print('<div class="plot3D">')
+    outbuffer.print('<div id="box%d" style="width: %dpx; height: %dpx; display:block;"></div>' % (i, width, height))
+    outbuffer.print('</div>')
+    outbuffer.print('<script type="text/javascript">')
+    outbuffer.print("var trace =")
+    write3DPlotData(outbuffer, dataX, dataY, dataZ, dataR, 1)
+    outbuffer.print("var data = [trace]")
+    outbuffer.print("var layout =")
     layout = {"title": "\'"+str1+"\\"+"\'"+str2+"\'", "width": "650", "height": "700", "autosize": "false", "autorange": "true", "margin": "{l: 65, r: 50, b: 65, t: 90}"}
-    print(json.dumps(layout, indent=3).replace('\\\\', '\\').replace('\"', '') + ";")
-    print("Plotly.newPlot('box%d',data,layout);" % (i))
-    print('</script>')
+    outbuffer.print(json.dumps(layout, indent=3).replace('\\\\', '\\').replace('\"', '') + ";")
+    outbuffer.print("Plotly.newPlot('box%d',data,layout);" % (i))
+    outbuffer.print('</script>')
 
 
-def make3DPlotPosNeg(func, legend='', width=600, height=600, npoints=200):
+def make3DPlotPosNeg(outbuffer, func, legend='', width=600, height=600, npoints=200, workers=1, ops=None):
 
   u = np.linspace(0, np.pi, npoints)
   v = np.linspace(0, 2*np.pi, 2*npoints)
 
-  dataX1 = [[0.0 for i in range(len(v))] for j in range(len(u))]
-  dataY1 = [[0.0 for i in range(len(v))] for j in range(len(u))]
-  dataZ1 = [[0.0 for i in range(len(v))] for j in range(len(u))]
-  dataR1 = [["0.0" for i in range(len(v))] for j in range(len(u))]
-
-  count = 0
-  for cu in range(len(u)):
-    for cv in range(len(v)):
-      r_tmp = max(0, func(u[cu], v[cv]))
-      z = r_tmp * np.cos(u[cu])
-      x = r_tmp * np.sin(u[cu]) * np.cos(v[cv])
-      y = r_tmp * np.sin(u[cu]) * np.sin(v[cv])
-      dataX1[cu][cv] = x
-      dataY1[cu][cv] = y
-      dataZ1[cu][cv] = z
-      dataR1[cu][cv] = "'"+"\u03B2 = "+str(float(int(10*r_tmp))/10.0)+" TPa'"+"+'-1'.sup()+"+"', \u03B8 = "+str(float(int(10*u[cu]*180/np.pi))/10.0)+"\u00B0, "+"\u03c6 = "+str(float(int(10*v[cv]*180/np.pi))/10.0)+"\u00B0'"
-      count = count+1
-
-  dataX2 = [[0.0 for i in range(len(v))] for j in range(len(u))]
-  dataY2 = [[0.0 for i in range(len(v))] for j in range(len(u))]
-  dataZ2 = [[0.0 for i in range(len(v))] for j in range(len(u))]
-  dataR2 = [["0.0" for i in range(len(v))] for j in range(len(u))]
-
-  count = 0
-  for cu in range(len(u)):
-    for cv in range(len(v)):
-      r_tmp = max(0, -func(u[cu], v[cv]))
-      z = r_tmp * np.cos(u[cu])
-      x = r_tmp * np.sin(u[cu]) * np.cos(v[cv])
-      y = r_tmp * np.sin(u[cu]) * np.sin(v[cv])
-      dataX2[cu][cv] = x
-      dataY2[cu][cv] = y
-      dataZ2[cu][cv] = z
-      dataR2[cu][cv] = "'"+"\u03B2 = -"+str(float(int(10*r_tmp))/10.0)+" TPa'"+"+'-1'.sup()+"+"', \u03B8 = "+str(float(int(10*u[cu]*180/np.pi))/10.0)+"\u00B0, "+"\u03c6 = "+str(float(int(10*v[cv]*180/np.pi))/10.0)+"\u00B0'"
-      count = count+1
+  # Evaluate the whole (theta, phi) grid in one call
+  uu, vv = np.meshgrid(u, v, indexing='ij')
+  with profiling.stage('surface'):
+    r = evaluateGrid(func, uu, vv, workers, ops=ops)
+
+  r1 = np.maximum(0, r)
+  dataX1 = (r1 * np.sin(uu) * np.cos(vv)).tolist()
+  dataY1 = (r1 * np.sin(uu) * np.sin(vv)).tolist()
+  dataZ1 = (r1 * np.cos(uu)).tolist()
+  dataR1 = hoverLabels("'\u03B2 = ", r1, " TPa'+'-1'.sup()+', \u03B8 = ", u, v)
+
+  r2 = np.maximum(0, -r)
+  dataX2 = (r2 * np.sin(uu) * np.cos(vv)).tolist()
+  dataY2 = (r2 * np.sin(uu) * np.sin(vv)).tolist()
+  dataZ2 = (r2 * np.cos(uu)).tolist()
+  dataR2 = hoverLabels("'\u03B2 = -", r2, " TPa'+'-1'.sup()+', \u03B8 = ", u, v)
 
   i = random.randint(0, 100000)
-  print('<div class="plot3D">')
-  print('<div id="box%d" style="width: %dpx; height: %dpx; display:block;"></div>' % (i, width, height))
-  print('</div>')
-  print('<script type="text/javascript">')
-  print("var trace1 =")
-  write3DPlotData(dataX1, dataY1, dataZ1, dataR1, 1)
-  print("var trace2 =")
-  write3DPlotData(dataX2, dataY2, dataZ2, dataR2, 2)
-  print("var data = [trace1, trace2]")
-  print("var layout =")
+  outbuffer.print('<div class="plot3D">')
+  outbuffer.print('<div id="box%d" style="width: %dpx; height: %dpx; display:block;"></div>' % (i, width, height))
+  outbuffer.print('</div>')
+  outbuffer.print('<script type="text/javascript">')
+  outbuffer.print("var trace1 =")
+  write3DPlotData(outbuffer, dataX1, dataY1, dataZ1, dataR1, 1)
+  outbuffer.print("var trace2 =")
+  write3DPlotData(outbuffer, dataX2, dataY2, dataZ2, dataR2, 2)
+  outbuffer.print("var data = [trace1, trace2]")
+  outbuffer.print("var layout =")
   layout = {"title": "\'"+legend+"\'", "width": "650", "height": "700", "autosize": "false", "autorange": "true", "margin": "{l: 65, r: 50, b: 65, t: 90}"}
-  print(json.dumps(layout, indent=3).replace('\\\\', '\\').replace('\"', '') + ";")
-  print("Plotly.newPlot('box%d',data,layout);" % (i))
-  print('</script>')
+  outbuffer.print(json.dumps(layout, indent=3).replace('\\\\', '\\').replace('\"', '') + ";")
+  outbuffer.print("Plotly.newPlot('box%d',data,layout);" % (i))
+  outbuffer.print('</script>')
 
 
-def make3DPlot2(func, legend='', width=600, height=600, npoints=50):
+def make3DPlot2(outbuffer, func, legend='', width=600, height=600, npoints=50, workers=1, ops=None):
 
   u = np.linspace(0, np.pi, npoints)
   v = np.linspace(0, np.pi, npoints)
   w = [v[i]+np.pi for i in range(1,len(v))]
   v = np.append(v, w)
 
-  dataX1 = [[0.0 for i in range(len(v))] for j in range(len(u))]
-  dataY1 = [[0.0 for i in range(len(v))] for j in range(len(u))]
-  dataZ1 = [[0.0 for i in range(len(v))] for j in range(len(u))]
-  dataR1 = [["0.0" for i in range(len(v))] for j in range(len(u))]
-
-  dataX2 = [[0.0 for i in range(len(v))] for j in range(len(u))]
-  dataY2 = [[0.0 for i in range(len(v))] for j in range(len(u))]
-  dataZ2 = [[0.0 for i in range(len(v))] for j in range(len(u))]
-  dataR2 = [["0.0" for i in range(len(v))] for j in range(len(u))]
-
-  count = 0
-  r = [0.0,0.0,np.pi/2.0,np.pi/2.0]
-  for cu in range(len(u)):
-    for cv in range(len(v)):
-
-      r = func(u[cu],v[cv],r[2],r[3])
-      z = np.cos(u[cu])
-      x = np.sin(u[cu]) * np.cos(v[cv])
-      y = np.sin(u[cu]) * np.sin(v[cv])
-
-      r1_tmp = r[0]
-      z1 = r1_tmp * z
-      x1 = r1_tmp * x
-      y1 = r1_tmp * y
-      dataX1[cu][cv] = x1
-      dataY1[cu][cv] = y1
-      dataZ1[cu][cv] = z1
-      dataR1[cu][cv] = "'"+"G'"+"+'min'.sub()+"+"' = "+str(float(int(10*r1_tmp))/10.0)+"GPa, "+"\u03B8 = "+str(float(int(10*u[cu]*180/np.pi))/10.0)+"\u00B0, "+"\u03c6 = "+str(float(int(10*v[cv]*180/np.pi))/10.0)+"\u00B0'"
-
-      r2_tmp = r[1]
-      z2 = r2_tmp * z
-      x2 = r2_tmp * x
-      y2 = r2_tmp * y
-      dataX2[cu][cv] = x2
-      dataY2[cu][cv] = y2
-      dataZ2[cu][cv] = z2
-      dataR2[cu][cv] = "'"+"G'"+"+'max'.sub()+"+"' = "+str(float(int(10*r1_tmp))/10.0)+"GPa, "+"\u03B8 = "+str(float(int(10*u[cu]*180/np.pi))/10.0)+"\u00B0, "+"\u03c6 = "+str(float(int(10*v[cv]*180/np.pi))/10.0)+"\u00B0'"
-      count = count+1
+  # Evaluate the whole (theta, phi) grid in one call
+  uu, vv = np.meshgrid(u, v, indexing='ij')
+  with profiling.stage('surface'):
+    r = evaluateGrid(func, uu, vv, workers, ops=ops)
+  x = np.sin(uu) * np.cos(vv)
+  y = np.sin(uu) * np.sin(vv)
+  z = np.cos(uu)
+
+  dataX1 = (r[0] * x).tolist()
+  dataY1 = (r[0] * y).tolist()
+  dataZ1 = (r[0] * z).tolist()
+  dataR1 = hoverLabels("'G'+'min'.sub()+' = ", r[0], "GPa, \u03B8 = ", u, v)
+
+  dataX2 = (r[1] * x).tolist()
+  dataY2 = (r[1] * y).tolist()
+  dataZ2 = (r[1] * z).tolist()
+  dataR2 = hoverLabels("'G'+'max'.sub()+' = ", r[0], "GPa, \u03B8 = ", u, v)
 
   i = random.randint(0, 100000)
-  print('<div class="plot3D">')
-  print('<div id="box%d" style="width: %dpx; height: %dpx; display:block;"></div>' % (i, width, height))
-  print('</div>')
-  print('<script type="text/javascript">')
-  print("var trace1 =")
-  write3DPlotData(dataX1, dataY1, dataZ1, dataR1, 1)
-  print("var trace2 =")
-  write3DPlotData(dataX2, dataY2, dataZ2, dataR2, 3, 0.5)
-  print("var data = [trace1, trace2]")
-  print("var layout =")
+  outbuffer.print('<div class="plot3D">')
+  outbuffer.print('<div id="box%d" style="width: %dpx; height: %dpx; display:block;"></div>' % (i, width, height))
+  outbuffer.print('</div>')
+  outbuffer.print('<script type="text/javascript">')
+  outbuffer.print("var trace1 =")
+  write3DPlotData(outbuffer, dataX1, dataY1, dataZ1, dataR1, 1)
+  outbuffer.print("var trace2 =")
+  write3DPlotData(outbuffer, dataX2, dataY2, dataZ2, dataR2, 3, 0.5)
+  outbuffer.print("var data = [trace1, trace2]")
+  outbuffer.print("var layout =")
   layout = {"title": "\'"+legend+"\'", "width":"650", "height":"700" , "autosize":"false", "autorange":"true", "margin": "{l: 65, r: 50, b: 65, t: 90}"}
-  print(json.dumps(layout, indent=3).replace('\\\\','\\').replace('\"','') + ";")
-  print("Plotly.newPlot('box%d',data,layout);" % (i))
-  print('</script>')
+  outbuffer.print(json.dumps(layout, indent=3).replace('\\\\','\\').replace('\"','') + ";")
+  outbuffer.print("Plotly.newPlot('box%d',data,layout);" % (i))
+  outbuffer.print('</script>')
 
 
-def make3DPlot3(func, legend='', width=600, height=600, npoints=50):
+def make3DPlot3(outbuffer, func, legend='', width=600, height=600, npoints=50, workers=1, ops=None):
 
   str1 = legend.split("\'")[0]
   str2 = legend.split("\'")[1]
@@ -316,217 +438,334 @@ def make3DPlot3(func, legend='', width=600, height=600, npoints=50):
   w = [v[i]+np.pi for i in range(1,len(v))]
   v = np.append(v, w)
 
-  dataX1 = [[0.0 for i in range(len(v))] for j in range(len(u))]
-  dataY1 = [[0.0 for i in range(len(v))] for j in range(len(u))]
-  dataZ1 = [[0.0 for i in range(len(v))] for j in range(len(u))]
-  dataR1 = [["0.0" for i in range(len(v))] for j in range(len(u))]
-
-  dataX2 = [[0.0 for i in range(len(v))] for j in range(len(u))]
-  dataY2 = [[0.0 for i in range(len(v))] for j in range(len(u))]
-  dataZ2 = [[0.0 for i in range(len(v))] for j in range(len(u))]
-  dataR2 = [["0.0" for i in range(len(v))] for j in range(len(u))]
-
-  dataX3 = [[0.0 for i in range(len(v))] for j in range(len(u))]
-  dataY3 = [[0.0 for i in range(len(v))] for j in range(len(u))]
-  dataZ3 = [[0.0 for i in range(len(v))] for j in range(len(u))]
-  dataR3 = [["0.0" for i in range(len(v))] for j in range(len(u))]
-
-  count = 0
-  r = [0.0, 0.0, 0.0, np.pi/2.0, np.pi/2.0]
-  ruv = [[r for i in range(len(u))] for j in range(len(v))]
-  for cu in range(len(u)):
-    for cv in range(len(v)):
-       ruv[cv][cu] = func(u[cu],v[cv],r[3],r[4])
-
-  for cu in range(len(u)):
-    for cv in range(len(v)):
-
-      z = np.cos(u[cu])
-      x = np.sin(u[cu]) * np.cos(v[cv])
-      y = np.sin(u[cu]) * np.sin(v[cv])
-
-      r = ruv[cv][cu]
-      r1_tmp = r[0]
-      dataX1[cu][cv] = r1_tmp * x
-      dataY1[cu][cv] = r1_tmp * y
-      dataZ1[cu][cv] = r1_tmp * z
-      dataR1[cu][cv] = "'"+"\u03BD'"+"+'min'.sub()+"+"' = "+str(float(int(100*r1_tmp))/100.0)+", "+"\u03B8 = "+str(float(int(100*u[cu]*180/np.pi))/100.0)+"\u00B0, "+"\u03c6 = "+str(float(int(100*v[cv]*180/np.pi))/100.0)+"\u00B0'"
-
-      r2_tmp = r[1]
-      dataX2[cu][cv] = r2_tmp * x
-      dataY2[cu][cv] = r2_tmp * y
-      dataZ2[cu][cv] = r2_tmp * z
-      dataR2[cu][cv] = "'"+"\u03BD'"+"+'min'.sub()+"+"' = "+str(float(int(100*r2_tmp))/100.0)+", "+"\u03B8 = "+str(float(int(100*u[cu]*180/np.pi))/100.0)+"\u00B0, "+"\u03c6 = "+str(float(int(100*v[cv]*180/np.pi))/100.0)+"\u00B0'"
-
-      r3_tmp = r[2]
-      dataX3[cu][cv] = r3_tmp * x
-      dataY3[cu][cv] = r3_tmp * y
-      dataZ3[cu][cv] = r3_tmp * z
-      dataR3[cu][cv] = "'"+"\u03BD'"+"+'max'.sub()+"+"' = "+str(float(int(100*r3_tmp))/100.0)+", "+"\u03B8 = "+str(float(int(100*u[cu]*180/np.pi))/100.0)+"\u00B0, "+"\u03c6 = "+str(float(int(100*v[cv]*180/np.pi))/100.0)+"\u00B0'"
-      count = count+1
+  # Evaluate the whole (theta, phi) grid in one call
+  uu, vv = np.meshgrid(u, v, indexing='ij')
+  with profiling.stage('surface'):
+    r = evaluateGrid(func, uu, vv, workers, ops=ops)
+  x = np.sin(uu) * np.cos(vv)
+  y = np.sin(uu) * np.sin(vv)
+  z = np.cos(uu)
+
+  dataX1 = (r[0] * x).tolist()
+  dataY1 = (r[0] * y).tolist()
+  dataZ1 = (r[0] * z).tolist()
+  dataR1 = hoverLabels("'\u03BD'+'min'.sub()+' = ", r[0], ", \u03B8 = ", u, v, 100)
+
+  dataX2 = (r[1] * x).tolist()
+  dataY2 = (r[1] * y).tolist()
+  dataZ2 = (r[1] * z).tolist()
+  dataR2 = hoverLabels("'\u03BD'+'min'.sub()+' = ", r[1], ", \u03B8 = ", u, v, 100)
+
+  dataX3 = (r[2] * x).tolist()
+  dataY3 = (r[2] * y).tolist()
+  dataZ3 = (r[2] * z).tolist()
+  dataR3 = hoverLabels("'\u03BD'+'max'.sub()+' = ", r[2], ", \u03B8 = ", u, v, 100)
 
   i = random.randint(0, 100000)
-  print('<div class="plot3D">')
-  print('<div id="box%d" style="width: %dpx; height: %dpx; display:block;"></div>' % (i, width, height))
-  print('</div>')
-  print('<script type="text/javascript">')
-  print("var trace1 =")
-  write3DPlotData(dataX1, dataY1, dataZ1, dataR1, 2, 0.5)
-  print("var trace2 =")
-  write3DPlotData(dataX2, dataY2, dataZ2, dataR2, 1, 1.0)
-  print("var trace3 =")
-  write3DPlotData(dataX3, dataY3, dataZ3, dataR3, 3, 0.5)
-  print("var data = [trace1, trace2, trace3]")
-  print("var layout =")
+  outbuffer.print('<div class="plot3D">')
+  outbuffer.print('<div id="box%d" style="width: %dpx; height: %dpx; display:block;"></div>' % (i, width, height))
+  outbuffer.print('</div>')
+  outbuffer.print('<script type="text/javascript">')
+  outbuffer.print("var trace1 =")
+  write3DPlotData(outbuffer, dataX1, dataY1, dataZ1, dataR1, 2, 0.5)
+  outbuffer.print("var trace2 =")
+  write3DPlotData(outbuffer, dataX2, dataY2, dataZ2, dataR2, 1, 1.0)
+  outbuffer.print("var trace3 =")
+  write3DPlotData(outbuffer, dataX3, dataY3, dataZ3, dataR3, 3, 0.5)
+  outbuffer.print("var data = [trace1, trace2, trace3]")
+  outbuffer.print("var layout =")
   layout = {"title": "\'"+str1+"\\"+"\'"+str2+"\'", "width":"650", "height":"700" , "autosize":"false", "autorange":"true", "margin": "{l: 65, r: 50, b: 65, t: 90}"}
-  print(json.dumps(layout, indent=3).replace('\\\\','\\').replace('\"','') + ";")
-  print("Plotly.newPlot('box%d',data,layout);" % (i))
-  print('</script>')
+  outbuffer.print(json.dumps(layout, indent=3).replace('\\\\','\\').replace('\"','') + ";")
+  outbuffer.print("Plotly.newPlot('box%d',data,layout);" % (i))
+  outbuffer.print('</script>')
+
+
+
+
+# Hover label prefix and middle, scale, color and opacity of the surfaces in the 3D plot of each property
+meshStyles = {'young': [("'E = ", " GPa, \u03B8 = ", 10, 1, 1.0)],
+              'lc': [("'\u03B2 = ", " TPa'+'-1'.sup()+', \u03B8 = ", 10, 1, 1.0),
+                     ("'\u03B2 = -", " TPa'+'-1'.sup()+', \u03B8 = ", 10, 2, 1.0)],
+              'shear': [("'G'+'min'.sub()+' = ", "GPa, \u03B8 = ", 10, 1, 1.0),
+                        ("'G'+'max'.sub()+' = ", "GPa, \u03B8 = ", 10, 3, 0.5)],
+              'poisson': [("'\u03BD'+'min'.sub()+' = ", ", \u03B8 = ", 100, 2, 0.5),
+                          ("'\u03BD'+'min'.sub()+' = ", ", \u03B8 = ", 100, 1, 1.0),
+                          ("'\u03BD'+'max'.sub()+' = ", ", \u03B8 = ", 100, 3, 0.5)]}
 
 
+def make3DMesh(outbuffer, elas, job, legend='', width=600, height=600, tol=None):
+    """3D plot of a property, on an adaptive triangle mesh rather than a grid of angles"""
+
+    d, r, triangles = mesh3D(elas, job, tol)
+    theta, phi = sampling.directionAngles(d)
+
+    i = random.randint(0, 100000)
+    outbuffer.print('<div class="plot3D">')
+    outbuffer.print('<div id="box%d" style="width: %dpx; height: %dpx; display:block;"></div>' % (i, width, height))
+    outbuffer.print('</div>')
+    outbuffer.print('<script type="text/javascript">')
+    for name, t in zip(('meshI', 'meshJ', 'meshK'), triangles.T):
+        outbuffer.print("var %s = %s;" % (name, json.dumps(t.tolist(), separators=(',', ':'))))
+    for n, (ri, (prefix, middle, scale, color, opacity)) in enumerate(zip(r, meshStyles[job])):
+        outbuffer.print("var trace%d =" % (n + 1))
+        write3DMeshData(outbuffer, (ri * d[:, 0]).tolist(), (ri * d[:, 1]).tolist(), (ri * d[:, 2]).tolist(),
+                        pointLabels(prefix, ri, middle, theta, phi, scale).tolist(), color, opacity)
+    outbuffer.print("var data = [%s]" % ", ".join("trace%d" % (n + 1) for n in range(len(r))))
+    outbuffer.print("var layout =")
+    layout = {"title": "\'" + legend.replace("'", "\\'") + "\'", "width": "650", "height": "700", "autosize": "false", "autorange": "true", "margin": "{l: 65, r: 50, b: 65, t: 90}"}
+    outbuffer.print(json.dumps(layout, indent=3).replace('\\\\', '\\').replace('\"', '') + ";")
+    outbuffer.print("Plotly.newPlot('box%d',data,layout);" % (i))
+    outbuffer.print('</script>')
+
+
+# 3D data functions, for use without the HTML pages
+################################################################################################
+
+def surface3D(elas, job, workers=1):
+    """
+    Return the angles theta and phi, and the list of (name, values) surfaces, for the 3D plot
+    of a property ('young', 'lc', 'shear' or 'poisson'), on the same grids as the 3D plots
+    """
+    with profiling.stage('surface'):
+        return cache.cached('surface3D', elas, (job,), lambda: _surface3D(elas, job, workers))
+
+
+def _surface3D(elas, job, workers):
+    if job not in surfaceNames:
+        raise ValueError("unknown job: " + str(job))
+
+    if job in ('young', 'lc'):
+        u = np.linspace(0, np.pi, 200)
+        v = np.linspace(0, 2*np.pi, 400)
+    else:
+        u = np.linspace(0, np.pi, 50)
+        v = np.linspace(0, np.pi, 50)
+        v = np.append(v, v[1:] + np.pi)
+    uu, vv = np.meshgrid(u, v, indexing='ij')
+
+    r = evaluateGrid(functools.partial(surfaceValues, elas, job), uu, vv, workers, ops=elas.symmetryOperations())
+    return u, v, list(zip(surfaceNames[job], r))
+
+
+# Names of the surfaces in the 3D plot of each property
+surfaceNames = {'young': ['E'], 'lc': ['beta_pos', 'beta_neg'], 'shear': ['G_min', 'G_max'],
+                'poisson': ['nu_min_neg', 'nu_min_pos', 'nu_max']}
+
+
+def surfaceValues(elas, job, theta, phi):
+    """Return the tuple of surfaces in the 3D plot of a property, for arrays of angles"""
+    if job == 'young':
+        return (elas.Young_array(theta, phi),)
+    elif job == 'lc':
+        r = elas.LC_array(theta, phi)
+        return (np.maximum(0, r), np.maximum(0, -r))
+    elif job == 'shear':
+        return elas.shearChi(theta, phi)[:2]
+    elif job == 'poisson':
+        return elas.Poisson3D(theta, phi)[:3]
+    raise ValueError("unknown job: " + str(job))
+
+
+# Default tolerance and minimum edge length of the adaptive meshes. Shear modulus and Poisson's
+# ratio surfaces have kinks (where the extrema over chi cross), so they are sampled more coarsely,
+# as in the 3D plots on grids of angles.
+meshTolerances = {'young': (2e-3, 0.02), 'lc': (2e-3, 0.02), 'shear': (5e-3, 0.04), 'poisson': (5e-3, 0.04)}
+
+
+def mesh3D(elas, job, tol=None, minedge=None):
+    """
+    Return the surfaces in the 3D plot of a property, sampled on an adaptive triangulation
+    of the sphere (see sampling.adaptiveMesh): directions, values and triangles
+    """
+    if job not in surfaceNames:
+        raise ValueError("unknown job: " + str(job))
+    tol = meshTolerances[job][0] if tol is None else tol
+    minedge = meshTolerances[job][1] if minedge is None else minedge
+    with profiling.stage('surface'):
+        return cache.cached('mesh3D', elas, (job, tol, minedge),
+                            lambda: sampling.adaptiveMesh(functools.partial(surfaceValues, elas, job), tol, minedge=minedge))
+
+
+def typedArray(a):
+    """Encode an array as a Plotly typed array: little-endian float32, base64-encoded"""
+    with profiling.stage('serialization'):
+        a = np.ascontiguousarray(a, dtype='<f4')
+        return OrderedDict([("dtype", "f4"),
+                            ("bdata", base64.b64encode(a.tobytes()).decode('ascii')),
+                            ("shape", ", ".join(map(str, a.shape)))])
+
+
+def plot3DData(matrix, job, workers=1, output='json'):
+    """
+    Return the data of a 3D plot, without HTML: X, Y, Z and R grids for each surface, and the
+    angles in degrees (so that hover text can be built client-side from R and the angles).
+
+    With output='json', arrays are Plotly typed arrays (base64-encoded float32) in a JSON string.
+    With output='npz', the result is the bytes of a compressed NumPy .npz archive.
+    With output='mesh', surfaces are sampled on an adaptive triangle mesh (see mesh3D),
+    whose triangles are given as vertex indices i, j and k (as in Plotly mesh3d traces).
+    """
+
+    with profiling.stage('parse'):
+        elas = elastic.specialize(elastic.Elastic(matrix))
+
+    if output == 'mesh':
+        d, r, triangles = mesh3D(elas, job)
+        theta, phi = sampling.directionAngles(d)
+        data = OrderedDict([("job", job),
+                            ("theta", typedArray(theta * 180 / np.pi)),
+                            ("phi", typedArray(phi * 180 / np.pi)),
+                            ("i", triangles[:, 0].tolist()),
+                            ("j", triangles[:, 1].tolist()),
+                            ("k", triangles[:, 2].tolist()),
+                            ("surfaces", [OrderedDict([("name", name),
+                                                       ("x", typedArray(ri * d[:, 0])),
+                                                       ("y", typedArray(ri * d[:, 1])),
+                                                       ("z", typedArray(ri * d[:, 2])),
+                                                       ("r", typedArray(ri))])
+                                          for name, ri in zip(surfaceNames[job], r)])])
+        return json.dumps(data, separators=(',', ':'))
+
+    u, v, surfaces = surface3D(elas, job, workers)
+    uu, vv = np.meshgrid(u, v, indexing='ij')
+    x = np.sin(uu) * np.cos(vv)
+    y = np.sin(uu) * np.sin(vv)
+    z = np.cos(uu)
+
+    if output == 'json':
+        data = OrderedDict([("job", job),
+                            ("theta", typedArray(u * 180 / np.pi)),
+                            ("phi", typedArray(v * 180 / np.pi)),
+                            ("surfaces", [OrderedDict([("name", name),
+                                                       ("x", typedArray(r * x)),
+                                                       ("y", typedArray(r * y)),
+                                                       ("z", typedArray(r * z)),
+                                                       ("r", typedArray(r))])
+                                          for name, r in surfaces])])
+        return json.dumps(data, separators=(',', ':'))
+    elif output == 'npz':
+        arrays = {"theta": u * 180 / np.pi, "phi": v * 180 / np.pi}
+        for name, r in surfaces:
+            arrays.update({name + "_x": r * x, name + "_y": r * y, name + "_z": r * z, name + "_r": r})
+        buf = BytesIO()
+        np.savez_compressed(buf, **{k: a.astype(np.float32) for k, a in arrays.items()})
+        return buf.getvalue()
+    else:
+        raise ValueError("unknown output format: " + str(output))
 
 
 # Polar plot functions
 ################################################################################################
 
-def writePolarPlotData(dataX, dataY, suffix):
+def formatPolarPlotData(a):
+    """Format an array of coordinates as a comma-separated list, as in the polar plot data"""
+    return ','.join(np.char.mod('%.5f', a))
+
+
+def writePolarPlotData(outbuffer, dataX, dataY, suffix):
     """Write data for a polar plot, taking care of the center of inversion"""
 
-    print("var dataX" + suffix + " = [")
-    print((len(dataX) * "%.5f,") % tuple(dataX))
-    print(((len(dataX)-1) * "%.5f," + "%.5f") % tuple(-dataX))
-    print("];")
-    print("var dataY" + suffix + " = [")
-    print((len(dataX) * "%.5f,") % tuple(dataY))
-    print(((len(dataX)-1) * "%.5f," + "%.5f") % tuple(-dataY))
-    print("];")
+    outbuffer.print("var dataX" + suffix + " = [")
+    outbuffer.print(formatPolarPlotData(dataX) + ",")
+    outbuffer.print(formatPolarPlotData(-dataX))
+    outbuffer.print("];")
+    outbuffer.print("var dataY" + suffix + " = [")
+    outbuffer.print(formatPolarPlotData(dataY) + ",")
+    outbuffer.print(formatPolarPlotData(-dataY))
+    outbuffer.print("];")
 
 
+# Angles (theta, phi) of the directions in the planes of the polar plots, for an array of angles u
+planeAngles = {'xy': lambda u: (np.full_like(u, np.pi / 2), u),
+               'xz': lambda u: (u, np.zeros_like(u)),
+               'yz': lambda u: (u, np.full_like(u, np.pi / 2))}
 
-def makePolarPlot(func, maxrad, legend='', p='xy', width=300, height=300, npoints=90, color='#009010', linewidth=2):
 
-    i = random.randint(0, 100000)
-    print('<div class="plot">')
-    print('<div id="box%d" class="jxgbox" style="width: %dpx; height: %dpx; display:inline-block;"></div>' % (i, width, height))
-    print('<br />%s</div>' % legend)
-    print('<script type="text/javascript">')
-    print('var b = JXG.JSXGraph.initBoard(\'box%d\', {boundingbox: [-%f, %f, %f, -%f], axis:true, showcopyright: 0});'
-          % (i, maxrad, maxrad, maxrad, maxrad))
+def planeSections(elas, job, u, planes=('xy', 'xz', 'yz')):
+    """
+    Return the curves of the polar plots of a property (as in surfaceValues) in several planes,
+    for an array of angles u, evaluated in one call. Planes are given by their name in
+    planeAngles, or by a normal vector, in which case u is measured from a direction in the plane.
+    """
+
+    theta, phi = [], []
+    for plane in planes:
+        if isinstance(plane, str):
+            t, p = planeAngles[plane](u)
+        else:
+            n = np.asarray(plane, dtype=float) / np.linalg.norm(plane)
+            e1 = np.cross(n, np.eye(3)[np.argmin(np.abs(n))])
+            e1 /= np.linalg.norm(e1)
+            d = np.outer(np.cos(u), e1) + np.outer(np.sin(u), np.cross(n, e1))
+            t, p = sampling.directionAngles(d)
+        theta.append(t)
+        phi.append(p)
+
+    curves = surfaceValues(elas, job, np.array(theta), np.array(phi))
+    return [tuple(r[k] for r in curves) for k in range(len(planes))]
 
-    u = np.linspace(0, np.pi, npoints)
-    r = list(map(func, u))
-    if (p == "xy"):
-        x = r * np.cos(u)
-        y = r * np.sin(u)
-    else:
-        y = r * np.cos(u)
-        x = r * np.sin(u)
 
-    writePolarPlotData (x, y, "")
-    print("b.create('curve', [dataX,dataY], {strokeColor:'%s', strokeWidth: %d});" % (color, linewidth))
-    print('</script>')
+def makePolarPlotCurves(outbuffer, u, curves, colors, maxrad, legend='', p='xy', width=300, height=300, linewidth=2):
+    """Write a polar plot of the curves r(u) (a tuple of arrays), with the given colors"""
 
-def makePolarPlotPosNeg(func, maxrad, legend='', p='xy', width=300, height=300, npoints=90, linewidth=2):
     i = random.randint(0, 100000)
-    print('<div class="plot">')
-    print('<div id="box%d" class="jxgbox" style="width: %dpx; height: %dpx; display:inline-block;"></div>' % (i, width, height))
-    print('<br />%s</div>' % legend)
-    print('<script type="text/javascript">')
-    print('var b = JXG.JSXGraph.initBoard(\'box%d\', {boundingbox: [-%f, %f, %f, -%f], axis:true, showcopyright: 0});'
+    outbuffer.print('<div class="plot">')
+    outbuffer.print('<div id="box%d" class="jxgbox" style="width: %dpx; height: %dpx; display:inline-block;"></div>' % (i, width, height))
+    outbuffer.print('<br />%s</div>' % legend)
+    outbuffer.print('<script type="text/javascript">')
+    outbuffer.print('var b = JXG.JSXGraph.initBoard(\'box%d\', {boundingbox: [-%f, %f, %f, -%f], axis:true, showcopyright: 0});'
           % (i, maxrad, maxrad, maxrad, maxrad))
 
+    # A single curve has no suffix
+    suffixes = [""] if len(curves) == 1 else [str(k + 1) for k in range(len(curves))]
+    for r, suffix in zip(curves, suffixes):
+        if (p == "xy"):
+            writePolarPlotData(outbuffer, r * np.cos(u), r * np.sin(u), suffix)
+        else:
+            writePolarPlotData(outbuffer, r * np.sin(u), r * np.cos(u), suffix)
+    for color, suffix in zip(colors, suffixes):
+        outbuffer.print("b.create('curve', [dataX%s,dataY%s], {strokeColor:'%s', strokeWidth: %d});"
+                        % (suffix, suffix, color, linewidth))
+    outbuffer.print('</script>')
+
+
+def makePolarPlot(outbuffer, func, maxrad, legend='', p='xy', width=300, height=300, npoints=90, color='#009010', linewidth=2):
     u = np.linspace(0, np.pi, npoints)
-    r = list(map(lambda x: max(0, func(x)), u))
-    if (p == "xy"):
-        x1 = r * np.cos(u)
-        y1 = r * np.sin(u)
-    else:
-        y1 = r * np.cos(u)
-        x1 = r * np.sin(u)
-    r = list(map(lambda x: max(0, -func(x)), u))
-    if (p == "xy"):
-        x2 = r * np.cos(u)
-        y2 = r * np.sin(u)
-    else:
-        y2 = r * np.cos(u)
-        x2 = r * np.sin(u)
+    makePolarPlotCurves(outbuffer, u, (func(u),), [color], maxrad, legend, p, width, height, linewidth)
 
-    writePolarPlotData (x1, y1, "1")
-    writePolarPlotData (x2, y2, "2")
-    print("b.create('curve', [dataX1,dataY1], {strokeColor:'green', strokeWidth: %d});" % (linewidth))
-    print("b.create('curve', [dataX2,dataY2], {strokeColor:'red', strokeWidth: %d});" % (linewidth))
-    print('</script>')
 
-def makePolarPlot2(func, maxrad, legend='', p='xy', width=300, height=300, npoints=61, linewidth=2):
-    i = random.randint(0, 100000)
-    print('<div class="plot">')
-    print('<div id="box%d" class="jxgbox" style="width: %dpx; height: %dpx; display:inline-block;"></div>' % (i, width, height))
-    print('<br />%s</div>' % legend)
-    print('<script type="text/javascript">')
-    print('var b = JXG.JSXGraph.initBoard(\'box%d\', {boundingbox: [-%f, %f, %f, -%f], axis:true, showcopyright: 0});'
-          % (i, maxrad, maxrad, maxrad, maxrad))
+def makePolarPlotPosNeg(outbuffer, func, maxrad, legend='', p='xy', width=300, height=300, npoints=90, linewidth=2):
+    u = np.linspace(0, np.pi, npoints)
+    r = func(u)
+    makePolarPlotCurves(outbuffer, u, (np.maximum(0, r), np.maximum(0, -r)), ['green', 'red'],
+                        maxrad, legend, p, width, height, linewidth)
 
+
+def makePolarPlot2(outbuffer, func, maxrad, legend='', p='xy', width=300, height=300, npoints=61, linewidth=2):
     u = np.linspace(0, np.pi, npoints)
-    r = list(map(func, u))
+    makePolarPlotCurves(outbuffer, u, func(u)[:2], ['green', 'blue'], maxrad, legend, p, width, height, linewidth)
 
-    if (p == "xy"):
-        x1 = np.array([ ir[0] * np.cos(iu) for ir, iu in zip(r,u) ])
-        y1 = np.array([ ir[0] * np.sin(iu) for ir, iu in zip(r,u) ])
-        x2 = np.array([ ir[1] * np.cos(iu) for ir, iu in zip(r,u) ])
-        y2 = np.array([ ir[1] * np.sin(iu) for ir, iu in zip(r,u) ])
-    else:
-        y1 = np.array([ ir[0] * np.cos(iu) for ir, iu in zip(r,u) ])
-        x1 = np.array([ ir[0] * np.sin(iu) for ir, iu in zip(r,u) ])
-        y2 = np.array([ ir[1] * np.cos(iu) for ir, iu in zip(r,u) ])
-        x2 = np.array([ ir[1] * np.sin(iu) for ir, iu in zip(r,u) ])
-
-    writePolarPlotData (x1, y1, "1")
-    writePolarPlotData (x2, y2, "2")
-    print("b.create('curve', [dataX1,dataY1], {strokeColor:'green', strokeWidth: %d});" % (linewidth))
-    print("b.create('curve', [dataX2,dataY2], {strokeColor:'blue', strokeWidth: %d});" % (linewidth))
-    print('</script>')
-
-def makePolarPlot3(func, maxrad, legend='', p='xy', width=300, height=300, npoints=61, linewidth=2):
-    i = random.randint(0, 100000)
-    print('<div class="plot">')
-    print('<div id="box%d" class="jxgbox" style="width: %dpx; height: %dpx; display:inline-block;"></div>' % (i, width, height))
-    print('<br />%s</div>' % legend)
-    print('<script type="text/javascript">')
-    print('var b = JXG.JSXGraph.initBoard(\'box%d\', {boundingbox: [-%f, %f, %f, -%f], axis:true, showcopyright: 0});'
-          % (i, maxrad, maxrad, maxrad, maxrad))
 
+def makePolarPlot3(outbuffer, func, maxrad, legend='', p='xy', width=300, height=300, npoints=61, linewidth=2):
     u = np.linspace(0, np.pi, npoints)
-    r = list(map(func, u))
-
-    if (p == "xy"):
-        x1 = np.array([ ir[0] * np.cos(iu) for ir, iu in zip(r,u) ])
-        y1 = np.array([ ir[0] * np.sin(iu) for ir, iu in zip(r,u) ])
-        x2 = np.array([ ir[1] * np.cos(iu) for ir, iu in zip(r,u) ])
-        y2 = np.array([ ir[1] * np.sin(iu) for ir, iu in zip(r,u) ])
-        x3 = np.array([ ir[2] * np.cos(iu) for ir, iu in zip(r,u) ])
-        y3 = np.array([ ir[2] * np.sin(iu) for ir, iu in zip(r,u) ])
-    else:
-        y1 = np.array([ ir[0] * np.cos(iu) for ir, iu in zip(r,u) ])
-        x1 = np.array([ ir[0] * np.sin(iu) for ir, iu in zip(r,u) ])
-        y2 = np.array([ ir[1] * np.cos(iu) for ir, iu in zip(r,u) ])
-        x2 = np.array([ ir[1] * np.sin(iu) for ir, iu in zip(r,u) ])
-        y3 = np.array([ ir[2] * np.cos(iu) for ir, iu in zip(r,u) ])
-        x3 = np.array([ ir[2] * np.sin(iu) for ir, iu in zip(r,u) ])
-
-    writePolarPlotData (x1, y1, "1")
-    writePolarPlotData (x2, y2, "2")
-    writePolarPlotData (x3, y3, "3")
-    print("b.create('curve', [dataX1,dataY1], {strokeColor:'red', strokeWidth: %d});" % (linewidth))
-    print("b.create('curve', [dataX2,dataY2], {strokeColor:'green', strokeWidth: %d});" % (linewidth))
-    print("b.create('curve', [dataX3,dataY3], {strokeColor:'blue', strokeWidth: %d});" % (linewidth))
-    print('</script>')
+    makePolarPlotCurves(outbuffer, u, func(u)[:3], ['red', 'green', 'blue'], maxrad, legend, p, width, height, linewidth)
 
 
-################################################################################################
+# Colors and number of points of the polar plots of each property, in the 3D pages
+polarPlotStyles = {'young': (['#009010'], 90), 'lc': (['green', 'red'], 90),
+                   'shear': (['green', 'blue'], 61), 'poisson': (['red', 'green', 'blue'], 61)}
+
+
+def makePolarPlots3D(outbuffer, elas, job, maxrad, legend):
+    """Write the polar plots of a property in the xy, xz and yz planes, from a single evaluation"""
+    colors, npoints = polarPlotStyles[job]
+    u = np.linspace(0, np.pi, npoints)
+    with profiling.stage('polar-' + job):
+        for plane, curves in zip(('xy', 'xz', 'yz'), planeSections(elas, job, u)):
+            makePolarPlotCurves(outbuffer, u, curves, colors, maxrad, "%s in (%s) plane" % (legend, plane), plane)
 
 
-# Materials Project URL
-urlBase = 'https://api.materialsproject.org'
+################################################################################################
 
 
 def queryMaterials(query, mapiKey):
@@ -538,14 +777,13 @@ def queryMaterials(query, mapiKey):
 
     # We accept either a chemical system or a formula
     if '-' in query:
-        query = 'chemsys=' + query
+        key, value = 'chemsys', query
     else:
-        query = 'formula=' + query
+        key, value = 'formula', query
 
     try:
-        r = requests.get(f'{urlBase}/materials/summary/?{query}&deprecated=false&_fields=has_props,material_id,formula_pretty',
-                         headers={'X-API-KEY': mapiKey, 'accept': 'application/json'}, timeout=4)
-        resp = r.json()
+        resp = materialsproject.default.get('/materials/summary/', {key: value, 'deprecated': 'false',
+                                            '_fields': 'has_props,material_id,formula_pretty'}, mapiKey)
     except Exception as e:
         print(str(e), file=sys.stderr)
         return 0, []
@@ -561,9 +799,8 @@ def queryElasticity(mat, mapiKey):
     """Return elastic properties for a given material ID, using so-called 'new API'"""
 
     try:
-        r = requests.get(f'{urlBase}/materials/elasticity/?material_ids={mat}&&_fields=elastic_tensor,material_id,formula_pretty',
-                         headers={'X-API-KEY': mapiKey, 'accept': 'application/json'}, timeout=4)
-        resp = r.json()
+        resp = materialsproject.default.get('/materials/elasticity/', {'material_ids': mat,
+                                            '_fields': 'elastic_tensor,material_id,formula_pretty'}, mapiKey)
     except Exception as e:
         print(str(e), file=sys.stderr)
         return None
@@ -591,13 +828,13 @@ def ELATE_MaterialsProject(query, mapiKey):
       return ELATE(tensor, '%s (Materials Project id <a href="%s%s" target="_blank">%s</a>)' % (r["formula_pretty"], "https://www.materialsproject.org/materials/", r["material_id"], r["material_id"]))
 
   # Otherwise, run the MP query, list the matches and let the user choose
-  sys.stdout = outbuffer = StringIO()
+  outbuffer = HTMLRenderer()
   printTitle(outbuffer, "ELATE: Elastic tensor analysis")
-  print('<h2>Query from the Materials Project database</h2>')
+  outbuffer.print('<h2>Query from the Materials Project database</h2>')
 
   # Either there was no match, or a single match with no elastic data
   if len(materials) <= 1:
-    print("""<p>
+    outbuffer.print("""<p>
             Your query for <tt style="background-color: #e0e0e0;">%s</tt> from the <a href="https://materialsproject.org"
             target="_blank" rel="noreferrer">Materials Project</a> database has returned a total of zero result.
             Or is it zero results? In any case, we are very sorry.</p>
@@ -612,116 +849,124 @@ def ELATE_MaterialsProject(query, mapiKey):
     return finishWebPage(outbuffer)
 
 
-  print("""<p>Your query for <tt style="background-color: #e0e0e0;">%s</tt> from the <a
+  outbuffer.print("""<p>Your query for <tt style="background-color: #e0e0e0;">%s</tt> from the <a
            href="https://materialsproject.org" target="_blank" rel="noreferrer">Materials Project</a> database
            has returned %d results.""" % (query, nres))
 
   if len(materials) < nres:
-    print(f'Below is a table of the {len(materials)} first matches.')
+    outbuffer.print(f'Below is a table of the {len(materials)} first matches.')
 
-  print("<table><tr><th>Identifier</th><th>Formula</th><th>Elastic data</th></tr>")
+  outbuffer.print("<table><tr><th>Identifier</th><th>Formula</th><th>Elastic data</th></tr>")
   for mat in materials:
     mid = mat['material_id']
-    print('<tr><td><a href="https://www.materialsproject.org/materials/%s" target="_blank" rel="noreferrer">%s</a></td><td>%s</td>' % (mid, mid, mat["formula_pretty"]))
+    outbuffer.print('<tr><td><a href="https://www.materialsproject.org/materials/%s" target="_blank" rel="noreferrer">%s</a></td><td>%s</td>' % (mid, mid, mat["formula_pretty"]))
     if mat['has_props'].get('elasticity'):
-      print('<td>Elastic data available, <a href="/elate/mp?%s" target="_blank" rel="noreferrer">perform analysis</a></td></tr>' % (mid))
+      outbuffer.print('<td>Elastic data available, <a href="/elate/mp?%s" target="_blank" rel="noreferrer">perform analysis</a></td></tr>' % (mid))
     else:
-      print('<td>No elastic data available</td></tr>')
-  print("</table>")
+      outbuffer.print('<td>No elastic data available</td></tr>')
+  outbuffer.print("</table>")
 
   return finishWebPage(outbuffer)
 
 
-def ELATE(matrix, sysname):
+@cache.cachedPage('ELATE', refresh=updateTiming)
+def ELATE(matrix, sysname, bruteForce=False, debug=False):
     """
     ELATE is the main function, interprets the matrix for 2D or 3D material,
     and dispatches the work to specialized functions.
+
+    With bruteForce=True, all extrema are found by brute-force search
+    (useful to cross-check the analytic solvers).
+    With debug=True, the page is profiled, and ends with the results (see profiling).
+    """
+    return writeELATE(HTMLRenderer(), matrix, sysname, bruteForce, debug)
+
+
+def ELATE_stream(matrix, sysname, bruteForce=False, debug=False):
     """
+    Same as ELATE, but as a generator of page fragments, yielded as soon as each section
+    of the page is complete (so that a web server can send them without waiting for the plots)
+    """
+    return streamPage(lambda outbuffer: writeELATE(outbuffer, matrix, sysname, bruteForce, debug))
+
+
+def writeELATE(outbuffer, matrix, sysname, bruteForce=False, debug=False):
+    """Write the ELATE page to a renderer"""
 
-    # Redirect output to out string buffer
-    sys.stdout = outbuffer = StringIO()
+    if debug:
+        with profiling.profile('ELATE', debug=True):
+            return writeELATE(outbuffer, matrix, sysname, bruteForce)
 
     # Start timing
-    print('<script type="text/javascript">var startTime = %.12g</script>' % time.perf_counter())
+    outbuffer.print('<script type="text/javascript">var startTime = %.12g</script>' % time.perf_counter())
     sysname_sanitized = removeHTMLTags(sysname).strip()
     printTitle(outbuffer, "Elastic analysis of " + sysname_sanitized)
+    outbuffer.flush()
 
     try:
         # First try to interpret as a 3D matrix
-        elas = elastic.Elastic(matrix)
+        with profiling.stage('parse'):
+            elas = elastic.Elastic(matrix)
     except TypeError as e:
         try:
-            elas = elastic.Elastic2D(matrix)
+            with profiling.stage('parse'):
+                elas = elastic.Elastic2D(matrix)
         except ValueError as e:
-            print('<div class="error">Invalid stiffness matrix: ')
-            print(e.args[0])
+            outbuffer.print('<div class="error">Invalid stiffness matrix: ')
+            outbuffer.print(e.args[0])
             if matrix:
-                print('<pre>' + str(matrix) + '</pre>')
-            print('</div>')
-            print('<input action="action" type="button" value="Go back" onclick="window.history.go(-1); return false;" />')
+                outbuffer.print('<pre>' + str(matrix) + '</pre>')
+            outbuffer.print('</div>')
+            outbuffer.print('<input action="action" type="button" value="Go back" onclick="window.history.go(-1); return false;" />')
             return finishWebPage(outbuffer)
     except ValueError as e:
-        print('<div class="error">Invalid stiffness matrix: ')
-        print(e.args[0])
+        outbuffer.print('<div class="error">Invalid stiffness matrix: ')
+        outbuffer.print(e.args[0])
         if matrix:
-            print('<pre>' + str(matrix) + '</pre>')
-        print('</div>')
-        print('<input action="action" type="button" value="Go back" onclick="window.history.go(-1); return false;" />')
+            outbuffer.print('<pre>' + str(matrix) + '</pre>')
+        outbuffer.print('</div>')
+        outbuffer.print('<input action="action" type="button" value="Go back" onclick="window.history.go(-1); return false;" />')
         return finishWebPage(outbuffer)
 
     if elas.is2D():
         return ELATE_main_2D(elas, matrix, sysname, outbuffer)
     else:
-        return ELATE_main_3D(elas, matrix, sysname, outbuffer)
+        return ELATE_main_3D(elas, matrix, sysname, outbuffer, bruteForce)
 
 
 def ELATE_main_2D(elas, matrix, sysname, outbuffer):
     """Performs the calculations and plots properties for 2D materials"""
 
-    print('<h2>Summary of the properties (2D material)</h2>')
+    outbuffer.print('<h2>Summary of the properties (2D material)</h2>')
 
     displayname = " of " + sysname if len(sysname) else ""
-    print('<h3>Input: stiffness matrix (coefficients in N/m)%s</h3>' % (displayname))
-    print('<pre>')
+    outbuffer.print('<h3>Input: stiffness matrix (coefficients in N/m)%s</h3>' % (displayname))
+    outbuffer.print('<pre>')
     for i in range(3):
-        print(("   " + 3 * "%7.5g  ") % tuple(elas.CVoigt[i]))
-    print('</pre>')
+        outbuffer.print(("   " + 3 * "%7.5g  ") % tuple(elas.CVoigt[i]))
+    outbuffer.print('</pre>')
+    outbuffer.flush()
 
-    print('''<h3>Eigenvalues of the stiffness matrix</h3>
+    outbuffer.print('''<h3>Eigenvalues of the stiffness matrix</h3>
     <table><tr>
     <th>&lambda;<sub>1</sub></th>
     <th>&lambda;<sub>2</sub></th>
     <th>&lambda;<sub>3</sub></th>
     </tr><tr>''')
-    eigenval = elas.eigenvalues()
-    print((3 * '<td>%7.5g N/m</td>') % tuple(eigenval))
-    print('</tr></table>')
+    with profiling.stage('eigenvalues'):
+        eigenval = elas.eigenvalues()
+    outbuffer.print((3 * '<td>%7.5g N/m</td>') % tuple(eigenval))
+    outbuffer.print('</tr></table>')
+    outbuffer.flush()
 
     if eigenval[0] <= 0:
-        print('<div class="error">Stiffness matrix is not definite positive, crystal is mechanically unstable<br/>')
-        print('No further analysis will be performed.</div>')
+        outbuffer.print('<div class="error">Stiffness matrix is not definite positive, crystal is mechanically unstable<br/>')
+        outbuffer.print('No further analysis will be performed.</div>')
         return finishWebPage(outbuffer)
 
-    def findMin(func):
-        # We prefer the brute() function to minimize_scalar(), which only does local optimization
-        # But our functions are one-dimensional, which brute() does not accept, so make a wrapper
-        res = optimize.brute(lambda x: func(x[0]), ((0, np.pi),), Ns=100, full_output=True, finish=optimize.fmin)
-        return (res[0][0], res[1])
-
-    def findMax(func):
-        # We prefer the brute() function to minimize_scalar(), which only does local optimization
-        # But our functions are one-dimensional, which brute() does not accept, so make a wrapper
-        res = optimize.brute(lambda x: -func(x[0]), ((0, np.pi),), Ns=100, full_output=True, finish=optimize.fmin)
-        return (res[0][0], -res[1])
-
-    minE = findMin(elas.Young)
-    maxE = findMax(elas.Young)
-    minG = findMin(elas.shear)
-    maxG = findMax(elas.shear)
-    minNu = findMin(elas.Poisson)
-    maxNu = findMax(elas.Poisson)
-
-    print("""<h3>Variations of the elastic moduli</h3>
+    minE, maxE, minG, maxG, minNu, maxNu = analysis.extrema2D(elas)
+
+    outbuffer.print("""<h3>Variations of the elastic moduli</h3>
                 <table>
                 <tr><td></td><th colspan="2">Young's modulus</th>
                 <th colspan="2">Shear modulus</th>
@@ -730,68 +975,78 @@ def ELATE_main_2D(elas, matrix, sysname, outbuffer):
                 <th><em>G</em><sub>min</sub></th><th><em>G</em><sub>max</sub></th>
                 <th>&nu;<sub>min</sub></th><th>&nu;<sub>max</sub></th><th></th></tr>""")
 
-    print(('<tr><td>Value</td><td>%8.5g N/m</td><td>%8.5g N/m</td>'
+    outbuffer.print(('<tr><td>Value</td><td>%8.5g N/m</td><td>%8.5g N/m</td>'
            + '<td>%8.5g N/m</td><td>%8.5g N/m</td>'
            + '<td>%.5g</td><td>%.5g</td><td>Value</td></tr>') % (minE[1], maxE[1], minG[1], maxG[1], minNu[1], maxNu[1]))
 
     anisE = '%8.4g' % (maxE[1] / minE[1])
     anisG = '%8.4g' % (maxG[1] / minG[1])
     anisNu = ('%8.4f' % (maxNu[1] / minNu[1])) if minNu[1] * maxNu[1] > 0 else "&infin;"
-    print(('<tr><td>Anisotropy</td>' + 3 * '<td colspan="2">%s</td>'
+    outbuffer.print(('<tr><td>Anisotropy</td>' + 3 * '<td colspan="2">%s</td>'
            + '<td>Anisotropy</td></tr>') % (anisE, anisG, anisNu))
 
-    print('<tr><td>Angle</td>')
-    print('<td>%.2f°</td>' % (minE[0] * 180 / np.pi))
-    print('<td>%.2f°</td>' % (maxE[0] * 180 / np.pi))
-    print('<td>%.2f°</td>' % (minG[0] * 180 / np.pi))
-    print('<td>%.2f°</td>' % (maxG[0] * 180 / np.pi))
-    print('<td>%.2f°</td>' % (minNu[0] * 180 / np.pi))
-    print('<td>%.2f°</td>' % (maxNu[0] * 180 / np.pi))
-    print('<td>Axis</td></tr></table>')
-
-    print("<h2>Spatial dependence of Young's modulus</h2>")
+    outbuffer.print('<tr><td>Angle</td>')
+    outbuffer.print('<td>%.2f°</td>' % (minE[0] * 180 / np.pi))
+    outbuffer.print('<td>%.2f°</td>' % (maxE[0] * 180 / np.pi))
+    outbuffer.print('<td>%.2f°</td>' % (minG[0] * 180 / np.pi))
+    outbuffer.print('<td>%.2f°</td>' % (maxG[0] * 180 / np.pi))
+    outbuffer.print('<td>%.2f°</td>' % (minNu[0] * 180 / np.pi))
+    outbuffer.print('<td>%.2f°</td>' % (maxNu[0] * 180 / np.pi))
+    outbuffer.print('<td>Axis</td></tr></table>')
+    outbuffer.flush()
+
+    outbuffer.print("<h2>Spatial dependence of Young's modulus</h2>")
     m = 1.2 * maxE[1]
-    makePolarPlot(elas.Young, m, "Young's modulus", width=500, height=500, npoints=180)
+    with profiling.stage('polar-young'):
+        makePolarPlot(outbuffer, elas.Young, m, "Young's modulus", width=500, height=500, npoints=180)
+    outbuffer.flush()
 
-    print("<h2>Spatial dependence of shear modulus</h2>")
+    outbuffer.print("<h2>Spatial dependence of shear modulus</h2>")
     m = 1.2 * maxG[1]
-    makePolarPlot(elas.shear, m, "Shear modulus", width=500, height=500, npoints=180)
+    with profiling.stage('polar-shear'):
+        makePolarPlot(outbuffer, elas.shear, m, "Shear modulus", width=500, height=500, npoints=180)
+    outbuffer.flush()
 
-    print("<h2>Spatial dependence of Poisson's ratio</h2>")
+    outbuffer.print("<h2>Spatial dependence of Poisson's ratio</h2>")
     m = 1.2 * max(abs(maxNu[1]), abs(minNu[1]))
-    makePolarPlotPosNeg(elas.Poisson, m, "Poisson's ratio", width=500, height=500, npoints=180)
+    with profiling.stage('polar-poisson'):
+        makePolarPlotPosNeg(outbuffer, elas.Poisson, m, "Poisson's ratio", width=500, height=500, npoints=180)
 
     return finishWebPage(outbuffer)
 
 
-def ELATE_main_3D(elas, matrix, sysname, outbuffer):
+def ELATE_main_3D(elas, matrix, sysname, outbuffer, bruteForce=False):
     """Performs the calculations and plots properties for 3D materials"""
 
-    if elas.isOrthorhombic():
-        elas = elastic.ElasticOrtho(elas)
-        print('<script type="text/javascript">var isOrtho = 1;</script>')
+    with profiling.stage('specialize'):
+        sym = elastic.specialize(elas)
+    if sym.specificCase:
+        outbuffer.print('<script type="text/javascript">var specificCase = "%s";</script>' % sym.specificCase)
 
-    print('<h2>Summary of the properties (3D material)</h2>')
+    outbuffer.print('<h2>Summary of the properties (3D material)</h2>')
 
-    print('<h3>Input: stiffness matrix (coefficients in GPa) of %s</h3>' % (sysname))
-    print('<pre>')
+    outbuffer.print('<h3>Input: stiffness matrix (coefficients in GPa) of %s</h3>' % (sysname))
+    outbuffer.print('<pre>')
     for i in range(6):
-        print(("   " + 6 * "%7.5g  ") % tuple(elas.CVoigt[i]))
-    print('</pre>')
+        outbuffer.print(("   " + 6 * "%7.5g  ") % tuple(elas.CVoigt[i]))
+    outbuffer.print('</pre>')
+    outbuffer.flush()
 
-    avg = elas.averages()
-    print('<h3>Average properties</h3>')
+    with profiling.stage('averages'):
+        avg = elas.averages()
+    outbuffer.print('<h3>Average properties</h3>')
 
-    print("<table><tr><th>Averaging scheme</th><th>Bulk modulus</th><th>Young's modulus</th><th>Shear modulus</th><th>Poisson's ratio</th></tr>")
-    print(('<tr><td>Voigt</td><td><em>K</em><sub>V</sub> = %7.5g GPa</td><td><em>E</em><sub>V</sub> = %7.5g GPa</td>'
+    outbuffer.print("<table><tr><th>Averaging scheme</th><th>Bulk modulus</th><th>Young's modulus</th><th>Shear modulus</th><th>Poisson's ratio</th></tr>")
+    outbuffer.print(('<tr><td>Voigt</td><td><em>K</em><sub>V</sub> = %7.5g GPa</td><td><em>E</em><sub>V</sub> = %7.5g GPa</td>'
            + '<td><em>G</em><sub>V</sub> = %7.5g GPa</td><td><em>&nu;</em><sub>V</sub> = %.5g</td></tr>') % tuple(avg[0]))
-    print(('<tr><td>Reuss</td><td><em>K</em><sub>R</sub> = %7.5g GPa</td><td><em>E</em><sub>R</sub> = %7.5g GPa</td>'
+    outbuffer.print(('<tr><td>Reuss</td><td><em>K</em><sub>R</sub> = %7.5g GPa</td><td><em>E</em><sub>R</sub> = %7.5g GPa</td>'
            + '<td><em>G</em><sub>R</sub> = %7.5g GPa</td><td><em>&nu;</em><sub>R</sub> = %.5g</td></tr>') % tuple(avg[1]))
-    print(('<tr><td>Hill</td><td><em>K</em><sub>H</sub> = %7.5g GPa</td><td><em>E</em><sub>H</sub> = %7.5g GPa</td>'
+    outbuffer.print(('<tr><td>Hill</td><td><em>K</em><sub>H</sub> = %7.5g GPa</td><td><em>E</em><sub>H</sub> = %7.5g GPa</td>'
            + '<td><em>G</em><sub>H</sub> = %7.5g GPa</td><td><em>&nu;</em><sub>H</sub> = %.5g</td></tr>') % tuple(avg[2]))
-    print('</table>')
+    outbuffer.print('</table>')
+    outbuffer.flush()
 
-    print('''<h3>Eigenvalues of the stiffness matrix</h3>
+    outbuffer.print('''<h3>Eigenvalues of the stiffness matrix</h3>
     <table><tr>
     <th>&lambda;<sub>1</sub></th>
     <th>&lambda;<sub>2</sub></th>
@@ -800,25 +1055,20 @@ def ELATE_main_3D(elas, matrix, sysname, outbuffer):
     <th>&lambda;<sub>5</sub></th>
     <th>&lambda;<sub>6</sub></th>
     </tr><tr>''')
-    eigenval = elas.eigenvalues()
-    print((6 * '<td>%7.5g GPa</td>') % tuple(eigenval))
-    print('</tr></table>')
+    with profiling.stage('eigenvalues'):
+        eigenval = elas.eigenvalues()
+    outbuffer.print((6 * '<td>%7.5g GPa</td>') % tuple(eigenval))
+    outbuffer.print('</tr></table>')
+    outbuffer.flush()
 
     if eigenval[0] <= 0:
-        print('<div class="error">Stiffness matrix is not definite positive, crystal is mechanically unstable<br/>')
-        print('No further analysis will be performed.</div>')
+        outbuffer.print('<div class="error">Stiffness matrix is not definite positive, crystal is mechanically unstable<br/>')
+        outbuffer.print('No further analysis will be performed.</div>')
         return finishWebPage(outbuffer)
 
-    minE = elastic.minimize(elas.Young, 2)
-    maxE = elastic.maximize(elas.Young, 2)
-    minLC = elastic.minimize(elas.LC, 2)
-    maxLC = elastic.maximize(elas.LC, 2)
-    minG = elastic.minimize(elas.shear, 3)
-    maxG = elastic.maximize(elas.shear, 3)
-    minNu = elastic.minimize(elas.Poisson, 3)
-    maxNu = elastic.maximize(elas.Poisson, 3)
+    minE, maxE, minLC, maxLC, minG, maxG, minNu, maxNu = analysis.extrema3D(sym, bruteForce)
 
-    print("""<h3>Variations of the elastic moduli</h3>
+    outbuffer.print("""<h3>Variations of the elastic moduli</h3>
                 <table>
                 <tr><td></td><th colspan="2">Young\'s modulus</th><th colspan="2">Linear compressibility</th>
                 <th colspan="2">Shear modulus</th><th colspan="2">Poisson\'s ratio</th><th></th></tr>
@@ -826,7 +1076,7 @@ def ELATE_main_3D(elas, matrix, sysname, outbuffer):
                 <th>&beta;<sub>min</sub></th><th>&beta;<sub>max</sub></th><th><em>G</em><sub>min</sub></th><th><em>G</em><sub>max</sub></th>
                 <th>&nu;<sub>min</sub></th><th>&nu;<sub>max</sub></th><th></th></tr>""")
 
-    print(('<tr><td>Value</td><td>%8.5g GPa</td><td>%8.5g GPa</td>'
+    outbuffer.print(('<tr><td>Value</td><td>%8.5g GPa</td><td>%8.5g GPa</td>'
            + '<td>%8.5g TPa<sup>&ndash;1</sup></td><td>%8.5g TPa<sup>&ndash;1</sup></td>'
            + '<td>%8.5g GPa</td><td>%8.5g GPa</td>'
            + '<td>%.5g</td><td>%.5g</td><td>Value</td></tr>') % (minE[1], maxE[1], minLC[1], maxLC[1], minG[1], maxG[1], minNu[1], maxNu[1]))
@@ -835,92 +1085,116 @@ def ELATE_main_3D(elas, matrix, sysname, outbuffer):
     anisLC = ('%8.4f' % (maxLC[1] / minLC[1])) if minLC[1] > 0 else "&infin;"
     anisG = '%8.4g' % (maxG[1] / minG[1])
     anisNu = ('%8.4f' % (maxNu[1] / minNu[1])) if minNu[1] * maxNu[1] > 0 else "&infin;"
-    print(('<tr><td>Anisotropy</td>' + 4 * '<td colspan="2">%s</td>' + '<td>Anisotropy</td></tr>') % (anisE, anisLC, anisG, anisNu))
-
-    print('<tr><td>Axis</td>')
-    print('<td>%.4f<br />%.4f<br />%.4f</td>' % tuple(elastic.dirVec(*minE[0])))
-    print('<td>%.4f<br />%.4f<br />%.4f</td>' % tuple(elastic.dirVec(*maxE[0])))
-    print('<td>%.4f<br />%.4f<br />%.4f</td>' % tuple(elastic.dirVec(*minLC[0])))
-    print('<td>%.4f<br />%.4f<br />%.4f</td>' % tuple(elastic.dirVec(*maxLC[0])))
-    print('<td>%.4f<br />%.4f<br />%.4f</td>' % tuple(elastic.dirVec1(*minG[0])))
-    print('<td>%.4f<br />%.4f<br />%.4f</td>' % tuple(elastic.dirVec1(*maxG[0])))
-    print('<td>%.4f<br />%.4f<br />%.4f</td>' % tuple(elastic.dirVec1(*minNu[0])))
-    print('<td>%.4f<br />%.4f<br />%.4f</td>' % tuple(elastic.dirVec1(*maxNu[0])))
-    print('<td>Axis</td></tr>')
-
-    print('<tr><td></td><td></td><td></td><td></td><td></td>')
-    print('<td>%.4f<br />%.4f<br />%.4f</td>' % tuple(elastic.dirVec2(*minG[0])))
-    print('<td>%.4f<br />%.4f<br />%.4f</td>' % tuple(elastic.dirVec2(*maxG[0])))
-    print('<td>%.4f<br />%.4f<br />%.4f</td>' % tuple(elastic.dirVec2(*minNu[0])))
-    print('<td>%.4f<br />%.4f<br />%.4f</td>' % tuple(elastic.dirVec2(*maxNu[0])))
-    print('<td>Second axis</td></tr></table>')
-
-    print("<h2>Spatial dependence of Young's modulus</h2>")
-    print("""<form id="elastic" action="/wait3D" method="post" target="_blank">
+    outbuffer.print(('<tr><td>Anisotropy</td>' + 4 * '<td colspan="2">%s</td>' + '<td>Anisotropy</td></tr>') % (anisE, anisLC, anisG, anisNu))
+
+    outbuffer.print('<tr><td>Axis</td>')
+    outbuffer.print('<td>%.4f<br />%.4f<br />%.4f</td>' % tuple(elastic.dirVec(*minE[0])))
+    outbuffer.print('<td>%.4f<br />%.4f<br />%.4f</td>' % tuple(elastic.dirVec(*maxE[0])))
+    outbuffer.print('<td>%.4f<br />%.4f<br />%.4f</td>' % tuple(elastic.dirVec(*minLC[0])))
+    outbuffer.print('<td>%.4f<br />%.4f<br />%.4f</td>' % tuple(elastic.dirVec(*maxLC[0])))
+    outbuffer.print('<td>%.4f<br />%.4f<br />%.4f</td>' % tuple(elastic.dirVec1(*minG[0])))
+    outbuffer.print('<td>%.4f<br />%.4f<br />%.4f</td>' % tuple(elastic.dirVec1(*maxG[0])))
+    outbuffer.print('<td>%.4f<br />%.4f<br />%.4f</td>' % tuple(elastic.dirVec1(*minNu[0])))
+    outbuffer.print('<td>%.4f<br />%.4f<br />%.4f</td>' % tuple(elastic.dirVec1(*maxNu[0])))
+    outbuffer.print('<td>Axis</td></tr>')
+
+    outbuffer.print('<tr><td></td><td></td><td></td><td></td><td></td>')
+    outbuffer.print('<td>%.4f<br />%.4f<br />%.4f</td>' % tuple(elastic.dirVec2(*minG[0])))
+    outbuffer.print('<td>%.4f<br />%.4f<br />%.4f</td>' % tuple(elastic.dirVec2(*maxG[0])))
+    outbuffer.print('<td>%.4f<br />%.4f<br />%.4f</td>' % tuple(elastic.dirVec2(*minNu[0])))
+    outbuffer.print('<td>%.4f<br />%.4f<br />%.4f</td>' % tuple(elastic.dirVec2(*maxNu[0])))
+    outbuffer.print('<td>Second axis</td></tr></table>')
+    outbuffer.flush()
+
+    outbuffer.print("<h2>Spatial dependence of Young's modulus</h2>")
+    outbuffer.print("""<form id="elastic" action="/wait3D" method="post" target="_blank">
                 <textarea name="matrix" style="display: none;">%s</textarea>
                 <textarea name="sysname" style="display: none;">%s</textarea>
                 <textarea name="job" style="display: none;">%s</textarea>
                 <br /><input type="submit" style="font-size: 100%%; color: #b02020;" value="Visualize in 3D">
             </form>""" % (matrix, sysname, "young"))
     m = 1.2 * maxE[1]
-    makePolarPlot(lambda x: elas.Young([np.pi / 2, x]), m, "Young's modulus in (xy) plane", "xy")
-    makePolarPlot(lambda x: elas.Young([x, 0]), m, "Young's modulus in (xz) plane", "xz")
-    makePolarPlot(lambda x: elas.Young([x, np.pi / 2]), m, "Young's modulus in (yz) plane", "yz")
+    makePolarPlots3D(outbuffer, sym, 'young', m, "Young's modulus")
+    outbuffer.flush()
 
-    print("<h2>Spatial dependence of linear compressibility</h2>")
-    print("""<form id="elastic" action="/wait3D" method="post" target="_blank">
+    outbuffer.print("<h2>Spatial dependence of linear compressibility</h2>")
+    outbuffer.print("""<form id="elastic" action="/wait3D" method="post" target="_blank">
                 <textarea name="matrix" style="display: none;">%s</textarea>
                 <textarea name="sysname" style="display: none;">%s</textarea>
                 <textarea name="job" style="display: none;">%s</textarea>
                 <br /><input type="submit" style="font-size: 100%%; color: #b02020;" value="Visualize in 3D">
             </form>""" % (matrix, sysname, "lc"))
     m = 1.2 * max(maxLC[1], abs(minLC[1]))
-    makePolarPlotPosNeg(lambda x: elas.LC([np.pi / 2, x]), m, "linear compressibility in (xy) plane", "xy")
-    makePolarPlotPosNeg(lambda x: elas.LC([x, 0]), m, "linear compressibility in (xz) plane", "xz")
-    makePolarPlotPosNeg(lambda x: elas.LC([x, np.pi / 2]), m, "linear compressibility in (yz) plane", "yz")
+    makePolarPlots3D(outbuffer, sym, 'lc', m, "linear compressibility")
+    outbuffer.flush()
 
-    print("<h2>Spatial dependence of shear modulus</h2>")
-    print("""<form id="elastic" action="/wait3D" method="post" target="_blank">
+    outbuffer.print("<h2>Spatial dependence of shear modulus</h2>")
+    outbuffer.print("""<form id="elastic" action="/wait3D" method="post" target="_blank">
                 <textarea name="matrix" style="display: none;">%s</textarea>
                 <textarea name="sysname" style="display: none;">%s</textarea>
                 <textarea name="job" style="display: none;">%s</textarea>
                 <br /><input type="submit" style="font-size: 100%%; color: #b02020;" value="Visualize in 3D">
             </form>""" % (matrix, sysname, "shear"))
     m = 1.2 * maxG[1]
-    makePolarPlot2(lambda x: elas.shear2D([np.pi / 2, x]), m, "Shear modulus in (xy) plane", "xy")
-    makePolarPlot2(lambda x: elas.shear2D([x, 0]), m, "Shear modulus in (xz) plane", "xz")
-    makePolarPlot2(lambda x: elas.shear2D([x, np.pi / 2]), m, "Shear modulus in (yz) plane", "yz")
+    makePolarPlots3D(outbuffer, sym, 'shear', m, "Shear modulus")
+    outbuffer.flush()
 
-    print("<h2>Spatial dependence of Poisson's ratio</h2>")
-    print("""<form id="elastic" action="/wait3D" method="post" target="_blank">
+    outbuffer.print("<h2>Spatial dependence of Poisson's ratio</h2>")
+    outbuffer.print("""<form id="elastic" action="/wait3D" method="post" target="_blank">
                 <textarea name="matrix" style="display: none;">%s</textarea>
                 <textarea name="sysname" style="display: none;">%s</textarea>
                 <textarea name="job" style="display: none;">%s</textarea>
                 <br /><input type="submit" style="font-size: 100%%; color: #b02020;" value="Visualize in 3D">
             </form>""" % (matrix, sysname, "poisson"))
     m = 1.2 * max(abs(maxNu[1]), abs(minNu[1]))
-    makePolarPlot3(lambda x: elas.Poisson2D([np.pi / 2, x]), m, "Poisson's ratio in (xy) plane", "xy")
-    makePolarPlot3(lambda x: elas.Poisson2D([x, 0]), m, "Poisson's ratio in (xz) plane", "xz")
-    makePolarPlot3(lambda x: elas.Poisson2D([x, np.pi / 2]), m, "Poisson's ratio in (yz) plane", "yz")
+    makePolarPlots3D(outbuffer, sym, 'poisson', m, "Poisson's ratio")
 
-    print("</div>")
+    outbuffer.print("</div>")
     return finishWebPage(outbuffer)
 
 
-def wait3D(matrix, sysname, job):
-    """Display a waiting page while we calculate a 3D plot"""
+def wait3D(matrix, sysname, job, jobQueue=None, statusURL='/plot3D/status', resultURL='/plot3D/result'):
+    """
+    Display a waiting page while we calculate a 3D plot.
+
+    Without a job queue, the page submits the arguments to /plot3D, which computes the plot.
+    With a job queue (a jobs.JobQueue), the job is submitted to it, and the page polls
+    statusURL?id=<job ID> (which should return the JSON of jobQueue.status()) until the
+    job is done, then loads resultURL?id=<job ID> (which should return jobQueue.result()).
+    """
 
-    sys.stdout = outbuffer = StringIO()
+    outbuffer = HTMLRenderer()
     writeHeader(outbuffer, "Young 3D for " + removeHTMLTags(sysname))
 
-    print("""
+    outbuffer.print("""
     <div class="content">
     <img src="/loading.gif" alt="[loading]" />
     <p>Please wait while your 3D graph is loading… (it can take from 15 seconds up to a minute)</p>
     """)
 
+    if jobQueue is not None:
+        jid = jobQueue.submit(matrix, sysname, job)
+        outbuffer.print("""
+    <p id="status"></p>
+    <script type="text/javascript">
+        function poll() {
+            fetch("%s?id=%s").then(function (r) { return r.json(); }).then(function (s) {
+                if (s.status == "done") {
+                    window.location.replace("%s?id=%s");
+                } else if (s.status == "error" || s.status == "unknown") {
+                    document.getElementById("status").textContent = "Error: " + (s.error || "unknown job");
+                } else {
+                    document.getElementById("status").textContent = "Job " + s.status + " (" + s.elapsed.toFixed(0) + " seconds)";
+                    setTimeout(poll, 1000);
+                }
+            });
+        }
+        window.onload = function () { setTimeout(poll, 500); };
+    </script>""" % (statusURL, jid, resultURL, jid))
+        return finishWebPage(outbuffer)
+
     # Pass arguments
-    print("""
+    outbuffer.print("""
     <form id="elastic" action="/plot3D" method="post" style="display: none;">
         <textarea name="matrix">%s</textarea>
         <textarea name="sysname">%s</textarea>
@@ -929,7 +1203,7 @@ def wait3D(matrix, sysname, job):
     </form>""" % (matrix, sysname, job))
 
     # Reload immediately
-    print("""
+    outbuffer.print("""
     <script type="text/javascript">
         window.onload = function(){
         setTimeout(function () {
@@ -941,12 +1215,36 @@ def wait3D(matrix, sysname, job):
     return finishWebPage(outbuffer)
 
 
-def plot3D(matrix, sysname, job):
-    """Display a 3D plot"""
+@cache.cachedPage('plot3D', refresh=updateTiming)
+def plot3D(matrix, sysname, job, workers=1, output='html', adaptive=False, debug=False):
+    """
+    Display a 3D plot, using a pool of processes if workers > 1.
+    With output='json', 'npz' or 'mesh', only return the plot data (see plot3DData).
+    With adaptive=True, surfaces are sampled on an adaptive triangle mesh (see mesh3D).
+    With debug=True, the page is profiled, and ends with the results (see profiling).
+    """
+
+    if debug:
+        with profiling.profile('plot3D', debug=True):
+            return plot3D.__wrapped__(matrix, sysname, job, workers, output, adaptive)
+
+    if output != 'html':
+        return plot3DData(matrix, job, workers, output)
 
     # Dispatch to the specific function depending on type
-    functions = {'young': YOUNG3D, 'lc': LC3D, 'shear': SHEAR3D, 'poisson': POISSON3D}
-    return functions[job](matrix, sysname)
+    return plotFunctions[job](matrix, sysname, workers, adaptive=adaptive)
+
+
+def plot3D_stream(matrix, sysname, job, workers=1, adaptive=False, debug=False):
+    """Same as plot3D with HTML output, but as a generator of page fragments (see ELATE_stream)"""
+
+    def builder(outbuffer):
+        if debug:
+            with profiling.profile('plot3D', debug=True):
+                return plotFunctions[job](matrix, sysname, workers, outbuffer, adaptive)
+        return plotFunctions[job](matrix, sysname, workers, outbuffer, adaptive)
+
+    return streamPage(builder)
 
 
 # ELATE : basic usage of the tool, only 2D plots
@@ -957,101 +1255,125 @@ def plot3D(matrix, sysname, job):
 ################################################################################################
 
 
-def YOUNG3D(matrix, sysname):
+def YOUNG3D(matrix, sysname, workers=1, outbuffer=None, adaptive=False):
 
-    sys.stdout = outbuffer = StringIO()
+    if outbuffer is None:
+        outbuffer = HTMLRenderer()
     writeHeader(outbuffer, "Young 3D for " + removeHTMLTags(sysname))
 
     # Start timing
-    print('<script type="text/javascript">var startTime = %.12g</script>' % time.perf_counter())
-    print('<div class="content">')
-
-    print("<h1> 3D Visualization of Young's modulus </h1>")
-    elas = elastic.Elastic(matrix)
-    if elas.isOrthorhombic():
-        elas = elastic.ElasticOrtho(elas)
-        print('<script type="text/javascript">var isOrtho = 1;</script>')
-
-    make3DPlot(lambda x, y: elas.Young_2(x, y), "Young's modulus")
+    outbuffer.print('<script type="text/javascript">var startTime = %.12g</script>' % time.perf_counter())
+    outbuffer.print('<div class="content">')
+
+    outbuffer.print("<h1> 3D Visualization of Young's modulus </h1>")
+    outbuffer.flush()
+    with profiling.stage('parse'):
+        elas = elastic.specialize(elastic.Elastic(matrix))
+    if elas.specificCase:
+        outbuffer.print('<script type="text/javascript">var specificCase = "%s";</script>' % elas.specificCase)
+
+    if adaptive:
+        make3DMesh(outbuffer, elas, 'young', "Young's modulus")
+    else:
+        make3DPlot(outbuffer, elas.Young_array, "Young's modulus", workers=workers, ops=elas.symmetryOperations())
 
-    print('<h3>Input: stiffness matrix (coefficients in GPa) of %s</h3>' % (sysname))
-    print('<pre>')
+    outbuffer.print('<h3>Input: stiffness matrix (coefficients in GPa) of %s</h3>' % (sysname))
+    outbuffer.print('<pre>')
     for i in range(6):
-        print(("   " + 6 * "%7.5g  ") % tuple(elas.CVoigt[i]))
-    print('</pre></div>')
+        outbuffer.print(("   " + 6 * "%7.5g  ") % tuple(elas.CVoigt[i]))
+    outbuffer.print('</pre></div>')
     return finishWebPage(outbuffer)
 
 
-def LC3D(matrix, sysname):
+def LC3D(matrix, sysname, workers=1, outbuffer=None, adaptive=False):
 
-    sys.stdout = outbuffer = StringIO()
+    if outbuffer is None:
+        outbuffer = HTMLRenderer()
     writeHeader(outbuffer, "LC 3D for " + removeHTMLTags(sysname))
 
     # Start timing
-    print('<script type="text/javascript">var startTime = %.12g</script>' % time.perf_counter())
-    print('<div class="content">')
-
-    print("<h1> 3D Visualization of Linear compressiblity </h1>")
-    elas = elastic.Elastic(matrix)
-    if elas.isOrthorhombic():
-        elas = elastic.ElasticOrtho(elas)
-        print('<script type="text/javascript">var isOrtho = 1;</script>')
-
-    make3DPlotPosNeg(lambda x, y: elas.LC_2(x, y), "Linear compressiblity")
+    outbuffer.print('<script type="text/javascript">var startTime = %.12g</script>' % time.perf_counter())
+    outbuffer.print('<div class="content">')
+
+    outbuffer.print("<h1> 3D Visualization of Linear compressiblity </h1>")
+    outbuffer.flush()
+    with profiling.stage('parse'):
+        elas = elastic.specialize(elastic.Elastic(matrix))
+    if elas.specificCase:
+        outbuffer.print('<script type="text/javascript">var specificCase = "%s";</script>' % elas.specificCase)
+
+    if adaptive:
+        make3DMesh(outbuffer, elas, 'lc', "Linear compressiblity")
+    else:
+        make3DPlotPosNeg(outbuffer, elas.LC_array, "Linear compressiblity", workers=workers, ops=elas.symmetryOperations())
 
-    print('<h3>Input: stiffness matrix (coefficients in GPa) of %s</h3>' % (sysname))
-    print('<pre>')
+    outbuffer.print('<h3>Input: stiffness matrix (coefficients in GPa) of %s</h3>' % (sysname))
+    outbuffer.print('<pre>')
     for i in range(6):
-        print(("   " + 6 * "%7.5g  ") % tuple(elas.CVoigt[i]))
-    print('</pre></div>')
+        outbuffer.print(("   " + 6 * "%7.5g  ") % tuple(elas.CVoigt[i]))
+    outbuffer.print('</pre></div>')
     return finishWebPage(outbuffer)
 
 
-def SHEAR3D(matrix, sysname):
+def SHEAR3D(matrix, sysname, workers=1, outbuffer=None, adaptive=False):
 
-    sys.stdout = outbuffer = StringIO()
+    if outbuffer is None:
+        outbuffer = HTMLRenderer()
     writeHeader(outbuffer, "Shear 3D for " + removeHTMLTags(sysname))
 
     # Start timing
-    print('<script type="text/javascript">var startTime = %.12g</script>' % time.perf_counter())
-    print('<div class="content">')
-
-    print("<h1> 3D Visualization of Shear modulus </h1>")
-    elas = elastic.Elastic(matrix)
-    if elas.isOrthorhombic():
-        elas = elastic.ElasticOrtho(elas)
-        print('<script type="text/javascript">var isOrtho = 1;</script>')
-
-    make3DPlot2(lambda x, y, g1, g2: elas.shear3D(x, y, g1, g2), "Shear modulus")
+    outbuffer.print('<script type="text/javascript">var startTime = %.12g</script>' % time.perf_counter())
+    outbuffer.print('<div class="content">')
+
+    outbuffer.print("<h1> 3D Visualization of Shear modulus </h1>")
+    outbuffer.flush()
+    with profiling.stage('parse'):
+        elas = elastic.specialize(elastic.Elastic(matrix))
+    if elas.specificCase:
+        outbuffer.print('<script type="text/javascript">var specificCase = "%s";</script>' % elas.specificCase)
+
+    if adaptive:
+        make3DMesh(outbuffer, elas, 'shear', "Shear modulus")
+    else:
+        make3DPlot2(outbuffer, elas.shearChi, "Shear modulus", workers=workers, ops=elas.symmetryOperations())
 
-    print('<h3>Input: stiffness matrix (coefficients in GPa) of %s</h3>' % (sysname))
-    print('<pre>')
+    outbuffer.print('<h3>Input: stiffness matrix (coefficients in GPa) of %s</h3>' % (sysname))
+    outbuffer.print('<pre>')
     for i in range(6):
-        print(("   " + 6 * "%7.5g  ") % tuple(elas.CVoigt[i]))
-    print('</pre></div>')
+        outbuffer.print(("   " + 6 * "%7.5g  ") % tuple(elas.CVoigt[i]))
+    outbuffer.print('</pre></div>')
     return finishWebPage(outbuffer)
 
 
-def POISSON3D(matrix, sysname):
+def POISSON3D(matrix, sysname, workers=1, outbuffer=None, adaptive=False):
 
-    sys.stdout = outbuffer = StringIO()
+    if outbuffer is None:
+        outbuffer = HTMLRenderer()
     writeHeader(outbuffer, "Poisson 3D for " + removeHTMLTags(sysname))
 
     # Start timing
-    print('<script type="text/javascript">var startTime = %.12g</script>' % time.perf_counter())
-    print('<div class="content">')
-
-    print("<h1> 3D Visualization of Poisson's ratio </h1>")
-    elas = elastic.Elastic(matrix)
-    if elas.isOrthorhombic():
-        elas = elastic.ElasticOrtho(elas)
-        print('<script type="text/javascript">var isOrtho = 1;</script>')
-
-    make3DPlot3(lambda x, y, g1, g2: elas.Poisson3D(x, y, g1, g2), "Poisson's ratio")
+    outbuffer.print('<script type="text/javascript">var startTime = %.12g</script>' % time.perf_counter())
+    outbuffer.print('<div class="content">')
+
+    outbuffer.print("<h1> 3D Visualization of Poisson's ratio </h1>")
+    outbuffer.flush()
+    with profiling.stage('parse'):
+        elas = elastic.specialize(elastic.Elastic(matrix))
+    if elas.specificCase:
+        outbuffer.print('<script type="text/javascript">var specificCase = "%s";</script>' % elas.specificCase)
+
+    if adaptive:
+        make3DMesh(outbuffer, elas, 'poisson', "Poisson's ratio")
+    else:
+        make3DPlot3(outbuffer, elas.Poisson3D, "Poisson's ratio", workers=workers, ops=elas.symmetryOperations())
 
-    print('<h3>Input: stiffness matrix (coefficients in GPa) of %s</h3>' % (sysname))
-    print('<pre>')
+    outbuffer.print('<h3>Input: stiffness matrix (coefficients in GPa) of %s</h3>' % (sysname))
+    outbuffer.print('<pre>')
     for i in range(6):
-        print(("   " + 6 * "%7.5g  ") % tuple(elas.CVoigt[i]))
-    print('</pre></div>')
+        outbuffer.print(("   " + 6 * "%7.5g  ") % tuple(elas.CVoigt[i]))
+    outbuffer.print('</pre></div>')
     return finishWebPage(outbuffer)
+
+
+# Functions writing the 3D plot pages, for each job
+plotFunctions = {'young': YOUNG3D, 'lc': LC3D, 'shear': SHEAR3D, 'poisson': POISSON3D}
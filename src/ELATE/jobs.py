@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+
+"""
+Queue of 3D visualization jobs, computed in the background by a pool of processes.
+
+A job is submitted with submit(), which returns its ID immediately; the page can then
+poll status() until the job is done, and fetch the page with result(). Identical jobs
+(same tensor, system name, property and output) share the same ID, so a job which is
+queued or running is never computed twice.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from ELATE import cache, elastic, elate
+
+__author__ = "Romain Gaillac and François-Xavier Coudert"
+__version__ = "2025.08.26"
+__license__ = "MIT"
+
+
+def jobID(matrix, sysname, job, output='html'):
+    """Return the ID of a job: a hash of the tensor (if it is valid, or else of the matrix text) and parameters"""
+    try:
+        elas = elastic.Elastic(matrix)
+    except (TypeError, ValueError):
+        return hashlib.sha256(repr(('job', matrix, sysname, job, output)).encode('utf-8')).hexdigest()
+    return cache.tensorKey('job', elas, sysname, job, output)
+
+
+def needsRetry(future):
+    """Return whether a job must be submitted again: its result was fetched, or it failed or was cancelled"""
+    return future is None or future.cancelled() or (future.done() and future.exception() is not None)
+
+
+def resultSize(future):
+    """Return the size in bytes (or characters) of the result of a successful job, or 0"""
+    if future.cancelled() or future.exception() is not None:
+        return 0
+    value = future.result()
+    return len(value) if isinstance(value, (str, bytes)) else 0
+
+
+class JobQueue:
+    """
+    A queue of plot3D jobs, computed by at most workers processes at once.
+    Results are dropped once they have been fetched with result(), and only the status of the
+    job is kept (up to keep finished jobs). Results waiting to be fetched are kept up to a
+    total of maxbytes: beyond that, the oldest jobs are forgotten.
+    """
+
+    def __init__(self, workers=2, keep=100, maxbytes=256 * 2**20):
+        self.workers = workers
+        self.keep = keep
+        self.maxbytes = maxbytes
+        self._pool = None
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _submit(self, *args):
+        # Submit to the pool, replacing it if it is broken (e.g. a worker was killed)
+        for attempt in range(2):
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(self.workers)
+            try:
+                return self._pool.submit(elate.plot3D, *args)
+            except BrokenProcessPool:
+                self._pool.shutdown(wait=False)
+                self._pool = None
+                if attempt:
+                    raise
+
+    def _forget(self):
+        # Forget the oldest finished jobs, and the oldest results beyond maxbytes
+        finished = [k for k, v in self._jobs.items() if v['future'] is None or v['future'].done()]
+        for k in finished[:max(0, len(finished) - self.keep)]:
+            del self._jobs[k]
+
+        waiting = [(k, resultSize(v['future'])) for k, v in self._jobs.items()
+                   if v['future'] is not None and v['future'].done()]
+        total = sum(size for _, size in waiting)
+        for k, size in waiting:
+            if total <= self.maxbytes:
+                break
+            del self._jobs[k]
+            total -= size
+
+    def submit(self, matrix, sysname, job, output='html'):
+        """
+        Submit a job, unless an identical one is already queued, running or waiting to be
+        fetched, and return its ID. Jobs which failed or were cancelled are submitted again.
+        """
+
+        jid = jobID(matrix, sysname, job, output)
+        with self._lock:
+            entry = self._jobs.get(jid)
+            if entry is not None and not needsRetry(entry['future']):
+                self._jobs.move_to_end(jid)
+                return jid
+
+            self._jobs.pop(jid, None)
+            future = self._submit(matrix, sysname, job, 1, output)
+            self._jobs[jid] = {'future': future, 'job': job, 'submitted': time.time()}
+            self._forget()
+
+        return jid
+
+    def status(self, jid):
+        """
+        Return the status of a job as a dictionary, where 'status' is one of 'queued',
+        'running', 'done', 'error' or 'unknown'
+        """
+
+        with self._lock:
+            entry = self._jobs.get(jid)
+        if entry is None:
+            return {'id': jid, 'status': 'unknown'}
+
+        future = entry['future']
+        res = {'id': jid, 'job': entry['job'], 'elapsed': time.time() - entry['submitted']}
+        if future is None:
+            res['status'] = 'done'
+        elif not future.done():
+            res['status'] = 'running' if future.running() else 'queued'
+        elif future.cancelled() or future.exception() is not None:
+            res['status'] = 'error'
+            res['error'] = 'cancelled' if future.cancelled() else str(future.exception())
+        else:
+            res['status'] = 'done'
+        return res
+
+    def result(self, jid, timeout=None):
+        """
+        Return the result of a job, waiting for it at most timeout seconds. It is then dropped,
+        so None is returned for jobs already fetched (which can be submitted again), and unknown jobs.
+        """
+        with self._lock:
+            entry = self._jobs.get(jid)
+        if entry is None or entry['future'] is None:
+            return None
+        value = entry['future'].result(timeout)
+        with self._lock:
+            entry['future'] = None
+        return value
+
+    def shutdown(self, wait=True):
+        """Stop the pool of processes, cancelling the jobs which have not started"""
+        with self._lock:
+            for entry in self._jobs.values():
+                if entry['future'] is not None:
+                    entry['future'].cancel()
+            if self._pool is not None:
+                self._pool.shutdown(wait)
+                self._pool = None
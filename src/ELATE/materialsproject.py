@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+
+"""
+Access to the Materials Project API, through a persistent HTTP session (so that connections
+are reused), with a time-limited cache of the responses, in memory and optionally in an
+SQLite database. In offline mode, only the cache is used, which allows to replay recorded
+responses (for example in tests).
+"""
+
+import contextlib
+import itertools
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+import requests
+
+__author__ = "Romain Gaillac and François-Xavier Coudert"
+__version__ = "2025.08.26"
+__license__ = "MIT"
+
+
+# Materials Project URL
+urlBase = 'https://api.materialsproject.org'
+
+
+class OfflineError(Exception):
+    """Raised in offline mode, for a query which has no recorded response"""
+    pass
+
+
+class ResponseCache:
+    """
+    A cache of JSON responses, with a time to live in seconds, in memory (the maxentries most
+    recently used ones) and optionally in an SQLite file. Expired entries are deleted when they
+    are found, and when new responses are stored, unless they are asked for (see get).
+    """
+
+    def __init__(self, ttl=86400, path=None, maxentries=1000):
+        self.ttl = ttl
+        self.path = path
+        self.maxentries = maxentries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if path is not None:
+            with self._connect() as db:
+                db.execute('CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, time REAL, body TEXT)')
+
+    @contextlib.contextmanager
+    def _connect(self):
+        # One connection per call, as they cannot be shared between threads
+        db = sqlite3.connect(self.path, timeout=10)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def _store(self, key, entry):
+        # Insert in memory, evicting the least recently used entries
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxentries:
+            self._entries.popitem(last=False)
+
+    def get(self, key, expired=False):
+        """
+        Return the cached response for a key, or None. With expired=True (in offline mode), also
+        return stale entries; otherwise, they are deleted.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None and self.path is not None:
+            with self._connect() as db:
+                row = db.execute('SELECT time, body FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is not None:
+                entry = (row[0], json.loads(row[1]))
+                with self._lock:
+                    self._store(key, entry)
+        if entry is None:
+            return None
+        if not expired and time.time() - entry[0] > self.ttl:
+            with self._lock:
+                self._entries.pop(key, None)
+            if self.path is not None:
+                with self._connect() as db:
+                    db.execute('DELETE FROM responses WHERE key = ? AND time = ?', (key, entry[0]))
+            return None
+        return entry[1]
+
+    def put(self, key, value):
+        """Store a response, deleting the expired ones"""
+        entry = (time.time(), value)
+        with self._lock:
+            for k in [k for k, (t, _) in self._entries.items() if entry[0] - t > self.ttl]:
+                del self._entries[k]
+            self._store(key, entry)
+        if self.path is not None:
+            with self._connect() as db:
+                db.execute('DELETE FROM responses WHERE time < ?', (entry[0] - self.ttl,))
+                db.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?)', (key, entry[0], json.dumps(value)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.path is not None:
+            with self._connect() as db:
+                db.execute('DELETE FROM responses')
+
+
+class Client:
+    """
+    Client for the Materials Project API. Responses are cached (see ResponseCache), and
+    in offline mode they are only served from the cache, whatever their age.
+    """
+
+    def __init__(self, ttl=86400, path=None, offline=False, timeout=4, poolsize=10, url=None):
+        self.cache = ResponseCache(ttl, path)
+        self.offline = offline
+        self.timeout = timeout
+        self.url = urlBase if url is None else url
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=poolsize, pool_maxsize=poolsize)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    @staticmethod
+    def key(endpoint, params):
+        """Return the cache key of a query"""
+        return endpoint + '?' + urlencode(sorted(params.items()))
+
+    def get(self, endpoint, params, mapiKey, retries=0, backoff=1.0):
+        """
+        Return the JSON response for an endpoint (e.g. '/materials/summary/') and a dictionary
+        of query parameters. The API key is not part of the cache key, so that recorded
+        responses can be replayed without it. When the server is busy (status 429 or 5xx),
+        retry up to retries times, waiting exponentially longer each time.
+        """
+
+        key = self.key(endpoint, params)
+        resp = self.cache.get(key, expired=self.offline)
+        if resp is not None:
+            return resp
+        if self.offline:
+            raise OfflineError('no recorded response for ' + key)
+
+        for attempt in range(retries + 1):
+            r = self.session.get(self.url + endpoint, params=params, timeout=self.timeout,
+                                 headers={'X-API-KEY': mapiKey, 'accept': 'application/json'})
+            if r.status_code != 429 and r.status_code < 500:
+                break
+            if attempt < retries:
+                try:
+                    delay = float(r.headers.get('Retry-After'))
+                except (TypeError, ValueError):
+                    delay = backoff * 2**attempt
+                time.sleep(delay)
+        r.raise_for_status()
+
+        resp = r.json()
+        self.cache.put(key, resp)
+        return resp
+
+
+# Client used by queryMaterials and queryElasticity. It can be replaced, for example
+# by a client with an on-disk cache, or an offline client replaying recorded responses.
+default = Client()
+
+
+def paginate(endpoint, params, mapiKey, limit=1000, client=None, retries=5, backoff=1.0):
+    """Return the list of all documents for a query, following the _skip/_limit pagination"""
+
+    client = default if client is None else client
+    docs = []
+    while True:
+        resp = client.get(endpoint, dict(params, _skip=len(docs), _limit=limit), mapiKey, retries, backoff)
+        data = resp.get('data') or []
+        docs.extend(data)
+        if not data or len(docs) >= resp['meta']['total_doc']:
+            return docs
+
+
+def searchMaterials(query, mapiKey, limit=1000, client=None):
+    """
+    Return the list of all materials (as summary documents) for a formula or chemical system,
+    and not only the first page of results
+    """
+
+    params = {'chemsys' if '-' in query else 'formula': query, 'deprecated': 'false',
+              '_fields': 'has_props,material_id,formula_pretty'}
+    return paginate('/materials/summary/', params, mapiKey, limit, client)
+
+
+def _fetchBatch(client, ids, mapiKey, limit, retries, backoff):
+    params = {'material_ids': ','.join(ids), '_fields': 'elastic_tensor,material_id,formula_pretty'}
+    docs = paginate('/materials/elasticity/', params, mapiKey, limit, client, retries, backoff)
+    return [(d['material_id'], d['formula_pretty'], d['elastic_tensor']['ieee_format'])
+            for d in docs if d.get('elastic_tensor')]
+
+
+def fetchElasticity(ids, mapiKey, batchsize=100, workers=4, limit=1000, client=None, retries=5, backoff=1.0):
+    """
+    Fetch the elastic tensors of many materials, requesting them by batches of IDs, with a
+    bounded number of concurrent requests. This is a generator, which yields
+    (material_id, formula, tensor) tuples, batch by batch in the order of the input;
+    materials without elastic data are skipped. The tensors can be passed directly
+    to analysis.analyzeMany().
+    """
+
+    client = default if client is None else client
+    it = iter(ids)
+    batches = iter(lambda: list(itertools.islice(it, batchsize)), [])
+    with ThreadPoolExecutor(workers) as pool:
+        # Keep a bounded number of batches in flight, so that the input can be a long iterator
+        pending = deque()
+        for batch in batches:
+            pending.append(pool.submit(_fetchBatch, client, batch, mapiKey, limit, retries, backoff))
+            if len(pending) >= workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
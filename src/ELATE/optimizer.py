@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+"""
+Batched multi-start optimization of the shear modulus and Poisson's ratio.
+
+Both properties depend on a pair of orthonormal vectors (a, b), i.e. on an orientation
+in space. A seed grid of (theta, phi, chi) angles is evaluated in one vectorized call,
+and the best candidates are then polished together by Newton iterations on rotations
+of the (a, b) frame, using analytic gradients.
+"""
+
+import math
+
+import numpy as np
+
+from ELATE import symmetry
+from ELATE.elastic import dirAngles, dirVecArray, dirVec2Array
+
+__author__ = "Romain Gaillac and François-Xavier Coudert"
+__version__ = "2025.08.26"
+__license__ = "MIT"
+
+
+def shearGradient(S, a, b):
+    """Return the shear modulus and its gradients with respect to a and b, for arrays of vectors of shape (n, 3)"""
+    Sab = np.einsum('ijkl,nk,nl->nij', S, a, b)
+    w = np.einsum('nij,ni,nj->n', Sab, a, b)
+    dw = -1 / (4 * w * w)
+    return 1 / (4 * w), (2 * dw)[:, None] * np.einsum('nij,nj->ni', Sab, b), (2 * dw)[:, None] * np.einsum('nij,ni->nj', Sab, a)
+
+
+def PoissonGradient(S, a, b):
+    """Return Poisson's ratio and its gradients with respect to a and b, for arrays of vectors of shape (n, 3)"""
+    Saa = np.einsum('ijkl,ni,nj->nkl', S, a, a)
+    Sbb = np.einsum('ijkl,nk,nl->nij', S, b, b)
+    n = np.einsum('nij,ni,nj->n', Sbb, a, a)
+    q = np.einsum('nkl,nk,nl->n', Saa, a, a)
+    dn_a = 2 * np.einsum('nij,nj->ni', Sbb, a)
+    dn_b = 2 * np.einsum('nkl,nl->nk', Saa, b)
+    dq_a = 4 * np.einsum('nkl,nl->nk', Saa, a)
+    return -n / q, -(dn_a * q[:, None] - n[:, None] * dq_a) / (q * q)[:, None], -dn_b / q[:, None]
+
+
+def rotate(v, w):
+    """Rotate vectors v by rotation vectors w (Rodrigues formula), both arrays of shape (n, 3)"""
+    angle = np.linalg.norm(w, axis=1)[:, None]
+    k = w / np.where(angle > 0, angle, 1)
+    c, s = np.cos(angle), np.sin(angle)
+    return v * c + np.cross(k, v) * s + k * np.einsum('ni,ni->n', k, v)[:, None] * (1 - c)
+
+
+def frameAngles(a, b):
+    """Return the angles (theta, phi, chi) of an orthonormal pair of vectors"""
+    theta, phi = dirAngles(a)
+    # a and b can be flipped independently without changing the properties
+    u = [math.cos(theta) * math.cos(phi), math.cos(theta) * math.sin(phi), -math.sin(theta)]
+    v = [-math.sin(phi), math.cos(phi), 0.]
+    chi = math.atan2(np.dot(b, v), np.dot(b, u)) % math.pi
+    return (theta, phi, chi)
+
+
+def polishFrames(func, S, a, b, sign=1, tol=1e-8, maxiter=50):
+    """
+    Minimize sign * func over rotations of a batch of (a, b) frames, using Newton iterations.
+    func(S, a, b) returns the values and gradients with respect to a and b.
+    Returns the polished frames and their values.
+    """
+
+    def evaluate(a, b):
+        f, ga, gb = func(S, a, b)
+        return sign * f, sign * (np.cross(a, ga) + np.cross(b, gb))
+
+    h = 1e-5
+    f, g = evaluate(a, b)
+    for it in range(maxiter):
+        # Hessian with respect to rotations, by central differences of the analytic gradient
+        H = np.empty((len(a), 3, 3))
+        for k in range(3):
+            w = np.zeros_like(a)
+            w[:, k] = h
+            gp = evaluate(rotate(a, w), rotate(b, w))[1]
+            gm = evaluate(rotate(a, -w), rotate(b, -w))[1]
+            H[:, :, k] = (gp - gm) / (2 * h)
+        H = 0.5 * (H + H.transpose(0, 2, 1))
+
+        # Newton step, with the Hessian forced positive definite so that we go downhill
+        lam, V = np.linalg.eigh(H)
+        lam = np.maximum(np.abs(lam), 1e-8 * np.abs(lam).max(axis=1, keepdims=True) + 1e-300)
+        step = -np.einsum('nkl,nl,nml,nm->nk', V, 1 / lam, V, g)
+        norm = np.linalg.norm(step, axis=1)
+        step *= np.minimum(1, 0.5 / np.maximum(norm, 1e-300))[:, None]
+
+        # Backtracking: only accept steps that do not increase the function
+        for ls in range(20):
+            anew, bnew = rotate(a, step), rotate(b, step)
+            fnew, gnew = evaluate(anew, bnew)
+            ok = fnew <= f + 1e-14 * np.abs(f)
+            if ok.all():
+                break
+            step[~ok] *= 0.5
+        a = np.where(ok[:, None], anew, a)
+        b = np.where(ok[:, None], bnew, b)
+        f = np.where(ok, fnew, f)
+        g = np.where(ok[:, None], gnew, g)
+
+        if np.max(np.linalg.norm(step, axis=1) * ok) < tol:
+            break
+
+    return a, b, sign * f
+
+
+def extremum(elas, prop, sign=1, tol=1e-8, ngrid=16, nkeep=16):
+    """
+    Find the global minimum (sign=1) or maximum (sign=-1) of the shear modulus (prop='shear')
+    or Poisson's ratio (prop='Poisson') of an elastic tensor. Returns ((theta, phi, chi), value),
+    like elastic.minimize() and elastic.maximize().
+    """
+
+    func = {'shear': shearGradient, 'Poisson': PoissonGradient}[prop]
+    array = {'shear': elas.shear_array, 'Poisson': elas.Poisson_array}[prop]
+
+    # Seed grid, evaluated in one pass. Properties are centrosymmetric, and invariant
+    # under b -> -b, so all three angles span [0, pi]
+    u = np.linspace(0, np.pi, ngrid)
+    theta, phi, chi = (x.ravel() for x in np.meshgrid(u, u, u, indexing='ij'))
+    values = sign * array(theta, phi, chi)
+
+    # Map the best frames to the irreducible wedge of directions a, and only keep one of those
+    # which are images of each other: the seeds are then distinct, and fewer are needed.
+    # Frames have 4 images per rotation (with a -> -a and b -> -b), and the grid has a few
+    # duplicates, so enough candidates are taken to contain nkeep distinct frames.
+    ops = elas.symmetryOperations()
+    nkeep = max(4, -(-nkeep // len(ops)))
+    best = np.argsort(values)[:8 * len(ops) * nkeep]
+    a, g = symmetry.toWedge(ops, dirVecArray(theta[best], phi[best]))
+    b = np.einsum('nij,nj->ni', symmetry.LaueGroup(ops)[g], dirVec2Array(theta[best], phi[best], chi[best]))
+    b *= np.where(np.sum(b, axis=1) < 0, -1, 1)[:, None]
+    _, distinct = np.unique(np.round(np.hstack((a, b)), 9) + 0., axis=0, return_index=True)
+    distinct = np.sort(distinct)[:nkeep]
+
+    a, b = a[distinct], b[distinct]
+    a, b, f = polishFrames(func, elas.Smat, a, b, sign, tol)
+
+    i = np.argmin(sign * f)
+    return (frameAngles(a[i], b[i]), float(f[i]))
+
+
+def minimize(elas, prop, tol=1e-8):
+    """Find the global minimum of the shear modulus or Poisson's ratio"""
+    return extremum(elas, prop, 1, tol)
+
+
+def maximize(elas, prop, tol=1e-8):
+    """Find the global maximum of the shear modulus or Poisson's ratio"""
+    return extremum(elas, prop, -1, tol)
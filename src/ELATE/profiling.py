@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+
+"""
+Opt-in profiling of the computations and pages: wall time of each stage (parsing, averages,
+extrema, polar plots, 3D surfaces, serialization...) and number of calls to the methods
+evaluating the properties of the elastic classes.
+
+Profiling is enabled by the profile() context, for the code running in the same thread
+(or asyncio task). Outside of it, stages and counted methods only cost a context lookup.
+Work done in other processes (see evaluateGrid) is timed, and recorded as calls of the
+function evaluated on the grid, by chunks.
+
+    with profiling.profile('quartz') as p:
+        ELATE.ELATE(matrix, 'quartz')
+    print(p.asdict())
+
+Functions in the hooks list (e.g. an exporter of metrics) are called with the result of
+each profile, as returned by Profile.asdict(), when it ends.
+"""
+
+import contextlib
+import contextvars
+import functools
+import time
+
+import numpy as np
+
+__author__ = "Romain Gaillac and François-Xavier Coudert"
+__version__ = "2025.08.26"
+__license__ = "MIT"
+
+
+# Functions called with the result of each profile
+hooks = []
+
+# Methods of the elastic classes whose calls are counted, as evaluations of the properties (see counted)
+countedMethods = ['Young', 'Young_2', 'LC', 'LC_2', 'shear', 'Poisson', 'Young_array', 'LC_array',
+                  'shear_array', 'Poisson_array', 'shearChi', 'PoissonChi', 'shear2D', 'shear3D',
+                  'Poisson2D', 'Poisson3D', 'quarticForm', 'quadraticForm', 'dyadForm']
+
+_current = contextvars.ContextVar('profile', default=None)
+
+
+class Profile:
+    """
+    Results of a profile: stages as {name: [count, seconds]}, where nested stages are named
+    'outer/inner', method calls as {name: [calls, directions]}, and other counters (such as
+    cache hits and misses) as {name: count}
+    """
+
+    def __init__(self, name='', debug=False):
+        self.name = name
+        self.debug = debug
+        self.stages = {}
+        self.calls = {}
+        self.counters = {}
+        self.start = time.perf_counter()
+        self.total = None
+        self._path = []
+        self._depth = 0
+
+    def elapsed(self):
+        """Return the total wall time, up to now if the profile has not ended"""
+        return self.total if self.total is not None else time.perf_counter() - self.start
+
+    def asdict(self):
+        return {'name': self.name,
+                'total': self.elapsed(),
+                'stages': {k: {'count': c, 'time': t} for k, (c, t) in self.stages.items()},
+                'calls': {k: {'calls': c, 'evaluations': n} for k, (c, n) in self.calls.items()},
+                'counters': dict(self.counters)}
+
+    def html(self):
+        """Return a section of HTML page with the results"""
+        rows = ['<tr><td>%s</td><td>%d</td><td>%.2f ms</td></tr>' % (k.replace('/', ' / '), c, 1000 * t)
+                for k, (c, t) in self.stages.items()]
+        calls = ['<tr><td>%s</td><td>%d</td><td>%d</td></tr>' % (k, c, n) for k, (c, n) in sorted(self.calls.items())]
+        counters = ['<tr><td>%s</td><td>%d</td></tr>' % (k, n) for k, n in sorted(self.counters.items())]
+        return ('<div class="content debug"><h3>Profile (server time %.2f ms)</h3>' % (1000 * self.elapsed())
+                + '<table><tr><th>Stage</th><th>Count</th><th>Time</th></tr>' + ''.join(rows) + '</table>'
+                + '<table><tr><th>Method</th><th>Calls</th><th>Directions</th></tr>' + ''.join(calls) + '</table>'
+                + '<table><tr><th>Counter</th><th>Count</th></tr>' + ''.join(counters) + '</table></div>')
+
+
+def current():
+    """Return the active Profile, or None"""
+    return _current.get()
+
+
+@contextlib.contextmanager
+def profile(name='', debug=False, hook=None):
+    """
+    Context in which stages and method calls are recorded, yielding the Profile. With debug=True,
+    pages include its results in an HTML section. When it ends, hook (if given) and the functions
+    in hooks are called with its results. Profiles are not cumulative: only the innermost one records.
+    """
+
+    p = Profile(name, debug)
+    token = _current.set(p)
+    try:
+        yield p
+    finally:
+        p.total = time.perf_counter() - p.start
+        _current.reset(token)
+        res = p.asdict()
+        for h in hooks + ([hook] if hook is not None else []):
+            h(res)
+
+
+@contextlib.contextmanager
+def stage(name):
+    """Context timing a stage of the computation, in the active profile (if any)"""
+    p = _current.get()
+    if p is None:
+        yield
+        return
+
+    p._path.append(name)
+    key = '/'.join(p._path)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        p._path.pop()
+        s = p.stages.setdefault(key, [0, 0.])
+        s[0] += 1
+        s[1] += time.perf_counter() - start
+
+
+def count(name, n=1):
+    """Increment a counter of the active profile (if any)"""
+    p = _current.get()
+    if p is not None:
+        p.counters[name] = p.counters.get(name, 0) + n
+
+
+def evaluationPoints(name, args):
+    """Return the number of directions evaluated by a call to one of the countedMethods"""
+    if name in ('quarticForm', 'quadraticForm', 'dyadForm'):
+        return int(np.prod(np.broadcast(*(np.asarray(a)[..., 0] for a in args)).shape))
+    if len(args) == 1 and isinstance(args[0], (list, tuple)):
+        args = args[0]
+    return int(np.broadcast(*args).size)
+
+
+def called(name, directions, calls=1):
+    """Record calls to a method evaluating a number of directions, in the active profile (if any)"""
+    p = _current.get()
+    if p is not None:
+        c = p.calls.setdefault(name, [0, 0])
+        c[0] += calls
+        c[1] += directions
+
+
+def _wrap(name, func):
+    # Only the outermost calls are counted, so that a method implemented with another one is not counted twice
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        p = _current.get()
+        if p is None or p._depth:
+            return func(self, *args, **kwargs)
+        p._depth = 1
+        try:
+            res = func(self, *args, **kwargs)
+        finally:
+            p._depth = 0
+        # Only successful calls are counted, so that bad arguments raise their own exception
+        called(name, evaluationPoints(name, args))
+        return res
+    return wrapper
+
+
+def counted(cls):
+    """
+    Class decorator for the elastic classes: calls to the countedMethods it defines are recorded
+    in the active profile (if any). Outside of a profile, they only cost a context lookup.
+    """
+    for name in countedMethods:
+        if name in cls.__dict__:
+            setattr(cls, name, _wrap(name, cls.__dict__[name]))
+    return cls
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+"""
+Directional properties along arbitrary directions, without any HTML output.
+
+Directions are given as Cartesian vectors, in the frame of the elastic tensor, or as
+Miller indices [uvw] and (hkl) together with the lattice vectors of the crystal. All
+functions take batches of vectors, as arrays of shape (..., 3), and evaluate them in
+a single vectorized call.
+"""
+
+import numpy as np
+
+from ELATE import elastic, sampling
+
+__author__ = "Romain Gaillac and François-Xavier Coudert"
+__version__ = "2025.08.26"
+__license__ = "MIT"
+
+
+def normalize(v):
+    """Return the unit vectors along an array of vectors of shape (..., 3)"""
+    v = np.asarray(v, dtype=float)
+    if v.shape[-1:] != (3,):
+        raise ValueError("vectors should have three components")
+    norm = np.linalg.norm(v, axis=-1, keepdims=True)
+    if np.any(norm == 0):
+        raise ValueError("vectors should be nonzero")
+    return v / norm
+
+
+def latticeVectors(a, b, c, alpha=90, beta=90, gamma=90):
+    """
+    Return the lattice vectors (as the rows of a 3x3 array) for cell parameters in angstroms
+    and degrees, in the standard orientation: a along x, b in the xy plane. Lattice vectors
+    in another orientation (that of the elastic tensor) can be used directly as a 3x3 array.
+    """
+
+    alpha, beta, gamma = np.radians([alpha, beta, gamma])
+    cx = c * np.cos(beta)
+    cy = c * (np.cos(alpha) - np.cos(beta) * np.cos(gamma)) / np.sin(gamma)
+    return np.array([[a, 0, 0],
+                     [b * np.cos(gamma), b * np.sin(gamma), 0],
+                     [cx, cy, np.sqrt(c**2 - cx**2 - cy**2)]])
+
+
+def millerDirections(uvw, lattice):
+    """Return the unit vectors along the lattice directions [uvw], an array of shape (..., 3)"""
+    return normalize(np.asarray(uvw, dtype=float) @ np.asarray(lattice, dtype=float))
+
+
+def millerNormals(hkl, lattice):
+    """Return the unit normals to the lattice planes (hkl), an array of shape (..., 3)"""
+    # Reciprocal lattice vectors are the columns of the inverse of the lattice
+    return normalize(np.asarray(hkl, dtype=float) @ np.linalg.inv(np.asarray(lattice, dtype=float)).T)
+
+
+def planeDirections(normals, npoints=90):
+    """
+    Return npoints directions in [0, pi) in each of the planes with the given normals, as an array
+    of shape (..., npoints, 3), which can be passed to directionalProperties() to get sections
+    """
+
+    n = normalize(normals)
+    # A first direction in the plane, from the coordinate axis least aligned with the normal
+    e1 = normalize(np.cross(n, np.eye(3)[np.argmin(np.abs(n), axis=-1)]))
+    e2 = np.cross(n, e1)
+    u = np.linspace(0, np.pi, npoints, endpoint=False)[:, None]
+    return np.cos(u) * e1[..., None, :] + np.sin(u) * e2[..., None, :]
+
+
+def directionalProperties(elas, directions, perpendicular=None):
+    """
+    Return the properties of a 3D elastic tensor (an Elastic instance, or a matrix) along an
+    array of directions of shape (..., 3), as a dictionary of arrays of shape (...):
+    Young's modulus 'E' and linear compressibility 'LC', and for the shear modulus 'G' and
+    Poisson's ratio 'nu', dictionaries of their minimum and maximum over the perpendicular
+    directions, with these directions as 'minAxis2' and 'maxAxis2'.
+
+    If the perpendicular directions are given (an array which broadcasts with directions),
+    'G' and 'nu' are instead their values for these pairs of directions.
+    """
+
+    if not isinstance(elas, elastic.Elastic):
+        elas = elastic.Elastic(elas)
+    if elas.specificCase is None:
+        elas = elastic.specialize(elas)
+
+    a = normalize(directions)
+    shape = a.shape[:-1]
+    theta, phi = (x.reshape(shape) for x in sampling.directionAngles(a.reshape(-1, 3)))
+    res = {'directions': a, 'E': elas.Young_array(theta, phi), 'LC': elas.LC_array(theta, phi)}
+
+    if perpendicular is not None:
+        b = normalize(perpendicular)
+        if np.any(np.abs(np.sum(a * b, axis=-1)) > 1e-6):
+            raise ValueError("directions should be perpendicular")
+        # Angle chi of b in the basis of the plane perpendicular to a (see dirVec2Array)
+        chi = np.arctan2(np.sum(b * elastic.dirVec2Array(theta, phi, np.pi / 2), axis=-1),
+                         np.sum(b * elastic.dirVec2Array(theta, phi, 0), axis=-1))
+        res['G'] = elas.shear_array(theta, phi, chi)
+        res['nu'] = elas.Poisson_array(theta, phi, chi)
+        return res
+
+    for name, func in [('G', elas.shearChi), ('nu', elas.PoissonChi)]:
+        vmin, vmax, chimin, chimax = func(theta, phi)
+        res[name] = {'min': vmin, 'max': vmax,
+                     'minAxis2': elastic.dirVec2Array(theta, phi, chimin),
+                     'maxAxis2': elastic.dirVec2Array(theta, phi, chimax)}
+    return res
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+
+"""
+Adaptive sampling of directional properties over the sphere of directions.
+
+The sphere is first triangulated by a subdivided icosahedron (which, unlike a grid of
+angles, has no accumulation of points at the poles), and edges are then bisected only
+where the surface r(direction) deviates from its linear interpolation by more than a
+tolerance. The result is a triangle mesh, which Plotly renders as a mesh3d trace.
+"""
+
+import numpy as np
+
+__author__ = "Romain Gaillac and François-Xavier Coudert"
+__version__ = "2025.08.26"
+__license__ = "MIT"
+
+
+def icosahedron():
+    """Return the vertices (unit vectors) and triangles of a regular icosahedron"""
+    g = (1 + np.sqrt(5)) / 2
+    v = np.array([[-1, g, 0], [1, g, 0], [-1, -g, 0], [1, -g, 0],
+                  [0, -1, g], [0, 1, g], [0, -1, -g], [0, 1, -g],
+                  [g, 0, -1], [g, 0, 1], [-g, 0, -1], [-g, 0, 1]], dtype=float)
+    t = np.array([[0, 11, 5], [0, 5, 1], [0, 1, 7], [0, 7, 10], [0, 10, 11],
+                  [1, 5, 9], [5, 11, 4], [11, 10, 2], [10, 7, 6], [7, 1, 8],
+                  [3, 9, 4], [3, 4, 2], [3, 2, 6], [3, 6, 8], [3, 8, 9],
+                  [4, 9, 5], [2, 4, 11], [6, 2, 10], [8, 6, 7], [9, 8, 1]])
+    return v / np.linalg.norm(v, axis=1)[:, None], t
+
+
+def directionAngles(d):
+    """Return the angles (theta, phi) of an array of unit vectors of shape (n, 3)"""
+    return np.arccos(np.clip(d[:, 2], -1, 1)), np.arctan2(d[:, 1], d[:, 0]) % (2 * np.pi)
+
+
+def evaluate(func, d):
+    """Evaluate func(theta, phi) for an array of directions, as an array of shape (nsurfaces, n)"""
+    res = func(*directionAngles(d))
+    return np.array(res, dtype=float).reshape(-1, len(d))
+
+
+def edgeKeys(a, b):
+    """Return integer keys for the undirected edges between vertices a and b (arrays of indices)"""
+    return np.minimum(a, b) * 2**32 + np.maximum(a, b)
+
+
+def splitTriangles(vertices, triangles, keys, midpoints):
+    """
+    Split triangles by bisecting their edges which have a midpoint (given by sorted edge keys
+    and the corresponding vertex indices), starting from the longest one. Bisection only
+    depends on the edges, so neighbouring triangles remain conforming.
+    """
+
+    done = []
+    while len(triangles):
+        a = triangles
+        b = np.roll(triangles, -1, axis=1)
+        c = np.roll(triangles, -2, axis=1)
+        k = edgeKeys(a, b)
+        pos = np.minimum(np.searchsorted(keys, k), len(keys) - 1)
+        marked = keys[pos] == k
+        split = marked.any(axis=1)
+        done.append(triangles[~split])
+
+        # Bisect the longest marked edge (a, b) of each triangle, keeping the orientation
+        length = np.where(marked, np.sum((vertices[a] - vertices[b])**2, axis=2), -1)[split]
+        i = np.argmax(length, axis=1)
+        n = np.arange(len(i))
+        a, b, c, m = a[split][n, i], b[split][n, i], c[split][n, i], midpoints[pos[split][n, i]]
+        triangles = np.concatenate((np.stack((a, m, c), axis=1), np.stack((m, b, c), axis=1)))
+
+    return np.concatenate(done)
+
+
+def adaptiveMesh(func, tol=2e-3, maxlevel=8, start=2, minedge=0.02):
+    """
+    Sample func(theta, phi), which returns one or several surfaces (as a tuple of arrays),
+    on an adaptive triangulation of the sphere. The initial icosahedron is subdivided
+    uniformly start times, then each edge is bisected as long as the distance between the
+    surface at its midpoint and the middle of its chord exceeds tol times the largest value
+    (for any of the surfaces), at most maxlevel times. Edges shorter than minedge (in radians)
+    are not bisected, so that kinks in the surfaces (where no tolerance can be reached) do not
+    get refined indefinitely.
+
+    Returns the directions (array of shape (n, 3)), the values (array of shape (nsurfaces, n))
+    and the triangles (array of shape (m, 3) of vertex indices).
+    """
+
+    vertices, triangles = icosahedron()
+    values = evaluate(func, vertices)
+    converged = np.zeros(0, dtype=np.int64)
+
+    for level in range(start + maxlevel):
+        uniform = level < start
+
+        # Edges not yet known to be converged
+        a = triangles.ravel()
+        b = np.roll(triangles, -1, axis=1).ravel()
+        keys, first = np.unique(edgeKeys(a, b), return_index=True)
+        todo = ~np.isin(keys, converged)
+        keys, a, b = keys[todo], a[first][todo], b[first][todo]
+        if len(keys) == 0:
+            break
+
+        # Evaluate at the midpoints, and compare with the chords
+        mid = vertices[a] + vertices[b]
+        mid /= np.linalg.norm(mid, axis=1)[:, None]
+        midvalues = evaluate(func, mid)
+        if uniform:
+            marked = np.ones(len(keys), dtype=bool)
+        else:
+            scale = np.max(np.abs(values))
+            chord = 0.5 * (values[:, a, None] * vertices[a] + values[:, b, None] * vertices[b])
+            error = np.linalg.norm(midvalues[:, :, None] * mid - chord, axis=2).max(axis=0)
+            length = np.linalg.norm(vertices[a] - vertices[b], axis=1)
+            marked = (error > tol * scale) & (length > minedge)
+            converged = np.concatenate((converged, keys[~marked]))
+        if not marked.any():
+            break
+
+        n = len(vertices)
+        vertices = np.concatenate((vertices, mid[marked]))
+        values = np.concatenate((values, midvalues[:, marked]), axis=1)
+        triangles = splitTriangles(vertices, triangles, keys[marked], np.arange(n, n + marked.sum()))
+
+    return vertices, values, triangles
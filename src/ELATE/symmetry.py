@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+
+"""
+Symmetry of elastic tensors: detection of the rotations leaving a tensor invariant (among those
+of the cubic and hexagonal holohedries, in the standard orientation), Laue class, and reduction
+of the directions to evaluate to an irreducible wedge.
+
+Directional properties are centrosymmetric, so each rotation R comes with -R: the Laue group
+is generated by the rotations and the inversion.
+"""
+
+import functools
+import itertools
+
+import numpy as np
+
+__author__ = "Romain Gaillac and François-Xavier Coudert"
+__version__ = "2025.08.26"
+__license__ = "MIT"
+
+
+def rotationMatrix(axis, angle):
+    """Return the matrix of the rotation of a given angle around an axis"""
+    k = np.asarray(axis, dtype=float)
+    k = k / np.linalg.norm(k)
+    K = np.array([[0, -k[2], k[1]], [k[2], 0, -k[0]], [-k[1], k[0], 0]])
+    return np.eye(3) + np.sin(angle) * K + (1 - np.cos(angle)) * K @ K
+
+
+def cubicRotations():
+    """Return the proper rotations of the cubic point group O: signed permutation matrices of determinant 1"""
+    rot = []
+    for p in itertools.permutations(range(3)):
+        for s in itertools.product((1, -1), repeat=3):
+            R = np.zeros((3, 3))
+            R[range(3), p] = s
+            if np.linalg.det(R) > 0:
+                rot.append(R)
+    return np.array(rot)
+
+
+def hexagonalRotations():
+    """
+    Return the proper rotations of the hexagonal point group D6, with the 6-fold axis along z and
+    a 2-fold axis along x: rotations around z, and 2-fold axes in the xy plane
+    """
+    rot = []
+    for k in range(6):
+        rot.append(rotationMatrix([0, 0, 1], k * np.pi / 3))
+        rot.append(rotationMatrix([np.cos(k * np.pi / 6), np.sin(k * np.pi / 6), 0], np.pi))
+    return np.round(np.array(rot), 12) + 0.
+
+
+def candidateRotations():
+    """
+    Return the proper rotations of the cubic (O, 24 rotations) and hexagonal (D6, 12 rotations,
+    with the 6-fold axis along z and a 2-fold axis along x) point groups, without duplicates
+    """
+    rot = np.concatenate((cubicRotations(), hexagonalRotations()))
+    _, index = np.unique(rot.reshape(-1, 9), axis=0, return_index=True)
+    return rot[np.sort(index)]
+
+
+@functools.lru_cache(maxsize=1)
+def candidateGroups():
+    """
+    Return the subgroups of O and D6, as tuples of indices in candidateRotations(), from the
+    largest. All finite rotation groups are generated by two elements, so these are the
+    closures of the pairs of rotations of each group.
+    """
+
+    rot = candidateRotations()
+
+    def index(R):
+        return int(np.argmin(np.abs(rot - R).sum(axis=(1, 2))))
+
+    groups = set()
+    for family in (cubicRotations(), hexagonalRotations()):
+        family = [index(R) for R in family]
+        product = {(i, j): index(rot[i] @ rot[j]) for i in family for j in family}
+        for i, j in itertools.combinations_with_replacement(family, 2):
+            group = {i, j}
+            while True:
+                larger = group | {product[a, b] for a in group for b in group}
+                if larger == group:
+                    break
+                group = larger
+            groups.add(tuple(sorted(group)))
+    return sorted(groups, key=len, reverse=True)
+
+
+def rotateTensor(T, R):
+    """Return the rotated fourth-rank tensor R_ia R_jb R_kc R_ld T_abcd"""
+    return np.einsum('ia,jb,kc,ld,abcd->ijkl', R, R, R, R, T)
+
+
+# Default tolerance of symmetryOperations, relative to the norm of the tensor
+tolerance = 1e-2
+
+
+def symmetryOperations(T, tol=tolerance):
+    """
+    Return the largest group of candidate rotations (see candidateGroups) leaving a fourth-rank
+    tensor invariant, within tol relative to its norm, as an array of shape (n, 3, 3). Elastic
+    constants are usually given with a few significant digits, and relations between them (such
+    as c66 = (c11 - c12)/2 for hexagonal crystals) only hold to that precision: the tensor can then
+    be made exactly invariant with symmetrize().
+    """
+    rot = candidateRotations()
+    Trot = np.einsum('nia,njb,nkc,nld,abcd->nijkl', rot, rot, rot, rot, T)
+    diff = np.sqrt(np.sum((Trot - T)**2, axis=(1, 2, 3, 4))) / np.sqrt(np.sum(T**2))
+    # Among the groups of the same order, take the one closest to the tensor
+    group = max((g for g in candidateGroups() if diff[list(g)].max() <= tol),
+                key=lambda g: (len(g), -diff[list(g)].max()))
+    return rot[list(group)]
+
+
+def symmetrize(T, ops):
+    """Return the average of a fourth-rank tensor over a group of rotations, which leave it exactly invariant"""
+    return np.einsum('nia,njb,nkc,nld,abcd->ijkl', ops, ops, ops, ops, T) / len(ops)
+
+
+def rotationOrder(R):
+    """Return the order n of a rotation of angle 2 pi / n"""
+    angle = np.arccos(np.clip((np.trace(R) - 1) / 2, -1, 1))
+    return int(round(2 * np.pi / angle)) if angle > 1e-6 else 1
+
+
+def rotationAxis(R):
+    """Return the (unnormalized) axis of a rotation"""
+    w, v = np.linalg.eig(R)
+    return np.real(v[:, np.argmin(np.abs(w - 1))])
+
+
+# Crystal system of each Laue class
+crystalSystems = {'m-3m': 'cubic', '6/mmm': 'hexagonal', '4/mmm': 'tetragonal', '4/m': 'tetragonal',
+                  '-3m': 'trigonal', '-3': 'trigonal', 'mmm': 'orthorhombic', '2/m': 'monoclinic', '-1': 'triclinic'}
+
+
+def LaueClass(ops):
+    """
+    Return the Laue class of a set of symmetry operations (from symmetryOperations), as its
+    Hermann-Mauguin symbol. Cubic tensors always have m-3m symmetry, and hexagonal ones 6/mmm.
+    """
+
+    orders = [rotationOrder(R) for R in ops]
+    threefold = [rotationAxis(R) for R, n in zip(ops, orders) if n == 3]
+    # Cubic groups have four 3-fold axes, i.e. 8 rotations of order 3
+    if len(threefold) > 2:
+        return 'm-3m'
+    if 6 in orders:
+        return '6/mmm'
+    if 4 in orders:
+        return '4/mmm' if len(ops) == 8 else '4/m'
+    if threefold:
+        return '-3m' if len(ops) == 6 else '-3'
+    return {4: 'mmm', 2: '2/m'}.get(len(ops), '-1')
+
+
+def LaueGroup(ops):
+    """Return the operations of the Laue group, i.e. the rotations and their products with the inversion"""
+    return np.concatenate((ops, -ops))
+
+
+def inWedge(ops, d, tol=1e-9):
+    """
+    Return a boolean mask of the directions d (array of shape (n, 3)) which are in the irreducible
+    wedge of the Laue group: those which are lexicographically larger than all their images
+    """
+    diff = np.einsum('mij,nj->mni', LaueGroup(ops), d) - d
+    big = np.abs(diff) > tol
+    first = np.argmax(big, axis=2)
+    sign = np.take_along_axis(diff, first[:, :, None], axis=2)[:, :, 0]
+    return np.all(~big.any(axis=2) | (sign < 0), axis=0)
+
+
+def toWedge(ops, d, tol=1e-5):
+    """
+    Return the images of the directions d (array of shape (n, 3)) in the irreducible wedge, and
+    the indices in LaueGroup(ops) of the operations mapping them there. Coordinates are compared
+    to the precision tol, so that points on the boundaries of the wedge are mapped consistently.
+    """
+    images = np.einsum('mij,nj->mni', LaueGroup(ops), d)
+    # Lexicographic order, as an integer key
+    q = np.rint(images / tol).astype(np.int64)
+    w = 2 * int(round(1 / tol)) + 1
+    best = np.argmax((q[..., 0] * w + q[..., 1]) * w + q[..., 2], axis=0)
+    return images[best, np.arange(len(d))], best
+
+
+def gridOrbits(ops, u, v):
+    """
+    For the grid of directions given by the angles theta = u and phi = v (as in np.meshgrid with
+    indexing='ij'), return the indices of the grid points to evaluate, and the inverse indices to
+    reconstruct the whole (flattened) grid from them. Only the operations of the Laue group which
+    map the grid onto itself can be used.
+    """
+    return _gridOrbits(np.ascontiguousarray(ops, dtype=float).tobytes(), tuple(u), tuple(v))
+
+
+@functools.lru_cache(maxsize=32)
+def _gridOrbits(ops, u, v):
+    ops = np.frombuffer(ops).reshape(-1, 3, 3)
+    u, v = np.array(u), np.array(v)
+    index = np.arange(len(u) * len(v))
+    du, dv = u[1] - u[0], v[1] - v[0]
+    if not (np.allclose(np.diff(u), du) and np.allclose(np.diff(v), dv)):
+        return index, index
+
+    uu, vv = np.meshgrid(u, v, indexing='ij')
+    d = np.stack((np.sin(uu) * np.cos(vv), np.sin(uu) * np.sin(vv), np.cos(uu)), axis=-1).reshape(-1, 3)
+
+    def gridIndex(e):
+        # Index of the grid points e, or None if they are not all on the grid
+        iu = (np.arccos(np.clip(e[:, 2], -1, 1)) - u[0]) / du
+        iv = (np.arctan2(e[:, 1], e[:, 0]) % (2 * np.pi) - v[0]) / dv
+        # At the poles, phi is arbitrary
+        iv = np.where(np.hypot(e[:, 0], e[:, 1]) < 1e-9, 0, iv)
+        ru, rv = np.rint(iu), np.rint(iv)
+        if (np.max(np.abs(iu - ru)) > 1e-6 or np.max(np.abs(iv - rv)) > 1e-6
+                or ru.min() < 0 or ru.max() >= len(u) or rv.min() < 0 or rv.max() >= len(v)):
+            return None
+        return ru.astype(np.int64) * len(v) + rv.astype(np.int64)
+
+    rep = index
+    sample = np.linspace(0, len(d) - 1, 50).astype(int)
+    for R in LaueGroup(ops):
+        # Check on a few points first, as most operations do not map the grid onto itself
+        if gridIndex(d[sample] @ R.T) is None:
+            continue
+        image = gridIndex(d @ R.T)
+        if image is not None:
+            rep = np.minimum(rep, image)
+
+    return np.unique(rep, return_inverse=True)
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+
+def test_analyze_1():
+    import ELATE
+    from ELATE import refdata
+
+    res = ELATE.analyze(refdata.examples_3D['quartz'])
+    assert res['dimension'] == 3
+    assert res['stable']
+    assert set(res['averages']) == {'Voigt', 'Reuss', 'Hill'}
+    E = res['extrema']['E']
+    assert E['min'] <= E['max']
+    assert E['anisotropy'] == pytest.approx(E['max'] / E['min'])
+    assert np.linalg.norm(res['extrema']['G']['minAxis2']) == pytest.approx(1)
+
+    res = ELATE.analyze(refdata.examples_2D['phosphorene'])
+    assert res['dimension'] == 2
+    assert res['extrema']['nu']['min'] <= res['extrema']['nu']['max']
+
+    assert ELATE.analyze("1 2 3") == {'error': 'should have three or six rows'}
+
+
+def test_analyze_2():
+    import ELATE
+    from ELATE import refdata
+
+    matrices = list(refdata.examples_3D.values()) + list(refdata.examples_2D.values()) + [""]
+    res = list(ELATE.analyzeMany(matrices))
+    assert [i for i, r in res] == list(range(len(matrices)))
+    assert 'error' in res[-1][1]
+
+    # Same results with a pool of processes, in order or as completed
+    assert list(ELATE.analyzeMany(matrices, workers=2, chunksize=3)) == res
+    assert sorted(ELATE.analyzeMany(matrices, workers=2, chunksize=3, ordered=False), key=lambda x: x[0]) == res
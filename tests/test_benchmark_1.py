@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+
+def test_benchmark_1():
+    import ELATE
+    from ELATE import benchmark, elastic, refdata
+
+    tensors = {'quartz': refdata.examples_3D['quartz'], 'phosphorene': refdata.examples_2D['phosphorene']}
+    tensors.update(benchmark.triclinicExamples(1))
+    results = benchmark.run(tensors, repeat=1, only='s')
+    assert set(results) == {'quartz', 'phosphorene', 'triclinic-0'}
+    assert set(results['quartz']) == {'sections', 'plot3D-shear', 'plot3D-poisson'}
+    assert ELATE.Elastic(tensors['triclinic-0']).LaueClass() == '-1'
+
+    # Polar plot sections evaluate 61 angles in 3 planes, for 2 properties
+    assert results['quartz']['sections']['evaluations'] == 2 * 3 * 61
+    assert results['phosphorene']['sections']['evaluations'] == 3 * 180
+    assert results['quartz']['plot3D-shear']['bytes'] > 10**6
+
+    # Methods are restored after counting
+    young = elastic.ElasticHexagonal.Young_array
+    x = ELATE.specialize(ELATE.Elastic(refdata.examples_3D['ZnO']))
+    with benchmark.countEvaluations() as counts:
+        x.Young_array(np.zeros((4, 5)), 0)
+        x.shearChi(np.zeros(7), 0)
+        x.Young([0, 0])
+    assert counts == {'Young_array': [1, 20], 'shearChi': [1, 7], 'Young': [1, 1]}
+    assert elastic.ElasticHexagonal.Young_array is young
+
+    # Comparison to a baseline
+    baseline = benchmark.report({'quartz': {'sections': dict(results['quartz']['sections'], time=1e-6, evaluations=1)}})
+    regressions = benchmark.compare(results, baseline, mintime=0)
+    assert len(regressions) == 2 and all(r.startswith('quartz / sections: ') for r in regressions)
+    assert benchmark.compare(results, results) == []
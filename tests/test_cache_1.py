@@ -0,0 +1,75 @@
+import re
+
+import numpy as np
+import pytest
+
+
+def test_cache_1():
+    from ELATE import cache, elastic
+
+    # Different representations of the same tensor give the same key
+    full = [[10, 2, 2, 0, 0, 0], [2, 10, 2, 0, 0, 0], [2, 2, 10, 0, 0, 0], [0, 0, 0, 5, 0, 0], [0, 0, 0, 0, 5, 0], [0, 0, 0, 0, 0, 5]]
+    upper = [[10, 2, 2, 0, 0, 0], [10, 2, 0, 0, 0], [10, 0, 0, 0], [5, 0, 0], [5, 0], [5]]
+    text = '\n'.join('  '.join(map(str, row)) + '  ' for row in full)
+    keys = {cache.tensorKey('x', elastic.Elastic(m)) for m in (full, upper, text, str(full))}
+    assert len(keys) == 1
+    assert cache.tensorKey('x', elastic.Elastic(full), 1) != cache.tensorKey('x', elastic.Elastic(full), 2)
+
+
+def test_cache_2(tmp_path):
+    from ELATE import cache
+
+    # LRU eviction
+    c = cache.ResultCache(maxbytes=1000)
+    c.put('a', b'x' * 400)
+    c.put('b', b'x' * 400)
+    assert c.get('a') is not None
+    c.put('c', b'x' * 400)
+    assert c.get('b') is None
+    assert c.get('a') is not None and c.get('c') is not None
+    assert c.stats()['hits'] == 3 and c.stats()['misses'] == 1
+    assert c.stats()['bytes'] <= 1000
+
+    # Disk tier
+    c = cache.ResultCache(directory=str(tmp_path))
+    c.put('abc', {'E': 1.0})
+    c = cache.ResultCache(directory=str(tmp_path))
+    assert c.get('abc') == {'E': 1.0}
+    assert c.hits == 1
+
+
+def test_cache_3(monkeypatch):
+    import ELATE
+    from ELATE import cache, refdata
+
+    monkeypatch.setattr(cache, 'default', cache.ResultCache())
+    matrix = refdata.examples_3D['quartz']
+
+    # Pages are not cached by default, but the computed data is
+    page = ELATE.ELATE(matrix, 'quartz')
+    assert cache.default.misses == 1
+    ELATE.ELATE(matrix, 'quartz')
+    assert cache.default.hits == 1
+
+    monkeypatch.setattr(cache, 'pages', cache.ResultCache())
+    page = ELATE.ELATE(matrix, 'quartz')
+    assert cache.pages.misses == 1
+    cached = ELATE.ELATE(' ' + matrix + '\n', 'quartz')
+    assert cache.pages.misses == 1 and cache.pages.hits == 1
+    assert ELATE.ELATE(matrix, 'other') != page
+
+    # Cached pages show the execution time of the current request
+    def times(page):
+        return re.findall(r'var (?:start|end)Time = ([0-9.e+-]+)', page)
+    assert len(times(cached)) == 2 and times(cached) != times(page)
+    assert re.sub(r'(start|end)Time = [0-9.e+-]+', '', cached) == re.sub(r'(start|end)Time = [0-9.e+-]+', '', page)
+
+    data = ELATE.plot3D(matrix, 'quartz', 'young', output='json')
+    hits = cache.pages.hits
+    assert ELATE.plot3D(matrix, 'quartz', 'young', output='json', workers=2) == data
+    assert cache.pages.hits == hits + 1
+
+    # Disabled caches
+    monkeypatch.setattr(cache, 'default', None)
+    monkeypatch.setattr(cache, 'pages', None)
+    assert ELATE.plot3D(matrix, 'quartz', 'young', output='json') == data
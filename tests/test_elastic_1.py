@@ -0,0 +1,253 @@
+import numpy as np
+import pytest
+
+
+def test_array_1():
+    import ELATE
+    from ELATE import refdata
+
+    # Vectorized evaluation agrees with the scalar functions
+    theta, phi, chi = np.meshgrid(np.linspace(0, np.pi, 7), np.linspace(0, 2*np.pi, 9), np.linspace(0, np.pi, 5), indexing='ij')
+    for name in ['quartz', 'NSI']:
+        x = ELATE.Elastic(refdata.examples_3D[name])
+        E = x.Young_array(theta[..., 0], phi[..., 0])
+        assert E.shape == theta[..., 0].shape
+        assert E[3, 4] == pytest.approx(x.Young([theta[3, 4, 0], phi[3, 4, 0]]))
+        assert x.LC_array(theta[..., 0], phi[..., 0])[2, 5] == pytest.approx(x.LC([theta[2, 5, 0], phi[2, 5, 0]]))
+        G = x.shear_array(theta, phi, chi)
+        assert G[1, 2, 3] == pytest.approx(x.shear([theta[1, 2, 3], phi[1, 2, 3], chi[1, 2, 3]]))
+        nu = x.Poisson_array(theta, phi, chi)
+        assert nu[4, 7, 1] == pytest.approx(x.Poisson([theta[4, 7, 1], phi[4, 7, 1], chi[4, 7, 1]]))
+
+
+def test_smat_1():
+    import ELATE
+    from ELATE import refdata
+
+    # Smat is a 3x3x3x3 array with the full symmetries of the compliance tensor
+    x = ELATE.Elastic(refdata.examples_3D['NSI'])
+    assert x.Smat.shape == (3, 3, 3, 3)
+    assert np.allclose(x.Smat, x.Smat.transpose(1, 0, 2, 3))
+    assert np.allclose(x.Smat, x.Smat.transpose(2, 3, 0, 1))
+
+    # The precomputed forms agree with the full contraction
+    a = np.array([0.2, -0.5, 0.7])
+    a /= np.linalg.norm(a)
+    assert x.quarticForm(a) == pytest.approx(np.einsum('i,j,k,l,ijkl', a, a, a, a, x.Smat))
+    assert x.quadraticForm(a) == pytest.approx(np.einsum('i,j,ijkk', a, a, x.Smat))
+    assert x.quarticForm(np.array([a, a]))[1] == pytest.approx(x.quarticForm(list(a)))
+
+    # Orthorhombic coefficients
+    y = ELATE.ElasticOrtho(ELATE.Elastic(refdata.examples_3D['MIL-53']))
+    assert y.s11 == pytest.approx(y.SVoigt[0][0])
+    assert y.s44 == pytest.approx(y.SVoigt[3][3])
+    assert y.s23 == pytest.approx(y.SVoigt[1][2])
+
+
+def test_extrema_1():
+    import ELATE
+    from ELATE import elastic, refdata
+
+    # Analytic extrema agree with brute-force search
+    for name in refdata.examples_3D:
+        x = ELATE.Elastic(refdata.examples_3D[name])
+        minE, maxE = x.YoungExtrema()
+        assert minE[1] == pytest.approx(elastic.minimize(x.Young, 2)[1], rel=1e-5)
+        assert maxE[1] == pytest.approx(elastic.maximize(x.Young, 2)[1], rel=1e-5)
+        assert x.Young(minE[0]) == pytest.approx(minE[1])
+        minLC, maxLC = x.LCExtrema()
+        assert minLC[1] == pytest.approx(elastic.minimize(x.LC, 2)[1], rel=1e-5)
+        assert maxLC[1] == pytest.approx(elastic.maximize(x.LC, 2)[1], rel=1e-5)
+        assert x.LC(maxLC[0]) == pytest.approx(maxLC[1])
+
+
+def test_extrema_2():
+    import ELATE
+    from ELATE import elastic, optimizer, refdata
+
+    # Multi-start optimizer is at least as good as brute-force search
+    for name in ['quartz', 'MIL-53', 'NSI']:
+        x = ELATE.Elastic(refdata.examples_3D[name])
+        for prop in [x.shear, x.Poisson]:
+            res = optimizer.minimize(x, prop.__name__)
+            assert res[1] <= elastic.minimize(prop, 3)[1] + 1e-6
+            assert prop(res[0]) == pytest.approx(res[1])
+            res = optimizer.maximize(x, prop.__name__)
+            assert res[1] >= elastic.maximize(prop, 3)[1] - 1e-6
+            assert prop(res[0]) == pytest.approx(res[1])
+
+
+def test_chi_1():
+    import ELATE
+    from ELATE import refdata
+
+    # Closed-form extrema over chi agree with a fine scan
+    x = ELATE.Elastic(refdata.examples_3D['NSI'])
+    theta, phi = np.array([0.3, 1.2, 2.5]), np.array([0.1, 2.0, 4.0])
+    chi = np.linspace(0, np.pi, 2001)[:, None]
+    G = x.shear_array(theta, phi, chi)
+    nu = x.Poisson_array(theta, phi, chi)
+    Gmin, Gmax, cmin, cmax = x.shearChi(theta, phi)
+    assert np.allclose(Gmin, G.min(axis=0), rtol=1e-5)
+    assert np.allclose(Gmax, G.max(axis=0), rtol=1e-5)
+    assert np.allclose(x.shear_array(theta, phi, cmin), Gmin)
+    assert np.allclose(x.shear_array(theta, phi, cmax), Gmax)
+    numin, numax, cmin, cmax = x.PoissonChi(theta, phi)
+    assert np.allclose(numin, nu.min(axis=0), rtol=1e-5)
+    assert np.allclose(numax, nu.max(axis=0), rtol=1e-5)
+    assert np.allclose(x.Poisson_array(theta, phi, cmin), numin)
+    assert np.allclose(x.Poisson_array(theta, phi, cmax), numax)
+
+    # Scalar interface is kept
+    assert x.shear2D([0.3, 0.1])[0] == pytest.approx(Gmin[0])
+    assert x.Poisson2D([1.2, 2.0])[2] == pytest.approx(numax[1])
+
+
+def test_batch_1():
+    import ELATE
+    from ELATE import refdata
+
+    names = ['quartz', 'MIL-53', 'NSI']
+    mats = [refdata.examples_3D[name] for name in names]
+    batch = ELATE.ElasticBatch(mats + ['1 2 3\n4 5 6\n7 8 9', np.zeros((6, 6)).tolist()])
+    assert len(batch) == 5
+    assert list(batch.valid) == [True, True, True, False, False]
+    assert isinstance(batch.errors[3], TypeError)
+    assert batch.errors[4].args[0] == "matrix is singular"
+    with pytest.raises(ValueError):
+        batch[4]
+
+    # Same results as individual tensors
+    theta, phi, chi = np.array([0.3, 1.2, 2.5]), np.array([0.1, 2.0, 4.0]), np.array([0.5, 1.0, 3.0])
+    avg = batch.averages()
+    eig = batch.eigenvalues()
+    for i in range(3):
+        x = ELATE.Elastic(mats[i])
+        assert np.allclose(avg[i], x.averages())
+        assert np.allclose(eig[i], x.eigenvalues())
+        assert batch.isOrthorhombic()[i] == x.isOrthorhombic()
+        assert batch.isCubic()[i] == x.isCubic()
+        assert np.allclose(batch.Young_array(theta, phi)[i], x.Young_array(theta, phi))
+        assert np.allclose(batch.LC_array(theta, phi)[i], x.LC_array(theta, phi))
+        assert np.allclose(batch.shear_array(theta, phi, chi)[i], x.shear_array(theta, phi, chi))
+        assert np.allclose(batch.Poisson_array(theta, phi, chi)[i], x.Poisson_array(theta, phi, chi))
+    assert np.isnan(avg[3:]).all()
+    assert np.isnan(batch.Young_array(theta, phi)[3:]).all()
+
+    # Fast path for a stacked array
+    stack = np.array([ELATE.Elastic(m).CVoigt for m in mats])
+    assert np.allclose(ELATE.ElasticBatch(stack).averages(), avg[:3])
+
+
+def test_specialize_1():
+    import ELATE
+    from ELATE import elastic, refdata
+
+    hexagonal = ('200 80 60 0 0 0\n80 200 60 0 0 0\n60 60 180 0 0 0\n'
+                 '0 0 0 50 0 0\n0 0 0 0 50 0\n0 0 0 0 0 60')
+    expected = {'FAU': ELATE.ElasticCubic, 'quartz': ELATE.Elastic, 'MIL-53': ELATE.ElasticOrtho, 'ZnO': ELATE.ElasticHexagonal,
+                'TiO2': ELATE.ElasticTetragonal, 'NSI': ELATE.ElasticMonoclinic, 'hexagonal': ELATE.ElasticHexagonal}
+    theta, phi = np.meshgrid(np.linspace(0, np.pi, 11), np.linspace(0, 2*np.pi, 13), indexing='ij')
+    x = (0.3, 1.2, 2.1)
+    for name, cls in expected.items():
+        raw = ELATE.Elastic(hexagonal if name == 'hexagonal' else refdata.examples_3D[name])
+        y = ELATE.specialize(raw)
+        assert type(y) is cls
+        assert y.LaueClass() == raw.LaueClass()
+
+        # Tensors with a specific class are symmetrized to the precision of the input
+        generic = raw.symmetrized() if y.specificCase else raw
+        assert np.allclose(y.CVoigt, raw.CVoigt, atol=0.01)
+
+        # Specific formulas agree with the generic ones
+        assert np.allclose(y.Young_array(theta, phi), generic.Young_array(theta, phi))
+        assert np.allclose(y.LC_array(theta, phi), generic.LC_array(theta, phi))
+        for a, b in zip(y.shearChi(theta, phi)[:2] + y.PoissonChi(theta, phi)[:2],
+                        generic.shearChi(theta, phi)[:2] + generic.PoissonChi(theta, phi)[:2]):
+            assert np.allclose(a, b)
+        for f in ['Young', 'LC', 'shear', 'Poisson']:
+            assert getattr(y, f)(x) == pytest.approx(getattr(generic, f)(x))
+        for f in ['YoungExtrema', 'LCExtrema', 'shearExtrema', 'PoissonExtrema']:
+            (amin, vmin), (amax, vmax) = getattr(y, f)()
+            assert vmin == pytest.approx(getattr(generic, f)()[0][1])
+            assert vmax == pytest.approx(getattr(generic, f)()[1][1])
+
+    # Tensors without a 2-fold axis along x, y or z are left as they are
+    with pytest.raises(ValueError):
+        ELATE.ElasticMonoclinic(ELATE.Elastic('1 0 0 0 0 0.1\n0 2 0 0 0.1 0\n0 0 3 0.1 0 0\n0 0 0.1 4 0 0\n0 0.1 0 0 5 0\n0.1 0 0 0 0 6'))
+    assert elastic.specialize(ELATE.Elastic('10 1 1 0.5 0 0.2\n1 11 1 0 0.3 0\n1 1 12 0.1 0 0\n0.5 0 0.1 4 0 0\n0 0.3 0 0 5 0\n0.2 0 0 0 0 6')).specificCase is None
+
+
+def test_specialize_2(monkeypatch):
+    import ELATE
+    from ELATE import elastic, refdata
+
+    # Pages name the crystal system of the specific class
+    assert 'var specificCase = "hexagonal";' in ELATE.ELATE(refdata.examples_3D['ZnO'], 'ZnO')
+    assert 'var specificCase =' not in ELATE.ELATE(refdata.examples_3D['quartz'], 'quartz')
+
+    # Tensors whose properties disagree with the specific formulas are left as they are
+    monkeypatch.setattr(elastic.ElasticHexagonal, 'Young_array', lambda self, theta, phi: 0 * theta + 1)
+    raw = ELATE.Elastic(refdata.examples_3D['ZnO'])
+    assert elastic.specialize(raw) is raw
+
+
+def test_fallback_1(monkeypatch):
+    import ELATE
+    from ELATE import elastic, elate, refdata
+
+    # Count the calls to the generic forms, which the specialized classes should never need
+    calls = []
+    for name in ['quarticForm', 'quadraticForm', '_chiMatrix']:
+        def wrapper(self, *args, _name=name, _func=getattr(elastic.Elastic, name)):
+            calls.append((type(self).__name__, _name))
+            return _func(self, *args)
+        monkeypatch.setattr(elastic.Elastic, name, wrapper)
+
+    hexagonal = ('200 80 60 0 0 0\n80 200 60 0 0 0\n60 60 180 0 0 0\n'
+                 '0 0 0 50 0 0\n0 0 0 0 50 0\n0 0 0 0 0 60')
+    theta, phi = np.meshgrid(np.linspace(0, np.pi, 11), np.linspace(0, 2*np.pi, 13), indexing='ij')
+    for s in [refdata.examples_3D[n] for n in ['FAU', 'quartz', 'MIL-53', 'ZnO', 'TiO2', 'NSI']] + [hexagonal]:
+        elas = ELATE.specialize(ELATE.Elastic(s))
+        # Trigonal tensors (quartz) have no specific class
+        if elas.specificCase is None:
+            continue
+        # Only cubic tensors have a specific form of the shear modulus and Poisson's ratio
+        chi = not isinstance(elas, ELATE.ElasticCubic)
+        for job in ['young', 'lc', 'shear', 'poisson']:
+            del calls[:]
+            elate.surfaceValues(elas, job, theta, phi)
+            elas.Young_2(0.3, 1.2), elas.LC_2(0.3, 1.2)
+            assert [c for c in calls if not (chi and c[1] == '_chiMatrix')] == []
+
+
+def test_elastic2D_1():
+    import ELATE
+    from ELATE import refdata
+
+    x = ELATE.Elastic2D(refdata.examples_2D['Pd2O6Se2'])
+
+    # Directional properties agree with the contractions of the compliance tensor
+    S = x.SVoigt
+    T = np.array([[S[0, 0], S[0, 2] / 2, S[0, 2] / 2, S[0, 1]], [S[0, 2] / 2, S[2, 2] / 4, S[2, 2] / 4, S[1, 2] / 2],
+                  [S[0, 2] / 2, S[2, 2] / 4, S[2, 2] / 4, S[1, 2] / 2], [S[0, 1], S[1, 2] / 2, S[1, 2] / 2, S[1, 1]]])
+    T = T.reshape(2, 2, 2, 2)
+    u = np.linspace(0, np.pi, 1001)
+    a = np.stack((np.cos(u), np.sin(u)), axis=-1)
+    b = np.stack((-np.sin(u), np.cos(u)), axis=-1)
+    E = 1 / np.einsum('ijkl,ni,nj,nk,nl->n', T, a, a, a, a)
+    assert np.allclose(x.Young(u), E)
+    assert np.allclose(x.shear(u), 1 / (4 * np.einsum('ijkl,ni,nj,nk,nl->n', T, a, b, a, b)))
+    assert np.allclose(x.Poisson(u), -E * np.einsum('ijkl,ni,nj,nk,nl->n', T, a, a, b, b))
+    assert x.Young(0.3) == pytest.approx(1 / np.einsum('ijkl,i,j,k,l', T, *4 * [[np.cos(0.3), np.sin(0.3)]]))
+
+    # Extrema are at least as good as on a fine grid
+    for f in ['Young', 'shear', 'Poisson']:
+        (amin, vmin), (amax, vmax) = getattr(x, f + 'Extrema')()
+        v = getattr(x, f)(u)
+        assert vmin <= v.min() and vmax >= v.max()
+        assert vmin == pytest.approx(v.min(), rel=1e-5) and vmax == pytest.approx(v.max(), rel=1e-5)
+        assert getattr(x, f)(amin) == pytest.approx(vmin) and 0 <= amax < np.pi
+
+    # Isotropic materials have constant properties
+    assert ELATE.Elastic2D('100 30 0\n30 100 0\n0 0 35').YoungExtrema() == ((0, pytest.approx(91)), (0, pytest.approx(91)))
@@ -0,0 +1,146 @@
+import numpy as np
+import pytest
+
+
+def test_grid_1():
+    import ELATE
+    from ELATE import elate, refdata
+
+    # Grid evaluation does not depend on the number of workers
+    x = ELATE.Elastic(refdata.examples_3D['NSI'])
+    theta, phi = np.meshgrid(np.linspace(0, np.pi, 23), np.linspace(0, 2*np.pi, 45), indexing='ij')
+    r1 = elate.evaluateGrid(x.shearChi, theta, phi)
+    r2 = elate.evaluateGrid(x.shearChi, theta, phi, workers=2)
+    assert len(r1) == 4
+    for a, b in zip(r1, r2):
+        assert a.shape == theta.shape
+        assert np.array_equal(a, b)
+    assert np.array_equal(elate.evaluateGrid(x.Young_array, theta, phi), x.Young_array(theta, phi))
+
+
+def test_data_1():
+    import base64
+    import io
+    import json
+    import ELATE
+    from ELATE import refdata
+
+    # Data-only output of 3D plots
+    x = ELATE.Elastic(refdata.examples_3D['quartz'])
+    d = json.loads(ELATE.plot3D(refdata.examples_3D['quartz'], 'quartz', 'young', output='json'))
+    r = d['surfaces'][0]['r']
+    assert r['dtype'] == 'f4'
+    r = np.frombuffer(base64.b64decode(r['bdata']), dtype='<f4').reshape(200, 400)
+    theta = np.frombuffer(base64.b64decode(d['theta']['bdata']), dtype='<f4') * np.pi / 180
+    phi = np.frombuffer(base64.b64decode(d['phi']['bdata']), dtype='<f4') * np.pi / 180
+    assert r[57, 123] == pytest.approx(x.Young([theta[57], phi[123]]), rel=1e-6)
+
+    d = np.load(io.BytesIO(ELATE.plot3D(refdata.examples_3D['quartz'], 'quartz', 'shear', output='npz')))
+    assert d['G_min_r'].shape == (50, 99)
+    assert np.all(d['G_min_r'] <= d['G_max_r'])
+
+
+def test_labels_1():
+    import ELATE
+    from ELATE import elate, refdata
+
+    # Vectorized hover labels are identical to per-point string building
+    for name in ['quartz', 'NSI']:
+        x = ELATE.Elastic(refdata.examples_3D[name])
+        u = np.linspace(0, np.pi, 20)
+        v = np.linspace(0, 2*np.pi, 40)
+        uu, vv = np.meshgrid(u, v, indexing='ij')
+        for r, scale in [(x.Young_array(uu, vv), 10), (x.Poisson3D(uu, vv)[0], 100), (-x.LC_array(uu, vv), 10)]:
+            labels = elate.hoverLabels("'v = ", r, ", θ = ", u, v, scale)
+            for cu in range(len(u)):
+                for cv in range(len(v)):
+                    ref = ("'v = " + str(float(int(scale*r[cu, cv]))/scale) + ", θ = "
+                           + str(float(int(scale*u[cu]*180/np.pi))/scale) + "°, φ = "
+                           + str(float(int(scale*v[cv]*180/np.pi))/scale) + "°'")
+                    assert labels[cu][cv] == ref
+
+
+def test_threads_1(monkeypatch):
+    import sys
+    from concurrent.futures import ThreadPoolExecutor
+    import ELATE
+    from ELATE import cache, refdata
+
+    # Pages can be built concurrently, without touching sys.stdout
+    monkeypatch.setattr(cache, 'default', None)
+    stdout = sys.stdout
+    names = ['quartz', 'NSI', 'MIL-53', 'FAU']
+    with ThreadPoolExecutor(4) as pool:
+        pages = list(pool.map(lambda n: ELATE.ELATE(refdata.examples_3D[n], n), names))
+    assert sys.stdout is stdout
+    for name, page in zip(names, pages):
+        assert page.count('<html>') == 1 and page.count('</html>') == 1
+        assert 'Elastic analysis of ' + name in page
+
+
+def test_stream_1(monkeypatch):
+    import random
+    import re
+    import ELATE
+    from ELATE import cache, refdata
+
+    def clean(page):
+        return re.sub(r'Time = [0-9.e+-]+', '', page)
+
+    # Streamed pages are identical to the full pages, in several fragments
+    monkeypatch.setattr(cache, 'default', None)
+    for matrix, job in [(refdata.examples_3D['quartz'], 'shear'), (refdata.examples_2D['phosphorene'], None)]:
+        random.seed(0)
+        parts = list(ELATE.ELATE_stream(matrix, 'x') if job is None else ELATE.plot3D_stream(matrix, 'x', job))
+        random.seed(0)
+        page = ELATE.ELATE(matrix, 'x') if job is None else ELATE.plot3D(matrix, 'x', job)
+        assert len(parts) > 1
+        assert clean(''.join(parts)) == clean(page)
+
+    # Invalid input is reported in the page, and errors raised in the builder are re-raised
+    assert 'Invalid stiffness matrix' in ''.join(ELATE.ELATE_stream('1 2 3', 'x'))
+    with pytest.raises(ValueError):
+        list(ELATE.plot3D_stream('1 2 3', 'x', 'young'))
+
+
+def test_mesh_1():
+    import json
+    import ELATE
+    from ELATE import refdata
+
+    matrix = refdata.examples_3D['quartz']
+    for job in ['young', 'lc', 'shear', 'poisson']:
+        page = ELATE.plot3D(matrix, 'quartz', job, adaptive=True)
+        assert "type: 'mesh3d'" in page and 'var meshI' in page
+        assert len(page) < len(ELATE.plot3D(matrix, 'quartz', job)) * 1.5
+
+        data = json.loads(ELATE.plot3D(matrix, 'quartz', job, output='mesh'))
+        n = int(data['theta']['shape'])
+        assert max(data['i'] + data['j'] + data['k']) == n - 1
+        assert all(int(s['r']['shape']) == n for s in data['surfaces'])
+
+
+def test_polar_1():
+    import ELATE
+    from ELATE import elate, refdata
+
+    elas = ELATE.specialize(ELATE.Elastic(refdata.examples_3D['quartz']))
+    u = np.linspace(0, np.pi, 61)
+
+    # Sections agree with the properties in each plane, and a normal along z gives the same curve as xy,
+    # up to the origin of angles
+    young = elate.planeSections(elas, 'young', u, planes=('xy', 'xz', 'yz', [0, 0, 2]))
+    assert np.allclose(young[0][0], elas.Young_array(np.pi / 2, u))
+    assert np.allclose(young[2][0], elas.Young_array(u, np.pi / 2))
+    assert np.allclose(np.sort(young[3][0][:-1]), np.sort(young[0][0][:-1]))
+    shear = elate.planeSections(elas, 'shear', u)
+    assert all(np.allclose(a, b) for a, b in zip(shear[1], elas.shear2D([u, 0])))
+    poisson = elate.planeSections(elas, 'poisson', u, planes=['yz'])
+    assert all(np.allclose(a, b) for a, b in zip(poisson[0], elas.Poisson2D([u, np.pi / 2])))
+
+    # Data are formatted as with %-format strings
+    out = elate.HTMLRenderer()
+    x, y = np.array([0.5, -0.0, 1e-7]), np.array([1.234567, 2, -3])
+    elate.writePolarPlotData(out, x, y, "1")
+    assert out.getvalue() == ("var dataX1 = [\n" + (3 * "%.5f,") % tuple(x) + "\n" + "%.5f,%.5f,%.5f" % tuple(-x) + "\n];\n"
+                              + "var dataY1 = [\n" + (3 * "%.5f,") % tuple(y) + "\n" + "%.5f,%.5f,%.5f" % tuple(-y) + "\n];\n")
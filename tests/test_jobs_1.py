@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+
+def test_jobs_1():
+    import ELATE
+    from ELATE import jobs, refdata
+
+    queue = jobs.JobQueue(workers=2)
+    try:
+        matrix = refdata.examples_3D['quartz']
+        jid = queue.submit(matrix, 'quartz', 'young', 'json')
+        # Identical jobs are de-duplicated, whatever the formatting of the matrix
+        assert queue.submit(' ' + matrix + '\n', 'quartz', 'young', 'json') == jid
+        assert queue.submit(matrix, 'quartz', 'lc', 'json') != jid
+        assert queue.status(jid)['status'] in ('queued', 'running', 'done')
+        assert queue.status('nope')['status'] == 'unknown'
+
+        assert queue.result(jid, timeout=60) == ELATE.plot3D(matrix, 'quartz', 'young', output='json')
+        assert queue.status(jid)['status'] == 'done'
+
+        # Invalid input is reported as an error
+        jid = queue.submit('1 2 3', 'bad', 'young')
+        with pytest.raises(ValueError):
+            queue.result(jid, timeout=60)
+        assert queue.status(jid)['status'] == 'error'
+
+        # Waiting page polls for the job
+        page = ELATE.wait3D(matrix, 'quartz', 'young', queue)
+        assert jobs.jobID(matrix, 'quartz', 'young') in page
+    finally:
+        queue.shutdown()
+
+
+def test_retry_1():
+    from ELATE import jobs, refdata
+
+    queue = jobs.JobQueue(workers=1, maxbytes=1)
+    try:
+        matrix = refdata.examples_3D['quartz']
+        # Results are dropped once fetched, or beyond maxbytes
+        jid = queue.submit(matrix, 'quartz', 'young', 'json')
+        assert queue.result(jid, timeout=60) is not None
+        assert queue.result(jid) is None and queue.status(jid)['status'] == 'done'
+        assert queue.submit(matrix, 'quartz', 'young', 'json') == jid
+        queue._jobs[jid]['future'].result(timeout=60)
+        queue.submit(matrix, 'quartz', 'lc', 'json')
+        assert queue.status(jid)['status'] == 'unknown'
+
+        # After a worker is killed, failed jobs are submitted again to a new pool
+        jid = queue.submit(matrix, 'quartz', 'shear', 'json')
+        for p in list(queue._pool._processes.values()):
+            p.kill()
+        with pytest.raises(jobs.BrokenProcessPool):
+            queue.result(jid, timeout=60)
+        assert queue.status(jid)['status'] == 'error'
+        assert queue.submit(matrix, 'quartz', 'shear', 'json') == jid
+        assert queue.result(jid, timeout=60) is not None
+    finally:
+        queue.shutdown()
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+
+def test_materialsproject_1(tmp_path, monkeypatch):
+    import ELATE
+    from ELATE import materialsproject, refdata
+
+    # Record responses in an SQLite file, then replay them offline
+    path = str(tmp_path / 'mp.sqlite')
+    tensor = [list(map(float, line.split())) for line in refdata.examples_3D['quartz'].strip().split('\n')]
+    record = materialsproject.Client(path=path)
+    params = {'material_ids': 'mp-7000', '_fields': 'elastic_tensor,material_id,formula_pretty'}
+    record.cache.put(record.key('/materials/elasticity/', params),
+                     {'meta': {'total_doc': 1}, 'data': [{'material_id': 'mp-7000', 'formula_pretty': 'SiO2',
+                                                          'elastic_tensor': {'ieee_format': tensor}}]})
+
+    client = materialsproject.Client(path=path, offline=True, ttl=0)
+    monkeypatch.setattr(materialsproject, 'default', client)
+    r = ELATE.elate.queryElasticity('mp-7000', '')
+    assert r['formula_pretty'] == 'SiO2'
+    assert 'Materials Project id' in ELATE.ELATE_MaterialsProject('mp-7000', '')
+
+    # Unknown queries fail without network access
+    with pytest.raises(materialsproject.OfflineError):
+        client.get('/materials/elasticity/', {'material_ids': 'mp-1'}, '')
+    assert ELATE.elate.queryElasticity('mp-1', '') is None
+
+
+class FakeResponse:
+    def __init__(self, status, data=None, total=0):
+        self.status_code = status
+        self.ok = status < 400
+        self.headers = {'Retry-After': '0'}
+        self._json = {'meta': {'total_doc': total}, 'data': data or []}
+
+    def json(self):
+        return self._json
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise RuntimeError(self.status_code)
+
+
+class FakeSession:
+    """Elasticity endpoint with 250 materials, where each query is first rate-limited"""
+
+    def __init__(self):
+        self.seen = set()
+
+    def get(self, url, params, timeout, headers):
+        key = tuple(sorted(params.items()))
+        if key not in self.seen:
+            self.seen.add(key)
+            return FakeResponse(429)
+        ids = [i for i in params['material_ids'].split(',') if int(i[3:]) < 250]
+        page = ids[params['_skip']:params['_skip'] + params['_limit']]
+        data = [{'material_id': i, 'formula_pretty': 'X', 'elastic_tensor': {'ieee_format': [[int(i[3:])]]}} for i in page]
+        return FakeResponse(200, data, len(ids))
+
+
+def test_materialsproject_2():
+    from ELATE import materialsproject
+
+    client = materialsproject.Client()
+    client.session = FakeSession()
+    ids = ['mp-%d' % i for i in range(300)]
+    res = list(materialsproject.fetchElasticity(ids, '', batchsize=40, workers=3, limit=15, client=client, backoff=0))
+    assert [r[0] for r in res] == ids[:250]
+    assert all(r[2] == [[i]] for i, r in enumerate(res))
+
+
+def test_responsecache_1(tmp_path):
+    from ELATE import materialsproject
+
+    # The memory tier is bounded, and the least recently used entries are evicted
+    c = materialsproject.ResponseCache(maxentries=3)
+    for i in range(4):
+        c.put(str(i), i)
+        c.get('0')
+    assert list(c._entries) == ['2', '3', '0']
+
+    # Expired entries are deleted, unless they are asked for
+    path = str(tmp_path / 'mp.sqlite')
+    c = materialsproject.ResponseCache(ttl=-1, path=path)
+    c.put('a', 1)
+    assert c.get('a', expired=True) == 1
+    assert c.get('a') is None and len(c._entries) == 0
+    assert materialsproject.ResponseCache(path=path).get('a', expired=True) is None
+    c.put('b', 2)
+    c.put('c', 3)
+    assert list(c._entries) == ['c']
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+
+def test_profiling_1(monkeypatch):
+    import ELATE
+    from ELATE import cache, elastic, elate, profiling, refdata
+
+    cache.default.clear()
+    young = elastic.Elastic.Young_array
+    results = []
+    with profiling.profile('quartz', hook=results.append) as p:
+        page = elate.ELATE(refdata.examples_3D['quartz'], 'quartz', bruteForce=True)
+        elate.plot3D(refdata.examples_3D['quartz'], 'quartz', 'young')
+        assert elastic.Elastic.Young_array is young
+    assert profiling.current() is None
+
+    # Stages of the page and of the 3D plot
+    for stage in ['parse', 'specialize', 'averages', 'eigenvalues', 'extrema', 'extrema/E', 'extrema/nu',
+                  'polar-young', 'polar-poisson', 'surface', 'serialization']:
+        assert stage in p.stages
+    assert p.stages['parse'][0] == 2
+    assert p.stages['extrema/E'][1] <= p.stages['extrema'][1] <= p.total
+    assert p.calls['Young_array'][1] >= 3 * 90
+    assert p.counters['cache.miss.extrema3D'] == 1
+
+    # Results are passed to the hook, and not added to the page unless asked for
+    assert len(results) == 1 and results[0]['stages']['parse']['count'] == 2
+    assert results[0]['calls'] == {k: {'calls': c, 'evaluations': n} for k, (c, n) in p.calls.items()}
+    assert 'content debug' not in page
+
+    # Debug pages are never cached
+    monkeypatch.setattr(cache, 'pages', cache.ResultCache())
+    for i in range(2):
+        page = elate.ELATE(refdata.examples_3D['quartz'], 'quartz', debug=True)
+        assert page.count('<div class="content debug">') == 1 and 'polar-shear' in page
+    page = elate.ELATE(refdata.examples_2D['phosphorene'], 'phosphorene', debug=True)
+    assert 'extrema / nu' in page
+    assert 'content debug' in ''.join(elate.plot3D_stream(refdata.examples_3D['quartz'], 'quartz', 'lc', debug=True))
+
+
+def test_stage_1():
+    from ELATE import profiling
+
+    # Outside of a profile, stages and counters do nothing
+    with profiling.stage('a'):
+        profiling.count('x')
+
+    with profiling.profile() as p:
+        for i in range(3):
+            with profiling.stage('a'):
+                with profiling.stage('b'):
+                    profiling.count('x', 2)
+        with pytest.raises(ValueError):
+            with profiling.stage('c'):
+                raise ValueError
+    assert {k: c for k, (c, t) in p.stages.items()} == {'a/b': 3, 'a': 3, 'c': 1}
+    assert p.counters == {'x': 6}
+    assert p.asdict()['total'] == p.total
+
+
+def test_workers_1():
+    from ELATE import elastic, elate, profiling, refdata
+
+    # Evaluations in worker processes are recorded by chunks
+    x = elastic.Elastic(refdata.examples_3D['quartz'])
+    uu, vv = np.meshgrid(np.linspace(0, np.pi, 25), np.linspace(0, 2 * np.pi, 8), indexing='ij')
+    with profiling.profile() as p:
+        elate.evaluateGrid(x.Young_array, uu, vv, workers=2)
+    assert p.calls == {'Young_array': [3, 200]}
+
+
+def test_errors_1():
+    import ELATE
+    from ELATE import profiling, refdata
+
+    # Errors in counted methods propagate unchanged, and the calls are not counted
+    x = ELATE.Elastic(refdata.examples_3D['quartz'])
+    with profiling.profile() as p:
+        with pytest.raises(ValueError, match='broadcast'):
+            x.Young_array(np.zeros(3), np.zeros(4))
+        with pytest.raises(TypeError):
+            x.Young(None)
+        x.Young_array(np.zeros(3), 0)
+    assert p.calls == {'Young_array': [1, 3]}
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+
+def test_query_1():
+    import ELATE
+    from ELATE import refdata
+
+    x = ELATE.Elastic(refdata.examples_3D['quartz'])
+    rng = np.random.default_rng(0)
+    d = rng.normal(size=(5, 40, 3))
+    res = ELATE.directionalProperties(x, d)
+    a = res['directions']
+    assert np.allclose(np.linalg.norm(a, axis=-1), 1)
+    assert res['E'].shape == res['G']['min'].shape == (5, 40)
+
+    # Same values as the scalar functions, in terms of angles
+    theta, phi = np.arccos(a[1, 2, 2]), np.arctan2(a[1, 2, 1], a[1, 2, 0])
+    assert res['E'][1, 2] == pytest.approx(x.Young([theta, phi]))
+    assert res['LC'][1, 2] == pytest.approx(x.LC([theta, phi]))
+    assert res['nu']['max'][1, 2] == pytest.approx(x.Poisson3D(theta, phi)[2])
+
+    # Extrema over the perpendicular directions are reached for the returned directions
+    b = res['G']['minAxis2']
+    assert np.allclose(np.sum(a * b, axis=-1), 0)
+    assert np.allclose(ELATE.directionalProperties(x, d, b)['G'], res['G']['min'])
+    assert np.allclose(ELATE.directionalProperties(x, d, res['nu']['maxAxis2'])['nu'], res['nu']['max'])
+    with pytest.raises(ValueError):
+        ELATE.directionalProperties(x, [1, 0, 0], [1, 1, 0])
+
+
+def test_miller_1():
+    from ELATE import query
+
+    lattice = query.latticeVectors(4, 5, 6, 80, 95, 110)
+    assert np.allclose(np.linalg.norm(lattice, axis=1), [4, 5, 6])
+    angle = lambda u, v: np.degrees(np.arccos(np.dot(u, v) / np.linalg.norm(u) / np.linalg.norm(v)))
+    assert [angle(lattice[1], lattice[2]), angle(lattice[0], lattice[2]), angle(lattice[0], lattice[1])] == pytest.approx([80, 95, 110])
+
+    # Plane normals are perpendicular to the directions in the planes
+    assert np.allclose(query.millerDirections([[1, 0, 0], [0, 0, 2]], lattice), [[1, 0, 0], lattice[2] / 6])
+    n = query.millerNormals([[0, 0, 1], [1, 1, 0], [1, 2, 3]], lattice)
+    assert np.allclose(n @ lattice[0], [0, n[1] @ lattice[1], n[2] @ lattice[1] / 2])
+
+    sections = query.planeDirections(n, 30)
+    assert sections.shape == (3, 30, 3)
+    assert np.allclose(np.einsum('pni,pi->pn', sections, n), 0)
+    assert np.allclose(np.linalg.norm(sections, axis=-1), 1)
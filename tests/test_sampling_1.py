@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+
+def test_mesh_1():
+    import ELATE
+    from ELATE import refdata, sampling
+
+    for name in ['FAU', 'MIL-53']:
+        x = ELATE.Elastic(refdata.examples_3D[name])
+        count = [0]
+
+        def func(theta, phi):
+            count[0] += len(theta)
+            return x.Young_array(theta, phi)
+
+        d, r, triangles = sampling.adaptiveMesh(func, tol=2e-3, minedge=0)
+        assert count[0] < 200 * 400
+        assert np.allclose(np.linalg.norm(d, axis=1), 1)
+        theta, phi = sampling.directionAngles(d)
+        assert np.allclose(r[0], x.Young_array(theta, phi))
+
+        # Closed conforming mesh: every edge is shared by two triangles
+        edges = np.sort(np.stack((triangles, np.roll(triangles, -1, axis=1)), axis=2).reshape(-1, 2), axis=1)
+        edges, counts = np.unique(edges, axis=0, return_counts=True)
+        assert np.all(counts == 2)
+        assert len(d) - len(edges) + len(triangles) == 2
+
+        # Tolerance is reached on all edges
+        a, b = d[edges[:, 0]], d[edges[:, 1]]
+        m = (a + b) / np.linalg.norm(a + b, axis=1)[:, None]
+        rm = x.Young_array(*sampling.directionAngles(m))
+        chord = 0.5 * (r[0][edges[:, 0], None] * a + r[0][edges[:, 1], None] * b)
+        assert np.max(np.linalg.norm(rm[:, None] * m - chord, axis=1)) <= 2e-3 * r.max()
+
+    # Isotropic-like materials need fewer points
+    assert len(sampling.adaptiveMesh(ELATE.Elastic(refdata.examples_3D['FAU']).Young_array)[0]) < len(d)
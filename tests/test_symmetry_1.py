@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+
+def voigt(coeffs):
+    m = np.zeros((6, 6))
+    for (i, j), c in coeffs.items():
+        m[i - 1, j - 1] = m[j - 1, i - 1] = c
+    return m.tolist()
+
+
+def test_laue_1():
+    import ELATE
+    from ELATE import refdata
+
+    expected = {'FAU': 'm-3m', 'quartz': '-3m', 'MIL-53': 'mmm', 'ZnO': '6/mmm', 'TiO2': '4/mmm', 'NSI': '2/m'}
+    for name, laue in expected.items():
+        assert ELATE.Elastic(refdata.examples_3D[name]).LaueClass() == laue
+
+    base = {(1, 1): 200, (2, 2): 200, (3, 3): 180, (1, 2): 80, (1, 3): 60, (2, 3): 60, (4, 4): 50, (5, 5): 50}
+    assert ELATE.Elastic(voigt({**base, (6, 6): 60})).LaueClass() == '6/mmm'
+    assert ELATE.Elastic(voigt({**base, (6, 6): 70})).LaueClass() == '4/mmm'
+    assert ELATE.Elastic(voigt({**base, (6, 6): 70, (1, 6): 10, (2, 6): -10})).LaueClass() == '4/m'
+    trig = {**base, (6, 6): 60, (1, 4): 15, (2, 4): -15, (5, 6): 15}
+    assert ELATE.Elastic(voigt(trig)).LaueClass() == '-3m'
+    assert ELATE.Elastic(voigt({**trig, (1, 5): -7, (2, 5): 7, (4, 6): 7})).LaueClass() == '-3'
+
+
+def test_wedge_1():
+    import ELATE
+    from ELATE import elate, refdata, symmetry
+
+    rng = np.random.default_rng(0)
+    d = rng.normal(size=(500, 3))
+    d /= np.linalg.norm(d, axis=1)[:, None]
+    for name in ['FAU', 'TiO2', 'NSI']:
+        x = ELATE.Elastic(refdata.examples_3D[name])
+        ops = x.symmetryOperations()
+
+        # Images in the wedge are equivalent directions, and the wedge is 1/(2n) of the sphere
+        w, g = symmetry.toWedge(ops, d)
+        assert np.allclose(w, np.einsum('nij,nj->ni', symmetry.LaueGroup(ops)[g], d))
+        assert np.allclose(x.quarticForm(w), x.quarticForm(d))
+        assert symmetry.inWedge(ops, w).all()
+        assert symmetry.inWedge(ops, d).mean() == pytest.approx(1 / (2 * len(ops)), abs=0.03)
+
+        # Evaluating only the orbits of the grid gives the same plots
+        u = np.linspace(0, np.pi, 50)
+        v = np.append(u, u[1:] + np.pi)
+        uu, vv = np.meshgrid(u, v, indexing='ij')
+        full = x.shearChi(uu, vv)
+        reduced = elate.evaluateGrid(x.shearChi, uu, vv, ops=ops)
+        assert np.allclose(full[0], reduced[0]) and np.allclose(full[1], reduced[1])
+        assert len(symmetry.gridOrbits(ops, u, v)[0]) < uu.size / 4
+
+
+def test_groups_1():
+    import ELATE
+    from ELATE import refdata, symmetry
+
+    # Candidate groups are closed, and their Laue classes have the right order
+    rot = symmetry.candidateRotations()
+    order = {'m-3m': 24, '6/mmm': 12, '4/mmm': 8, '4/m': 4, '-3m': 6, '-3': 3, 'mmm': 4, '2/m': 2, '-1': 1}
+    for g in symmetry.candidateGroups():
+        ops = rot[list(g)]
+        products = np.einsum('mij,njk->mnik', ops, ops).reshape(-1, 1, 3, 3)
+        assert np.abs(products - ops).sum(axis=(2, 3)).min(axis=1).max() < 1e-9
+        assert order[symmetry.LaueClass(ops)] in (len(g), 2 * len(g))
+
+    # Symmetrized tensors are exactly invariant, and close to the input
+    for name in ['quartz', 'ZnO']:
+        x = ELATE.Elastic(refdata.examples_3D[name])
+        ops = x.symmetryOperations()
+        T = symmetry.symmetrize(x.Smat, ops)
+        assert np.allclose(symmetry.symmetryOperations(T, tol=1e-9), ops)
+        assert np.linalg.norm(T - x.Smat) <= 1e-2 * np.linalg.norm(x.Smat)